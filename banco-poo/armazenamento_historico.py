@@ -0,0 +1,175 @@
+from array import array
+from datetime import datetime
+
+FORMATO_DATA = "%d-%m-%Y %H:%M:%S"  # Formato da data exibido no extrato
+
+TIPOS_PERSISTIDOS = ("Deposito", "Saque", "TransferenciaEnviada", "TransferenciaRecebida")  # Código gravado em disco -> nome (nunca reordenar)
+_CODIGOS_PERSISTIDOS = {nome: codigo for codigo, nome in enumerate(TIPOS_PERSISTIDOS)}  # Nome -> código gravado em disco
+TIPOS_TRANSACAO = list(TIPOS_PERSISTIDOS)  # Código do tipo -> nome na memória (tipos novos são acrescentados)
+_CODIGOS_TIPO = dict(_CODIGOS_PERSISTIDOS)  # Nome -> código na memória
+
+def codigo_tipo(nome):
+    """
+    Retorna o código numérico de um tipo de transação, registrando tipos novos.
+
+    :param nome: Nome da classe da transação (ex.: "Deposito").
+    :return: Código do tipo.
+    """
+    codigo = _CODIGOS_TIPO.get(nome)
+    if codigo is None:
+        codigo = _CODIGOS_TIPO[nome] = len(TIPOS_TRANSACAO)
+        TIPOS_TRANSACAO.append(nome)
+    return codigo
+
+def codigo_persistido(nome):
+    """
+    Retorna o código de um tipo de transação na tabela fixa usada pelos formatos em disco.
+
+    :param nome: Nome da classe da transação (ex.: "Deposito").
+    :return: Código do tipo.
+    :raises ValueError: Quando o tipo não tem código em disco.
+    """
+    codigo = _CODIGOS_PERSISTIDOS.get(nome)
+    if codigo is None:
+        raise ValueError(f"Tipo de transação sem código em disco: {nome}")
+    return codigo
+
+def formatar_data(instante):
+    """
+    Formata um instante (segundos desde a época) no formato usado pelo extrato.
+
+    :param instante: Segundos desde a época (horário local).
+    :return: Data formatada como "dd-mm-aaaa HH:MM:SS".
+    """
+    return datetime.fromtimestamp(instante).strftime(FORMATO_DATA)
+
+class ArmazenamentoDicionarios:
+    """
+    Armazenamento padrão do histórico: uma lista de dicionários com tipo, valor e data.
+    """
+    def __init__(self):
+        """
+        Inicializa a lista de linhas.
+        """
+        self._linhas = []  # Lista de dicionários, um por transação
+        self._instantes = array("q")  # Instante de cada transação, para leituras sem converter a data
+
+    def anexar(self, tipo, valor, instante):
+        """
+        Anexa uma transação ao final do armazenamento.
+
+        :param tipo: Nome do tipo da transação.
+        :param valor: Valor da transação.
+        :param instante: Segundos desde a época.
+        """
+        self._linhas.append({"tipo": tipo, "valor": valor, "data": formatar_data(instante)})
+        self._instantes.append(instante)
+
+    def entrada(self, posicao):
+        """
+        Retorna a transação na posição informada sem montar um dicionário.
+
+        :param posicao: Posição da transação.
+        :return: Tupla (tipo, valor, instante).
+        """
+        linha = self._linhas[posicao]
+        return linha["tipo"], linha["valor"], self._instantes[posicao]
+
+    def __getitem__(self, posicao):
+        """
+        Retorna a transação na posição informada.
+
+        :param posicao: Posição da transação.
+        :return: Dicionário com tipo, valor e data.
+        """
+        return self._linhas[posicao]
+
+    def __iter__(self):
+        """
+        Percorre as transações na ordem de registro.
+
+        :return: Iterador sobre os dicionários.
+        """
+        return iter(self._linhas)
+
+    def __len__(self):
+        """
+        Retorna a quantidade de transações armazenadas.
+
+        :return: Número de transações.
+        """
+        return len(self._linhas)
+
+class ArmazenamentoColunar:
+    """
+    Armazenamento compacto do histórico em colunas tipadas paralelas:
+    código do tipo (int8), valor em centavos (int64) e instante em segundos desde a época (int64).
+    As linhas em formato de dicionário só são montadas quando lidas.
+    """
+    def __init__(self):
+        """
+        Inicializa as colunas vazias.
+        """
+        self._tipos = array("b")  # Código do tipo de cada transação
+        self._centavos = array("q")  # Valor de cada transação em centavos
+        self._instantes = array("q")  # Instante de cada transação em segundos desde a época
+
+    def anexar(self, tipo, valor, instante):
+        """
+        Anexa uma transação ao final das colunas.
+
+        :param tipo: Nome do tipo da transação.
+        :param valor: Valor da transação.
+        :param instante: Segundos desde a época.
+        """
+        self._tipos.append(codigo_tipo(tipo))
+        self._centavos.append(round(valor * 100))
+        self._instantes.append(instante)
+
+    def entrada(self, posicao):
+        """
+        Retorna a transação na posição informada sem montar um dicionário.
+
+        :param posicao: Posição da transação.
+        :return: Tupla (tipo, valor, instante).
+        """
+        return TIPOS_TRANSACAO[self._tipos[posicao]], self._centavos[posicao] / 100, self._instantes[posicao]
+
+    def _linha(self, posicao):
+        """
+        Monta o dicionário da transação na posição informada.
+
+        :param posicao: Posição da transação.
+        :return: Dicionário com tipo, valor e data.
+        """
+        return {
+            "tipo": TIPOS_TRANSACAO[self._tipos[posicao]],
+            "valor": self._centavos[posicao] / 100,
+            "data": formatar_data(self._instantes[posicao]),
+        }
+
+    def __getitem__(self, posicao):
+        """
+        Retorna a transação na posição informada.
+
+        :param posicao: Posição da transação.
+        :return: Dicionário com tipo, valor e data.
+        """
+        return self._linha(posicao)
+
+    def __iter__(self):
+        """
+        Percorre as transações na ordem de registro, montando cada linha sob demanda.
+
+        :yield: Dicionário de cada transação.
+        """
+        for posicao in range(len(self._tipos)):
+            yield self._linha(posicao)
+
+    def __len__(self):
+        """
+        Retorna a quantidade de transações armazenadas.
+
+        :return: Número de transações.
+        """
+        return len(self._tipos)
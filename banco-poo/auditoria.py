@@ -0,0 +1,213 @@
+"""
+Log de auditoria das operações, gravado fora do caminho da requisição: quem registra só coloca
+o registro numa fila em memória, e uma thread gravadora escreve os registros em lotes, como
+linhas JSON, em arquivos com rotação por tamanho.
+
+Políticas quando a fila está cheia:
+    "bloquear": quem registra espera haver espaço (contrapressão; nada se perde).
+    "descartar_novos": o registro novo é descartado.
+    "descartar_antigos": o registro mais antigo da fila é descartado para dar lugar ao novo.
+Os descartes são contados em LogAuditoria.descartados.
+
+Se a gravação falhar (disco cheio, registro que não vira JSON...), o gravador para e o erro é
+levantado, como OSError, por registrar, descarregar e fechar, em vez de deixar quem espera
+bloqueado para sempre.
+
+Uso:
+    Conta.auditoria = LogAuditoria("auditoria", politica="descartar_novos")
+    ...
+    Conta.auditoria.fechar()  # Grava o que estiver na fila
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+NIVEIS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}  # Níveis aceitos, do menos ao mais grave
+POLITICAS = ("bloquear", "descartar_novos", "descartar_antigos")
+
+class LogAuditoria:
+    """
+    Fila de registros de auditoria com uma thread gravadora e arquivos rotativos.
+    """
+    def __init__(
+        self, diretorio, nome="auditoria.log", capacidade=10_000, politica="bloquear", tamanho_lote=512,
+        tamanho_maximo=10 * 1024 * 1024, arquivos_mantidos=5, nivel_minimo="INFO",
+    ):
+        """
+        Abre (ou cria) o arquivo de auditoria e inicia a thread gravadora.
+
+        :param diretorio: Diretório dos arquivos (criado se não existir).
+        :param nome: Nome do arquivo atual; os rotacionados recebem os sufixos .1, .2, ...
+        :param capacidade: Quantidade máxima de registros esperando na fila.
+        :param politica: O que fazer com a fila cheia: "bloquear", "descartar_novos" ou "descartar_antigos".
+        :param tamanho_lote: Quantidade máxima de registros gravados de uma vez.
+        :param tamanho_maximo: Tamanho, em bytes, a partir do qual o arquivo é rotacionado.
+        :param arquivos_mantidos: Quantidade de arquivos rotacionados mantidos além do atual.
+        :param nivel_minimo: Registros de nível inferior são ignorados.
+        """
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de auditoria inválida: {politica}")
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.caminho = self.diretorio / nome
+        self.politica = politica
+        self.descartados = 0  # Registros perdidos pelas políticas de descarte
+        self._capacidade = capacidade
+        self._tamanho_lote = tamanho_lote
+        self._tamanho_maximo = tamanho_maximo
+        self._arquivos_mantidos = arquivos_mantidos
+        self._nivel_minimo = NIVEIS[nivel_minimo]
+        self._fila = deque()
+        self._trava = threading.Lock()
+        self._ha_registros = threading.Condition(self._trava)  # Acorda o gravador
+        self._ha_espaco = threading.Condition(self._trava)  # Acorda quem espera na política "bloquear"
+        self._gravados = threading.Condition(self._trava)  # Acorda quem espera em descarregar()
+        self._em_gravacao = 0  # Registros retirados da fila e ainda não escritos
+        self._fechado = False
+        self._falha = None  # Exceção da gravação que falhou; o log deixa de aceitar registros
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        self._gravador = threading.Thread(target=self._gravar, name="auditoria", daemon=True)
+        self._gravador.start()
+
+    def registrar(self, operacao, nivel="INFO", **dados):
+        """
+        Coloca um registro na fila, com o instante atual. Não faz I/O.
+
+        :param operacao: Nome da operação (ex.: "Deposito").
+        :param nivel: Nível do registro (ver NIVEIS).
+        :param dados: Campos do registro (cpf, conta, valor, resultado...), serializáveis em JSON.
+        :return: True se o registro entrou na fila, False se foi ignorado ou descartado.
+        :raises OSError: Quando o gravador falhou.
+        """
+        if NIVEIS[nivel] < self._nivel_minimo:
+            return False
+        registro = (time.time(), nivel, operacao, dados)  # Formatado só na thread gravadora
+        with self._trava:
+            if self._fechado:
+                raise ValueError("O log de auditoria está fechado.")
+            self._verificar_falha()
+            if len(self._fila) >= self._capacidade:
+                if self.politica == "descartar_novos":
+                    self.descartados += 1
+                    return False
+                if self.politica == "descartar_antigos":
+                    self._fila.popleft()
+                    self.descartados += 1
+                else:
+                    while len(self._fila) >= self._capacidade and not self._fechado and self._falha is None:
+                        self._ha_espaco.wait()
+                    self._verificar_falha()
+                    if self._fechado:
+                        raise ValueError("O log de auditoria foi fechado durante a espera.")
+            self._fila.append(registro)
+            if len(self._fila) in (1, self._tamanho_lote):
+                self._ha_registros.notify()  # Primeiro registro ou lote cheio: acorda o gravador
+        return True
+
+    def descarregar(self):
+        """
+        Espera até que todos os registros já aceitos estejam escritos no arquivo.
+
+        :raises OSError: Quando o gravador falhou.
+        """
+        with self._trava:
+            self._ha_registros.notify()
+            while (self._fila or self._em_gravacao) and self._falha is None:
+                self._gravados.wait()
+            self._verificar_falha()
+
+    def fechar(self):
+        """
+        Grava os registros pendentes e fecha o arquivo.
+
+        :raises OSError: Quando o gravador falhou; o arquivo é fechado mesmo assim.
+        """
+        with self._trava:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._ha_registros.notify()
+            self._ha_espaco.notify_all()
+        self._gravador.join()  # O gravador esvazia a fila antes de terminar
+        self._arquivo.close()
+        with self._trava:
+            self._verificar_falha()
+
+    def _verificar_falha(self):
+        """
+        Recusa a operação se uma gravação anterior falhou. Deve ser chamado com a trava adquirida.
+
+        :raises OSError: Quando o gravador não conseguiu gravar um lote.
+        """
+        if self._falha is not None:
+            raise OSError(f"O log de auditoria {self.caminho} falhou ao gravar: {self._falha}") from self._falha
+
+    def _gravar(self):
+        """
+        Laço da thread gravadora: retira lotes da fila, formata e escreve cada lote com uma só
+        chamada de escrita, rotacionando o arquivo quando ele passa do tamanho máximo.
+        Uma falha encerra a thread, guardando o erro e acordando todos os que esperam.
+        """
+        while True:
+            with self._trava:
+                while not self._fila and not self._fechado:
+                    self._ha_registros.wait()
+                if not self._fila:
+                    return  # Fechado e sem pendências
+                quantidade = min(len(self._fila), self._tamanho_lote)
+                lote = [self._fila.popleft() for _ in range(quantidade)]
+                self._em_gravacao = quantidade
+                self._ha_espaco.notify_all()
+            try:
+                self._arquivo.write("".join(_formatar(registro) for registro in lote))
+                self._arquivo.flush()
+                if self._arquivo.tell() >= self._tamanho_maximo:
+                    self._rotacionar()
+            except Exception as erro:
+                with self._trava:
+                    self._falha = erro
+                    self._em_gravacao = 0
+                    self._ha_espaco.notify_all()
+                    self._gravados.notify_all()
+                return
+            with self._trava:
+                self._em_gravacao = 0
+                self._gravados.notify_all()
+
+    def _rotacionar(self):
+        """
+        Renomeia o arquivo atual para .1 (deslocando os anteriores e apagando o mais antigo) e abre um novo.
+        """
+        self._arquivo.close()
+        for indice in range(self._arquivos_mantidos, 0, -1):
+            origem = self.caminho.with_name(f"{self.caminho.name}.{indice - 1}") if indice > 1 else self.caminho
+            if origem.exists():
+                os.replace(origem, self.caminho.with_name(f"{self.caminho.name}.{indice}"))
+        self._arquivo = open(self.caminho, "w", encoding="utf-8")  # Trunca se nenhum arquivo antigo é mantido
+
+    def __enter__(self):
+        """
+        Permite usar o log com a instrução with.
+
+        :return: O próprio log.
+        """
+        return self
+
+    def __exit__(self, *excecao):
+        """
+        Fecha o log ao sair do bloco with.
+        """
+        self.fechar()
+
+def _formatar(registro):
+    """
+    Converte um registro da fila em uma linha JSON.
+
+    :param registro: Tupla (instante, nível, operação, dados).
+    :return: Linha terminada em quebra de linha.
+    """
+    instante, nivel, operacao, dados = registro
+    return json.dumps({"instante": instante, "nivel": nivel, "op": operacao, **dados}, ensure_ascii=False) + "\n"
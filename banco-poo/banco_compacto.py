@@ -0,0 +1,65 @@
+"""
+Variantes compactas (com __slots__) das classes de domínio do banco.
+Cada variante reaproveita os métodos e propriedades da classe original, mas guarda os
+atributos em slots fixos em vez de um __dict__ por instância. Os ganchos configurados em Conta
+(diario, ledger, auditoria, modelos_leitura) são lidos de Conta a cada acesso. As variantes não
+são subclasses das originais: isinstance(conta, Conta) é falso para uma ContaCompacta.
+
+Ganho medido (benchmarks/bench_memoria_objetos.py): só cerca de 8% a 10% a menos de memória por
+cliente (ex.: 1.749 -> 1.613 bytes por cliente com uma conta e uma transação, 1 milhão de
+clientes). O que domina o consumo é o que cada conta carrega: Historico, MotorLimites e a RLock.
+
+Uso:
+    from banco_compacto import ContaCorrenteCompacta, PessoaFisicaCompacta
+
+    cliente = PessoaFisicaCompacta("Ana", "01-01-1990", "12345678900", "Rua A, 1")
+    conta = ContaCorrenteCompacta.nova_conta(cliente=cliente, numero=1001)
+"""
+from banco_poo_datetime import Cliente, Conta, ContaCorrente, Deposito, PessoaFisica, Saque, Transacao
+
+GANCHOS_CONTA = ("diario", "ledger", "auditoria", "modelos_leitura")  # Atributos de classe configurados em Conta
+
+class _GanchoDeConta:
+    """
+    Descritor que lê um gancho de Conta no momento do acesso, em vez de congelar o valor
+    que ele tinha quando a variante compacta foi criada.
+    """
+    def __init__(self, nome):
+        """
+        :param nome: Nome do atributo de classe em Conta.
+        """
+        self.nome = nome
+
+    def __get__(self, instancia, dono=None):
+        """
+        :return: Valor atual do gancho em Conta.
+        """
+        return getattr(Conta, self.nome)
+
+def _variante_compacta(classe, base, campos):
+    """
+    Cria a variante compacta de uma classe, copiando seus métodos e declarando __slots__.
+    O nome da classe é preservado para que o histórico registre o mesmo tipo de transação.
+
+    :param classe: Classe original (com __dict__).
+    :param base: Classe base da variante compacta (já compacta ou sem __dict__).
+    :param campos: Atributos de instância definidos pela classe original.
+    :return: Nova classe com __slots__.
+    """
+    namespace = {
+        nome: valor for nome, valor in vars(classe).items()
+        if nome not in ("__dict__", "__weakref__", "__slots__")
+    }
+    for nome in GANCHOS_CONTA:
+        if nome in namespace:
+            namespace[nome] = _GanchoDeConta(nome)  # Conta.diario = ... também vale para as variantes
+    namespace["__slots__"] = campos
+    namespace["__module__"] = __name__
+    return type(classe)(classe.__name__, (base,), namespace)
+
+ClienteCompacto = _variante_compacta(Cliente, object, ("endereco", "contas", "registro"))
+PessoaFisicaCompacta = _variante_compacta(PessoaFisica, ClienteCompacto, ("nome", "data_nascimento", "cpf"))
+ContaCompacta = _variante_compacta(Conta, object, ("_saldo", "_numero", "_agencia", "cliente", "_historico", "_trava"))
+ContaCorrenteCompacta = _variante_compacta(ContaCorrente, ContaCompacta, ("limite", "_limite_saques"))
+SaqueCompacto = _variante_compacta(Saque, Transacao, ("_valor", "data"))
+DepositoCompacto = _variante_compacta(Deposito, Transacao, ("_valor", "data"))
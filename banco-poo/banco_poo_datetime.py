@@ -1,20 +1,64 @@
+import argparse
+import contextvars
+import functools
+import heapq
+import json
+import math
+import os
+import sys
 import textwrap 
+import threading
 from abc import ABC, abstractmethod
-from datetime import datetime
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from time import perf_counter_ns
+
+from armazenamento_historico import ArmazenamentoDicionarios, formatar_data
+from limites import Limite, MotorLimites, limite_saques
+from metricas import METRICAS
+from registro_clientes import ClienteRegistry
+
+AGENCIA_PADRAO = "0001"  # Agência das contas quando nenhuma é informada
+TAMANHO_PAGINA_EXTRATO = 50  # Movimentações exibidas por página no extrato interativo
+TAMANHO_PAGINA_CONTAS = 20  # Contas exibidas por página na listagem interativa
+TRANSFERENCIA_ENVIADA = "TransferenciaEnviada"  # Tipo no histórico da conta de origem
+TRANSFERENCIA_RECEBIDA = "TransferenciaRecebida"  # Tipo no histórico da conta de destino
+
+ler_entrada = input  # Lê as respostas do usuário no menu; main(entrada=...) a substitui (ex.: benchmarks/carga_menu.py)
+_mensagens = contextvars.ContextVar("mensagens", default=None)  # Lista que recebe as mensagens das operações (ver coletar_mensagens)
 
 class ContasIterador:
     """
-    Iterador para percorrer as contas bancárias.
-    Permite a iteração sobre as contas de forma personalizada.
+    Iterador sobre as contas bancárias, com filtros por agência e titular, ordenação por número
+    ou saldo e paginação por cursor. Cada conta só é formatada quando lida.
+
+    O cursor é a chave da última conta entregue (o número ou o par (saldo, número)), e não uma
+    posição: contas abertas entre duas páginas não fazem a página seguinte repetir nem pular contas.
+    Na ordem por número, uma página custa O(tamanho da página), pois as contas estão em ordem
+    crescente de número; na ordem por saldo, que muda a cada operação, custa O(n log tamanho).
     """
-    def __init__(self, contas):
+    ORDENS = ("numero", "saldo")
+
+    def __init__(self, contas, agencia=None, titular=None, ordem="numero", cursor=None):
         """
         Inicializa o iterador de contas.
 
-        :param contas: Lista de contas a serem iteradas.
+        :param contas: Lista de contas, em ordem crescente de número.
+        :param agencia: Agência das contas a listar (opcional).
+        :param titular: Cliente cujas contas serão listadas (opcional).
+        :param ordem: "numero" ou "saldo".
+        :param cursor: Cursor retornado pela página anterior (None para começar do início).
         """
-        self.contas = contas
-        self._index = 0  # Índice inicial do iterador
+        if ordem not in self.ORDENS:
+            raise ValueError(f"Ordem de listagem inválida: {ordem}")
+        self.contas = titular.contas if titular is not None else contas  # As contas do titular já estão separadas
+        self.agencia = agencia
+        self.ordem = ordem
+        self.cursor = cursor
+        self._lidas = iter(())  # Página em leitura pelo protocolo de iteração
 
     def __iter__(self):
         """
@@ -31,13 +75,83 @@ class ContasIterador:
         :return: String formatada da conta.
         :raises StopIteration: Quando não há mais contas a serem iteradas.
         """
-        try:
-            conta = self.contas[self._index]  # Obtém a conta atual
-            return f"""\nAgência:\t{conta.agencia}\nNúmero:\t\t{conta.numero}\nTitular:\t{conta.cliente.nome}\nSaldo:\t\tR${conta.saldo:.2f}"""
-        except IndexError:
-            raise StopIteration  # Indica que não há mais contas
-        finally:
-            self._index += 1  # Move para a próxima conta
+        conta = next(self._lidas, None)
+        if conta is None:
+            contas, _proximo = self.pagina(TAMANHO_PAGINA_CONTAS)  # Busca as contas em páginas, não todas de uma vez
+            if not contas:
+                raise StopIteration  # Indica que não há mais contas
+            self._lidas = iter(contas)
+            conta = next(self._lidas)
+        return self.formatar(conta)
+
+    def pagina(self, tamanho):
+        """
+        Retorna a próxima página de contas e avança o cursor.
+
+        :param tamanho: Quantidade máxima de contas na página.
+        :return: Tupla (contas da página, cursor da próxima página ou None se não houver mais contas).
+        """
+        if self.ordem == "numero":
+            inicio = 0 if self.cursor is None else bisect_right(self.contas, self.cursor, key=lambda conta: conta.numero)
+            selecionadas = self._filtrar(self.contas[posicao] for posicao in range(inicio, len(self.contas)))  # Sem percorrer o começo
+            contas = list(islice(selecionadas, tamanho + 1))  # Uma a mais só para saber se há próxima página
+        else:
+            chave = self._chave_saldo
+            candidatas = self._filtrar(self.contas)
+            if self.cursor is not None:
+                cursor = tuple(self.cursor)
+                candidatas = (conta for conta in candidatas if chave(conta) > cursor)
+            contas = heapq.nsmallest(tamanho + 1, candidatas, key=chave)
+
+        ha_mais = len(contas) > tamanho
+        del contas[tamanho:]
+        if contas:
+            ultima = contas[-1]
+            self.cursor = ultima.numero if self.ordem == "numero" else self._chave_saldo(ultima)
+        return contas, (self.cursor if ha_mais else None)
+
+    def escrever_pagina(self, escritor, tamanho):
+        """
+        Escreve a próxima página de contas com uma única chamada de escrita.
+
+        :param escritor: Objeto com método write (ex.: sys.stdout ou um arquivo aberto).
+        :param tamanho: Quantidade máxima de contas na página.
+        :return: Cursor da próxima página, ou None se não houver mais contas.
+        """
+        contas, proximo = self.pagina(tamanho)
+        escritor.write("".join(f"{self.formatar(conta)}\n" for conta in contas))
+        return proximo
+
+    @staticmethod
+    def formatar(conta):
+        """
+        Formata uma conta para exibição.
+
+        :param conta: Conta a ser formatada.
+        :return: String formatada da conta.
+        """
+        return f"""\nAgência:\t{conta.agencia}\nNúmero:\t\t{conta.numero}\nTitular:\t{conta.cliente.nome}\nSaldo:\t\tR${conta.saldo:.2f}"""
+
+    def _filtrar(self, contas):
+        """
+        Aplica o filtro de agência, se houver.
+
+        :param contas: Iterável de contas.
+        :return: Iterável com as contas da agência.
+        """
+        if self.agencia is None:
+            return contas
+        return (conta for conta in contas if conta.agencia == self.agencia)
+
+    @staticmethod
+    def _chave_saldo(conta):
+        """
+        Chave da ordenação por saldo; o número desempata contas com o mesmo saldo.
+
+        :param conta: Conta.
+        :return: Tupla (saldo, número).
+        """
+        return (conta.saldo, conta.numero)
 
 class Cliente:
     """
@@ -52,27 +166,48 @@ class Cliente:
         """
         self.endereco = endereco
         self.contas = []  # Lista de contas do cliente
+        self.registro = None  # Registro de clientes (ClienteRegistry) que indexa as contas do cliente
 
     def realizar_transacao(self, conta, transacao):
         """
         Realiza uma transação (saque ou depósito) na conta do cliente.
-        Limita o número de transações por dia.
+        Recusa valores não finitos (nan, inf) antes de verificar os limites da conta (ver limites.py),
+        como o número de transações por dia.
 
         :param conta: A conta em que a transação será realizada.
         :param transacao: A transação a ser registrada (saque ou depósito).
+        :return: True se a transação foi registrada, False caso contrário.
         """
-        if len(conta.historico.transacoes_do_dia()) >= 2:
-            print("\n@@@ Você excedeu o número de transações permitidas para hoje! @@@")
-            return
-        transacao.registrar(conta)  # Registra a transação na conta
+        tipo = transacao.__class__.__name__
+        data = transacao.data or datetime.now()  # Transações com data própria contam no seu dia
+        if not math.isfinite(transacao.valor):  # Não chega aos contadores em centavos nem ao histórico
+            avisar("\n@@@ O valor informado é inválido! @@@")
+            METRICAS.rejeitar(tipo, "valor_invalido")
+            registrar_auditoria(tipo, False, cpf=getattr(self, "cpf", None), agencia=conta.agencia, conta=conta.numero)
+            return False
+        with travar_contas(*transacao.contas_envolvidas(conta)):  # Verificação e registro sem interferência de outras threads
+            limite = conta.limites.verificar(tipo, transacao.valor, data)  # Contadores da conta: não relê o histórico
+            if limite is not None:
+                avisar(f"\n@@@ {limite.mensagem} @@@")
+                METRICAS.rejeitar(tipo, limite.motivo)
+                realizada = False
+            else:
+                realizada = transacao.registrar(conta)  # Registra a transação na conta
+        registrar_auditoria(
+            tipo, realizada, cpf=getattr(self, "cpf", None), agencia=conta.agencia, conta=conta.numero,
+            valor=transacao.valor,
+        )
+        return realizada
 
     def adicionar_conta(self, conta):
         """
-        Adiciona uma conta à lista de contas do cliente.
+        Adiciona uma conta à lista de contas do cliente e ao índice de contas do registro.
 
         :param conta: A conta a ser adicionada.
         """
         self.contas.append(conta)  # Adiciona a conta à lista
+        if self.registro is not None:
+            self.registro.indexar_conta(conta)  # Atualização incremental do índice por (agência, número)
 
 class PessoaFisica(Cliente):
     """
@@ -88,7 +223,7 @@ class PessoaFisica(Cliente):
         :param cpf: CPF do cliente.
         :param endereco: Endereço do cliente.
         """
-        super().__init__(endereco)  # Chama o construtor da classe pai
+        Cliente.__init__(self, endereco)  # Chama o construtor da classe pai (explícito para servir às variantes compactas)
         self.nome = nome
         self.data_nascimento = data_nascimento
         self.cpf = cpf
@@ -98,18 +233,29 @@ class Conta:
     Classe que representa uma conta bancária.
     Possui saldo, número, agência e histórico de transações.
     """
-    def __init__(self, numero, cliente):
+    diario = None  # Diário de escrita antecipada (diario.Diario) das mutações; None desativa a gravação
+    ledger = None  # Histórico em disco (ledger_mmap.LedgersMmap ou repositorio_sqlite.RepositorioSQLite); None o mantém na memória
+    auditoria = None  # Log de auditoria assíncrono (auditoria.LogAuditoria); None desativa a auditoria
+    modelos_leitura = None  # Totais mantidos a cada transação (modelos_leitura.ModelosLeitura); None os desativa
+    LIMITES = (  # Regras de limite de todas as contas deste tipo (ver limites.py)
+        Limite("limite_transacoes_dia", "Você excedeu o número de transações permitidas para hoje!", quantidade=2),
+    )
+
+    def __init__(self, numero, cliente, agencia=AGENCIA_PADRAO):
         """
-        Inicializa uma conta com número, cliente, agência fixa e histórico.
+        Inicializa uma conta com número, cliente, agência e histórico.
 
         :param numero: Número da conta.
         :param cliente: Cliente associado à conta.
+        :param agencia: Código da agência da conta.
         """
         self._saldo = 0  # Inicializa o saldo como 0
         self._numero = numero
-        self._agencia = "0001"  # Agência fixa
+        self._agencia = agencia
         self.cliente = cliente
-        self._historico = Historico()  # Inicializa o histórico de transações
+        armazenamento = Conta.ledger.armazenamento(agencia, numero) if Conta.ledger is not None else None  # Lido de Conta: vale também para as variantes compactas
+        self._historico = Historico(armazenamento, MotorLimites(self.politica_limites()))  # Inicializa o histórico de transações
+        self._trava = threading.RLock()  # Protege saldo e histórico contra acessos concorrentes
 
     @property
     def saldo(self):
@@ -147,44 +293,100 @@ class Conta:
         """
         return self._historico
 
-    def sacar(self, valor):
+    @property
+    def limites(self):
+        """
+        Retorna o motor de limites da conta, alimentado pelo histórico.
+
+        :return: limites.MotorLimites da conta.
+        """
+        return self._historico.limites
+
+    def politica_limites(self):
+        """
+        Retorna as regras de limite da conta.
+
+        :return: Tupla de limites.Limite.
+        """
+        return self.LIMITES
+
+    @property
+    def trava(self):
+        """
+        Retorna a trava (reentrante) da conta.
+
+        :return: threading.RLock da conta.
+        """
+        return self._trava
+
+    def sacar(self, valor, data=None):
         """
         Realiza o saque, verificando se o saldo é suficiente.
 
         :param valor: Valor a ser sacado.
+        :param data: Data e hora do saque, gravada no diário (padrão: agora).
         :return: True se o saque for realizado com sucesso, False caso contrário.
         """
-        if valor > self.saldo:
-            print("\n@@@ Saldo insuficiente! @@@")
-        elif valor > 0:
-            self._saldo -= valor  # Deduz o valor do saldo
-            print("\n== Saque realizado com sucesso! ===")
-            return True
-        else:
-            print("\n@@@ O valor informado é inválido! @@@")
-        return False
+        with self._trava:  # Verificação e débito atômicos
+            if valor > self.saldo:
+                avisar("\n@@@ Saldo insuficiente! @@@")
+                METRICAS.rejeitar(Saque.__name__, "saldo_insuficiente")
+            elif valor > 0:
+                self._registrar_no_diario(Saque.__name__, valor, data)
+                self._saldo -= valor  # Deduz o valor do saldo
+                avisar("\n== Saque realizado com sucesso! ===")
+                return True
+            else:
+                avisar("\n@@@ O valor informado é inválido! @@@")
+                METRICAS.rejeitar(Saque.__name__, "valor_invalido")
+            return False
 
-    def depositar(self, valor):
+    def depositar(self, valor, data=None):
         """
         Realiza o depósito na conta.
 
         :param valor: Valor a ser depositado.
+        :param data: Data e hora do depósito, gravada no diário (padrão: agora).
         :return: True se o depósito for realizado com sucesso, False caso contrário.
         """
-        if valor > 0:
-            self._saldo += valor  # Adiciona o valor ao saldo
-            print("\n== Depósito realizado com sucesso! ===")
-            return True
-        else:
-            print("\n@@@ O valor informado é inválido! @@@")
-            return False
+        with self._trava:
+            if 0 < valor < math.inf:
+                self._registrar_no_diario(Deposito.__name__, valor, data)
+                self._saldo += valor  # Adiciona o valor ao saldo
+                avisar("\n== Depósito realizado com sucesso! ===")
+                return True
+            else:
+                avisar("\n@@@ O valor informado é inválido! @@@")
+                METRICAS.rejeitar(Deposito.__name__, "valor_invalido")
+                return False
+
+    def restaurar_saldo(self, saldo):
+        """
+        Define o saldo ao restaurar o estado persistido (snapshot ou diário), sem validações.
+
+        :param saldo: Saldo restaurado.
+        """
+        self._saldo = saldo
+
+    def _registrar_no_diario(self, tipo, valor, data=None, **extras):
+        """
+        Grava a mutação no diário (se houver) antes que ela seja aplicada e confirmada.
+
+        :param tipo: Tipo da transação (ex.: "Deposito").
+        :param valor: Valor da transação.
+        :param data: Data e hora da transação (padrão: agora).
+        :param extras: Campos adicionais da mutação (ex.: a conta de destino de uma transferência).
+        """
+        if Conta.diario is not None:
+            instante = (data or datetime.now()).timestamp()
+            Conta.diario.registrar(tipo, agencia=self.agencia, numero=self.numero, valor=valor, instante=instante, **extras)
 
 class ContaCorrente(Conta):
     """
     Classe que representa uma conta corrente.
     Herda da classe Conta e adiciona funcionalidades específicas de conta corrente.
     """
-    def __init__(self, numero, cliente, limite=500, limite_saques=3):
+    def __init__(self, numero, cliente, limite=500, limite_saques=3, agencia=AGENCIA_PADRAO):
         """
         Inicializa a conta corrente com um limite de saque e limite de saques diários.
 
@@ -192,13 +394,14 @@ class ContaCorrente(Conta):
         :param cliente: Cliente associado à conta.
         :param limite: Limite máximo de saque.
         :param limite_saques: Número máximo de saques permitidos por dia.
+        :param agencia: Código da agência da conta.
         """
-        super().__init__(numero, cliente)  # Chama o construtor da classe pai
         self.limite = limite
-        self._limite_saques = limite_saques
+        self._limite_saques = limite_saques  # Definido antes do histórico, que cria os limites da conta
+        Conta.__init__(self, numero, cliente, agencia)  # Chama o construtor da classe pai (explícito para servir às variantes compactas)
 
     @classmethod
-    def nova_conta(cls, cliente, numero, limite=500, limite_saques=3):
+    def nova_conta(cls, cliente, numero, limite=500, limite_saques=3, agencia=AGENCIA_PADRAO):
         """
         Cria uma nova conta corrente.
 
@@ -206,32 +409,34 @@ class ContaCorrente(Conta):
         :param numero: Número da nova conta.
         :param limite: Limite máximo de saque.
         :param limite_saques: Número máximo de saques permitidos por dia.
+        :param agencia: Código da agência da nova conta.
         :return: Instância da nova ContaCorrente.
         """
-        return cls(numero, cliente, limite, limite_saques)
+        return cls(numero, cliente, limite, limite_saques, agencia)
 
-    def sacar(self, valor):
+    def politica_limites(self):
         """
-        Realiza o saque, respeitando o limite e número de saques diários.
+        Retorna as regras de limite da conta corrente: as do tipo e o limite de saques por dia da conta.
+
+        :return: Tupla de limites.Limite.
+        """
+        return self.LIMITES + (limite_saques(self._limite_saques),)
+
+    def sacar(self, valor, data=None):
+        """
+        Realiza o saque, respeitando o limite por saque. O número de saques por dia é verificado
+        pelo motor de limites em Cliente.realizar_transacao.
 
         :param valor: Valor a ser sacado.
+        :param data: Data e hora do saque, gravada no diário (padrão: agora).
         :return: True se o saque for realizado com sucesso, False caso contrário.
         """
-        numero_saques = len(
-            [transacao for transacao in self.historico.transacoes if transacao["tipo"] == Saque.__name__]
-        )
-
-        if valor > self.limite:
-            print("\n@@@ O valor do saque excede o limite! @@@")
-        elif numero_saques >= self._limite_saques:
-            print("\n@@@ Número de saques excedido! @@@")
-        elif valor > 0:
-            self._saldo -= valor  # Deduz o valor do saldo
-            print("\n== Saque realizado com sucesso! ===")
-            return True
-        else:
-            return super().sacar(valor)  # Chama o método da classe pai para saques válidos
-        return False
+        with self._trava:  # Verificação do limite e débito atômicos
+            if valor > self.limite:
+                avisar("\n@@@ O valor do saque excede o limite! @@@")
+                METRICAS.rejeitar(Saque.__name__, "limite_valor")
+                return False
+            return Conta.sacar(self, valor, data)  # A classe pai verifica o saldo e realiza o saque
 
     def __str__(self):
         """
@@ -245,55 +450,239 @@ class Historico:
     """
     Classe que armazena o histórico de transações da conta.
     Permite registrar e consultar transações realizadas.
+    Mantém um índice por dia do calendário, com os instantes ordenados dentro de cada dia,
+    para que consultas do dia e por período custem O(log n + k).
+    Mantém também o saldo ao fim de cada dia (checkpoints), para que saldo_em custe uma busca
+    binária mais a releitura das transações de um único dia.
     """
-    def __init__(self):
+    armazenamento_padrao = ArmazenamentoDicionarios  # Use ArmazenamentoColunar para o modo compacto
+    SINAIS = {"Deposito": 1, "Saque": -1, TRANSFERENCIA_RECEBIDA: 1, TRANSFERENCIA_ENVIADA: -1}  # Efeito de cada tipo no saldo
+
+    def __init__(self, armazenamento=None, limites=None):
         """
-        Inicializa a lista de transações.
+        Inicializa o armazenamento das transações e o índice por dia.
+
+        :param armazenamento: Armazenamento das transações (padrão: Historico.armazenamento_padrao()).
+        :param limites: Motor de limites (limites.MotorLimites) alimentado a cada transação (opcional).
         """
-        self._transacoes = []  # Lista para armazenar transações
+        self._transacoes = armazenamento if armazenamento is not None else self.armazenamento_padrao()
+        self.limites = limites
+        self._dias = []  # Dias (ordinais) que possuem transações, em ordem crescente
+        self._indice_dias = {}  # Dia (ordinal) -> (instantes ordenados, posições em _transacoes)
+        self._variacoes = {}  # Dia (ordinal) -> variação do saldo no dia, em centavos
+        self._acumulados = array("q")  # Saldo ao fim de cada dia de _dias, em centavos (checkpoints)
+        self._acumulados_validos = 0  # Checkpoints já calculados (os seguintes são refeitos sob demanda)
+        self.saldo_inicial = 0.0  # Saldo anterior à primeira transação guardada (ex.: histórico restaurado só em parte)
+        self.saldo_inicial_derivado = False  # True se saldo_inicial foi deduzido do saldo da conta (ajustar_saldo_inicial)
+        for posicao, (tipo, valor, instante) in enumerate(self.entradas()):
+            dia = date.fromtimestamp(instante).toordinal()
+            self._indexar(posicao, dia, instante)  # Armazenamento já preenchido
+            self._acumular(dia, tipo, valor)
+            if limites is not None:
+                limites.registrar(tipo, valor, datetime.fromtimestamp(instante))
 
     @property
     def transacoes(self):
         """
         Retorna as transações registradas.
 
-        :return: Lista de transações.
+        :return: Sequência de transações (cada uma como dicionário com tipo, valor e data).
         """
         return self._transacoes
 
-    def adicionar_transacao(self, transacao):
+    def adicionar_transacao(self, transacao, data=None):
         """
-        Adiciona uma transação ao histórico.
+        Adiciona uma transação ao histórico e a indexa pelo dia em que ocorreu.
 
         :param transacao: Transação a ser adicionada.
+        :param data: Data e hora da transação (padrão: agora).
+        """
+        self.adicionar_entrada(transacao.__class__.__name__, transacao.valor, data)
+
+    def adicionar_entrada(self, tipo, valor, data=None):
+        """
+        Adiciona uma entrada ao histórico a partir do tipo e do valor (usado também na restauração do estado).
+
+        :param tipo: Nome do tipo da transação (ex.: "Deposito").
+        :param valor: Valor da transação.
+        :param data: Data e hora da transação (padrão: agora).
+        """
+        data = data or datetime.now()
+        instante = int(data.timestamp())
+        posicao = len(self._transacoes)
+        self._transacoes.anexar(tipo, valor, instante)  # Adiciona transação com tipo, valor e data
+        self._indexar(posicao, data.toordinal(), instante)
+        self._acumular(data.toordinal(), tipo, valor)
+        if self.limites is not None:
+            self.limites.registrar(tipo, valor, data)
+
+    def entradas(self, inicio=0):
+        """
+        Percorre as entradas do histórico sem montar dicionários.
+
+        :param inicio: Posição da primeira entrada (aceita valores negativos, contados do fim).
+        :yield: Tupla (tipo, valor, instante em segundos desde a época).
+        """
+        armazenamento = self._transacoes
+        inicio = max(len(armazenamento) + inicio, 0) if inicio < 0 else inicio
+        if hasattr(armazenamento, "entradas"):
+            yield from armazenamento.entradas(inicio)  # Leitura em bloco (ex.: repositorio_sqlite)
+            return
+        for posicao in range(inicio, len(armazenamento)):
+            yield armazenamento.entrada(posicao)
+
+    def _indexar(self, posicao, dia, instante):
+        """
+        Insere a posição de uma transação no balde do seu dia, mantendo os instantes ordenados.
+
+        :param posicao: Posição da transação em _transacoes.
+        :param dia: Dia (ordinal) da transação.
+        :param instante: Segundos desde a época.
+        """
+        balde = self._indice_dias.get(dia)
+        if balde is None:
+            balde = self._indice_dias[dia] = (array("q"), array("q"))
+            insort(self._dias, dia)  # Novo dia: normalmente é o último, então a inserção é no fim
+        instantes, posicoes = balde
+        indice = bisect_right(instantes, instante)  # Mantém a ordem de chegada para instantes iguais
+        instantes.insert(indice, instante)
+        posicoes.insert(indice, posicao)
+
+    def _acumular(self, dia, tipo, valor):
+        """
+        Soma uma transação à variação do seu dia e invalida os checkpoints a partir desse dia.
+        Para transações no último dia (o caso comum), só o último checkpoint é refeito.
+
+        :param dia: Dia (ordinal) da transação, já presente em _dias.
+        :param tipo: Nome do tipo da transação.
+        :param valor: Valor da transação.
+        """
+        self._variacoes[dia] = self._variacoes.get(dia, 0) + self.SINAIS.get(tipo, 0) * round(valor * 100)
+        indice = len(self._dias) - 1 if self._dias[-1] == dia else bisect_left(self._dias, dia)
+        self._acumulados_validos = min(self._acumulados_validos, indice)
+
+    def _atualizar_acumulados(self):
+        """
+        Recalcula os checkpoints invalidados, do primeiro dia alterado até o último.
+        """
+        validos = self._acumulados_validos
+        acumulados = self._acumulados
+        del acumulados[validos:]
+        total = acumulados[-1] if validos else 0
+        for dia in self._dias[validos:]:
+            total += self._variacoes[dia]
+            acumulados.append(total)
+        self._acumulados_validos = len(self._dias)
+
+    def ajustar_saldo_inicial(self, saldo_atual):
+        """
+        Define o saldo anterior à primeira transação guardada de modo que o histórico termine no
+        saldo atual. Usado quando só parte do histórico é restaurada; saldo_em de datas anteriores
+        à primeira transação guardada retorna esse saldo.
+
+        :param saldo_atual: Saldo atual da conta.
+        """
+        self._atualizar_acumulados()
+        self.saldo_inicial = saldo_atual - (self._acumulados[-1] / 100 if self._acumulados else 0)
+        self.saldo_inicial_derivado = True  # O histórico passa a terminar no saldo por construção: não prova nada
+
+    def saldo_antes(self, posicao):
         """
-        self._transacoes.append(
-            {"tipo": transacao.__class__.__name__, "valor": transacao.valor, "data": datetime.now().strftime("%d-%m-%Y %H:%M:%S")}
-        )  # Adiciona transação com tipo, valor e data
+        Retorna o saldo anterior à entrada na posição informada, calculado só pelo histórico
+        (saldo_inicial mais as transações), sem consultar o saldo da conta.
 
-    def gerar_relatorio(self):
+        :param posicao: Posição da entrada (0 retorna saldo_inicial).
+        :return: Saldo antes da entrada.
         """
-        Gera o relatório de todas as transações.
+        self._atualizar_acumulados()
+        centavos = round(self.saldo_inicial * 100) + (self._acumulados[-1] if self._acumulados else 0)
+        for tipo, valor, _instante in self.entradas(posicao):  # Desconta as entradas a partir da posição
+            centavos -= self.SINAIS.get(tipo, 0) * round(valor * 100)
+        return centavos / 100
 
+    def saldo_em(self, data):
+        """
+        Retorna o saldo da conta em uma data: busca binária pelo checkpoint do dia anterior e
+        releitura só das transações do próprio dia.
+
+        :param data: date (saldo ao fim do dia) ou datetime (saldo naquele instante, inclusive).
+        :return: Saldo na data.
+        """
+        data = _como_datetime(data, time.max)
+        dia = data.toordinal()
+        self._atualizar_acumulados()
+        indice = bisect_left(self._dias, dia)
+        centavos = self._acumulados[indice - 1] if indice else 0  # Saldo ao fim do dia anterior
+        if indice < len(self._dias) and self._dias[indice] == dia:
+            instantes, posicoes = self._indice_dias[dia]
+            for posicao in posicoes[:bisect_right(instantes, data.timestamp())]:
+                tipo, valor, _instante = self._transacoes.entrada(posicao)
+                centavos += self.SINAIS.get(tipo, 0) * round(valor * 100)
+        return self.saldo_inicial + centavos / 100
+
+    def gerar_relatorio(self, inicio=None, fim=None, a_partir_de=0):
+        """
+        Gera o relatório das transações, opcionalmente restrito a um período.
+
+        :param inicio: Data (ou data e hora) inicial do período, inclusiva.
+        :param fim: Data (ou data e hora) final do período, inclusiva.
+        :param a_partir_de: Quantidade de transações do relatório a pular (cursor de paginação).
+                            Sem período, o salto é direto pela posição no histórico.
         :yield: Cada transação registrada.
         """
-        for transacao in self.transacoes:
-            yield transacao
+        if inicio is None and fim is None:
+            armazenamento = self._transacoes
+            if hasattr(armazenamento, "entradas"):
+                for tipo, valor, instante in armazenamento.entradas(a_partir_de):  # Leitura em bloco (ex.: repositorio_sqlite)
+                    yield {"tipo": tipo, "valor": valor, "data": formatar_data(instante)}
+                return
+            for posicao in range(a_partir_de, len(armazenamento)):
+                yield armazenamento[posicao]
+        else:
+            yield from islice(self.transacoes_no_periodo(inicio, fim), a_partir_de, None)
+
+    def transacoes_no_periodo(self, inicio=None, fim=None):
+        """
+        Percorre as transações de um período em ordem cronológica usando o índice por dia.
 
-    def transacoes_do_dia(self):
+        :param inicio: Data (ou data e hora) inicial, inclusiva. None indica desde o início.
+        :param fim: Data (ou data e hora) final, inclusiva. None indica até o fim.
+        :yield: Cada transação do período.
         """
-        Retorna as transações realizadas no dia atual.
+        inicio = _como_datetime(inicio, time.min) if inicio is not None else None
+        fim = _como_datetime(fim, time.max) if fim is not None else None
+        primeiro = bisect_left(self._dias, inicio.toordinal()) if inicio else 0
+        ultimo = bisect_right(self._dias, fim.toordinal()) if fim else len(self._dias)
+
+        for dia in self._dias[primeiro:ultimo]:
+            instantes, posicoes = self._indice_dias[dia]
+            de, ate = 0, len(instantes)
+            if inicio and dia == inicio.toordinal():
+                de = bisect_left(instantes, inicio.timestamp())  # Corta o começo do primeiro dia
+            if fim and dia == fim.toordinal():
+                ate = bisect_right(instantes, fim.timestamp())  # Corta o final do último dia
+            for posicao in posicoes[de:ate]:
+                yield self._transacoes[posicao]
+
+    def transacoes_do_dia(self, dia=None):
+        """
+        Retorna as transações realizadas em um dia (por padrão, o dia atual).
 
+        :param dia: Data a ser consultada (padrão: hoje).
         :return: Lista de transações do dia.
         """
-        data_atual = datetime.now().strftime("%d-%m-%Y")
-        return [transacao for transacao in self.transacoes if transacao["data"].startswith(data_atual)]
+        dia = dia or date.today()
+        balde = self._indice_dias.get(dia.toordinal())
+        if balde is None:
+            return []
+        return [self._transacoes[posicao] for posicao in balde[1]]
 
 class Transacao(ABC):
     """
     Classe abstrata para representar transações financeiras.
     Define a interface para saques e depósitos.
     """
+    __slots__ = ()  # Não cria __dict__ por conta própria, permitindo subclasses compactas
     @property
     @abstractmethod
     def valor(self):
@@ -310,21 +699,33 @@ class Transacao(ABC):
         Registra a transação na conta.
 
         :param conta: Conta na qual a transação será registrada.
+        :return: True se a transação foi registrada, False caso contrário.
         """
         pass
 
+    def contas_envolvidas(self, conta):
+        """
+        Retorna as contas alteradas pela transação (usadas para travá-las em ordem).
+
+        :param conta: Conta na qual a transação será registrada.
+        :return: Tupla de contas.
+        """
+        return (conta,)
+
 class Saque(Transacao):
     """
     Classe para representar a operação de saque.
     Implementa a lógica de registro de um saque.
     """
-    def __init__(self, valor):
+    def __init__(self, valor, data=None):
         """
         Inicializa o saque com um valor.
 
         :param valor: Valor a ser sacado.
+        :param data: Data e hora da transação (padrão: momento do registro).
         """
         self._valor = valor
+        self.data = data
 
     @property
     def valor(self):
@@ -340,22 +741,30 @@ class Saque(Transacao):
         Registra o saque na conta se for bem-sucedido.
 
         :param conta: Conta na qual o saque será registrado.
+        :return: True se o saque foi realizado, False caso contrário.
         """
-        if conta.sacar(self.valor):  # Tenta realizar o saque
-            conta.historico.adicionar_transacao(self)  # Adiciona ao histórico
+        data = self.data or datetime.now()  # Mesma data no diário e no histórico
+        with conta.trava:  # Saldo e histórico mudam juntos
+            if conta.sacar(self.valor, data):  # Tenta realizar o saque
+                conta.historico.adicionar_transacao(self, data)  # Adiciona ao histórico
+                publicar_transacao(conta, self.__class__.__name__, self.valor, data)
+                return True
+            return False
 
 class Deposito(Transacao):
     """
     Classe para representar a operação de depósito.
     Implementa a lógica de registro de um depósito.
     """
-    def __init__(self, valor):
+    def __init__(self, valor, data=None):
         """
         Inicializa o depósito com um valor.
 
         :param valor: Valor a ser depositado.
+        :param data: Data e hora da transação (padrão: momento do registro).
         """
         self._valor = valor
+        self.data = data
 
     @property
     def valor(self):
@@ -371,24 +780,202 @@ class Deposito(Transacao):
         Registra o depósito na conta se for bem-sucedido.
 
         :param conta: Conta na qual o depósito será registrado.
+        :return: True se o depósito foi realizado, False caso contrário.
         """
-        if conta.depositar(self.valor):  # Tenta realizar o depósito
-            conta.historico.adicionar_transacao(self)  # Adiciona ao histórico
+        data = self.data or datetime.now()  # Mesma data no diário e no histórico
+        with conta.trava:  # Saldo e histórico mudam juntos
+            if conta.depositar(self.valor, data):  # Tenta realizar o depósito
+                conta.historico.adicionar_transacao(self, data)  # Adiciona ao histórico
+                publicar_transacao(conta, self.__class__.__name__, self.valor, data)
+                return True
+            return False
+
+class Transferencia(Transacao):
+    """
+    Classe para representar a transferência entre duas contas.
+    Debita a conta de origem e credita a de destino de forma atômica.
+    """
+    def __init__(self, valor, destino, data=None):
+        """
+        Inicializa a transferência com um valor e a conta de destino.
+
+        :param valor: Valor a ser transferido.
+        :param destino: Conta que receberá o valor.
+        :param data: Data e hora da transação (padrão: momento do registro).
+        """
+        self._valor = valor
+        self.destino = destino
+        self.data = data
+
+    @property
+    def valor(self):
+        """
+        Retorna o valor da transferência.
+
+        :return: Valor da transferência.
+        """
+        return self._valor
+
+    def contas_envolvidas(self, conta):
+        """
+        Retorna as contas alteradas pela transferência.
+
+        :param conta: Conta de origem.
+        :return: Tupla (origem, destino).
+        """
+        return conta, self.destino
+
+    def registrar(self, conta):
+        """
+        Registra a transferência a partir da conta de origem, travando as duas contas
+        sempre na mesma ordem para evitar deadlocks.
+
+        :param conta: Conta de origem.
+        :return: True se a transferência foi realizada, False caso contrário.
+        """
+        destino = self.destino
+        if destino is conta or not 0 < self.valor < math.inf:
+            avisar("\n@@@ Transferência inválida! @@@")
+            METRICAS.rejeitar(Transferencia.__name__, "transferencia_invalida")
+            return False
+
+        data = self.data or datetime.now()
+        with travar_contas(conta, destino):
+            if self.valor > conta.saldo:
+                avisar("\n@@@ Saldo insuficiente! @@@")
+                METRICAS.rejeitar(Transferencia.__name__, "saldo_insuficiente")
+                return False
+            conta._registrar_no_diario(
+                Transferencia.__name__, self.valor, data, destino_agencia=destino.agencia, destino_numero=destino.numero
+            )
+            conta._saldo -= self.valor  # Debita a origem
+            destino._saldo += self.valor  # Credita o destino
+            conta.historico.adicionar_entrada(TRANSFERENCIA_ENVIADA, self.valor, data)
+            destino.historico.adicionar_entrada(TRANSFERENCIA_RECEBIDA, self.valor, data)
+            publicar_transacao(conta, TRANSFERENCIA_ENVIADA, self.valor, data)
+            publicar_transacao(destino, TRANSFERENCIA_RECEBIDA, self.valor, data)
+        avisar("\n== Transferência realizada com sucesso! ===")
+        return True
+
+@contextmanager
+def travar_contas(*contas):
+    """
+    Adquire as travas das contas em ordem crescente de (agência, número), evitando deadlocks
+    entre threads que travam as mesmas contas em ordens diferentes.
+
+    :param contas: Contas a serem travadas.
+    """
+    with ExitStack() as pilha:
+        for conta in sorted(set(contas), key=lambda conta: (conta.agencia, conta.numero)):
+            pilha.enter_context(conta.trava)
+        yield
+
+def _como_datetime(valor, horario):
+    """
+    Converte uma data em data e hora, usando o horário informado quando não houver hora.
+
+    :param valor: date ou datetime.
+    :param horario: Horário a ser usado para datas sem hora (ex.: time.min ou time.max).
+    :return: datetime correspondente.
+    """
+    if isinstance(valor, datetime):
+        return valor
+    return datetime.combine(valor, horario)
 
 def log_transacao(func):
     """
-    Decorador para logar as transações realizadas.
-    Captura a hora da transação e exibe no console.
+    Decorador que instrumenta as operações do menu: conta as chamadas, os sucessos e as falhas
+    (retorno False ou exceção) e registra a latência no histograma da operação (ver metricas.py).
 
     :param func: Função a ser decorada.
     :return: Função decorada.
     """
+    metrica = METRICAS.operacao(func.__name__)  # Resolvida uma vez, fora do caminho quente
+
+    @functools.wraps(func)
     def envelope(*args, **kwargs):
-        resultado = func(*args, **kwargs)  # Chama a função original
-        print(f"{datetime.now()}: {func.__name__.upper()}")  # Loga a transação
+        inicio = perf_counter_ns()
+        try:
+            resultado = func(*args, **kwargs)  # Chama a função original
+        except BaseException:
+            metrica.registrar(perf_counter_ns() - inicio, False)
+            raise
+        metrica.registrar(perf_counter_ns() - inicio, resultado is not False)
         return resultado
     return envelope
 
+def gravar_metricas(caminho):
+    """
+    Grava as métricas coletadas em um arquivo: JSON se a extensão for .json, senão texto do Prometheus.
+
+    :param caminho: Caminho do arquivo.
+    """
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        if caminho.endswith(".json"):
+            json.dump(METRICAS.exportar_json(), arquivo, indent=2)
+        else:
+            arquivo.write(METRICAS.exportar_prometheus())
+
+def avisar(mensagem):
+    """
+    Mostra uma mensagem de uma operação ao usuário ou, dentro de coletar_mensagens, a guarda para quem pediu.
+
+    :param mensagem: Mensagem a exibir (com os marcadores "@@@" ou "===").
+    """
+    destino = _mensagens.get()
+    if destino is None:
+        print(mensagem)
+    else:
+        destino.append(mensagem)
+
+@contextmanager
+def coletar_mensagens():
+    """
+    Guarda as mensagens das operações feitas no bloco, na thread (ou tarefa) atual, em vez de imprimi-las.
+    Cada thread tem a sua coleta: não altera sys.stdout.
+
+    :yield: Lista que recebe as mensagens.
+    """
+    mensagens = []
+    token = _mensagens.set(mensagens)
+    try:
+        yield mensagens
+    finally:
+        _mensagens.reset(token)
+
+def registrar_auditoria(operacao, sucesso, **dados):
+    """
+    Envia um registro ao log de auditoria (Conta.auditoria), se estiver ativo. Não faz I/O no chamador.
+
+    :param operacao: Nome da operação (ex.: "Deposito", "Cliente").
+    :param sucesso: Se a operação foi realizada; falhas são registradas com nível WARNING.
+    :param dados: Campos do registro (cpf, agencia, conta, valor...).
+    """
+    if Conta.auditoria is not None:
+        Conta.auditoria.registrar(operacao, "INFO" if sucesso else "WARNING", resultado="sucesso" if sucesso else "falha", **dados)
+
+def publicar_transacao(conta, tipo, valor, data):
+    """
+    Entrega uma transação registrada aos modelos de leitura (Conta.modelos_leitura), se estiverem ativos.
+
+    :param conta: Conta cujo saldo e histórico mudaram.
+    :param tipo: Tipo da entrada no histórico (ex.: "Deposito").
+    :param valor: Valor da transação.
+    :param data: datetime da transação.
+    """
+    if Conta.modelos_leitura is not None:
+        Conta.modelos_leitura.aplicar(conta, tipo, valor, data)
+
+def registrar_no_diario(operacao, **dados):
+    """
+    Grava uma operação de cadastro no diário das contas (Conta.diario), se estiver ativo.
+
+    :param operacao: Nome da operação (ex.: "Cliente", "Conta").
+    :param dados: Campos da operação.
+    """
+    if Conta.diario is not None:
+        Conta.diario.registrar(operacao, **dados)
+
 def menu():
     """
     Exibe o menu e captura a opção selecionada pelo usuário.
@@ -405,17 +992,17 @@ def menu():
     [nu]\tCriar cliente
     [q]\tSair
     => """
-    return input(textwrap.dedent(menu))  # Exibe o menu e captura a entrada
+    return ler_entrada(textwrap.dedent(menu))  # Exibe o menu e captura a entrada
 
 def filtrar_cliente(cpf, clientes):
     """
     Filtra um cliente pelo CPF.
 
     :param cpf: CPF do cliente a ser filtrado.
-    :param clientes: Lista de clientes a ser filtrada.
+    :param clientes: Registro de clientes (ClienteRegistry) indexado por CPF.
     :return: Cliente correspondente ao CPF ou None se não encontrado.
     """
-    return next((cliente for cliente in clientes if cliente.cpf == cpf), None)  # Retorna o cliente ou None
+    return clientes.buscar(cpf)  # Consulta por hash, sem percorrer todos os clientes
 
 def recuperar_conta_cliente(cliente):
     """
@@ -426,106 +1013,217 @@ def recuperar_conta_cliente(cliente):
     """
     return cliente.contas[0] if cliente.contas else None  # Retorna a primeira conta ou None se não houver
 
+def selecionar_conta(cliente, clientes):
+    """
+    Seleciona a conta do cliente para a operação: a única conta, ou a informada pelo usuário
+    (número, ou agência/número) quando o cliente tiver mais de uma.
+
+    :param cliente: Cliente dono da conta.
+    :param clientes: Registro de clientes, com o índice de contas.
+    :return: Conta selecionada ou None se não houver.
+    """
+    if not cliente.contas:
+        print("\n@@@ Cliente não possui conta! @@@")
+        return None
+    if len(cliente.contas) == 1:
+        return cliente.contas[0]
+
+    opcoes = ", ".join(f"{conta.agencia}/{conta.numero}" for conta in cliente.contas)
+    agencia, _, numero = ler_entrada(f"Conta ({opcoes}): ").strip().rpartition("/")
+    conta = clientes.buscar_conta(agencia or AGENCIA_PADRAO, int(numero)) if numero.isdigit() else None  # Consulta por hash
+    if conta is None or conta.cliente is not cliente:
+        print("\n@@@ Conta não encontrada! @@@")
+        return None
+    return conta
+
 @log_transacao
 def depositar(clientes):
     """
     Realiza um depósito na conta de um cliente.
 
-    :param clientes: Lista de clientes do sistema.
+    :param clientes: Registro de clientes do sistema.
+    :return: True se o depósito foi realizado, False caso contrário.
     """
-    cpf = input("CPF do cliente: ")
+    cpf = ler_entrada("CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
     if not cliente:
         print("\n@@@ Esse cliente não existe! @@@")
-        return
-
-    valor = float(input("Valor a ser depositado: "))
-    transacao = Deposito(valor)
+        return False
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = selecionar_conta(cliente, clientes)
     if not conta:
-        return
+        return False
+
+    valor = float(ler_entrada("Valor a ser depositado: "))
+    transacao = Deposito(valor)
     
-    cliente.realizar_transacao(conta, transacao)  # Realiza a transação de depósito
+    return cliente.realizar_transacao(conta, transacao)  # Realiza a transação de depósito
 
 @log_transacao
 def sacar(clientes):
     """
     Realiza um saque na conta de um cliente.
 
-    :param clientes: Lista de clientes do sistema.
+    :param clientes: Registro de clientes do sistema.
+    :return: True se o saque foi realizado, False caso contrário.
     """
-    cpf = input("CPF do cliente: ")
+    cpf = ler_entrada("CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
     if not cliente:
         print("\n@@@ Esse cliente não existe! @@@")
-        return
-
-    valor = float(input("Valor a ser sacado: "))
-    transacao = Saque(valor)
+        return False
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = selecionar_conta(cliente, clientes)
     if not conta:
-        return
+        return False
+
+    valor = float(ler_entrada("Valor a ser sacado: "))
+    transacao = Saque(valor)
     
-    cliente.realizar_transacao(conta, transacao)  # Realiza a transação de saque
+    return cliente.realizar_transacao(conta, transacao)  # Realiza a transação de saque
 
 @log_transacao
 def exibir_extrato(clientes):
     """
     Exibe o extrato da conta de um cliente.
 
-    :param clientes: Lista de clientes do sistema.
+    :param clientes: Registro de clientes do sistema.
+    :return: True se o extrato foi exibido, False caso contrário.
     """
-    cpf = input("CPF do cliente: ")
+    cpf = ler_entrada("CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
     if not cliente:
         print("\n@@@ Esse cliente não existe! @@@")
-        return
+        return False
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = selecionar_conta(cliente, clientes)
     if not conta:
-        return
+        return False
+
+    periodo = ler_entrada("Período (dd-mm-aaaa dd-mm-aaaa) ou [Enter] para o extrato completo: ").split()
+    inicio = fim = None
+    if periodo:
+        try:
+            inicio, fim = (datetime.strptime(texto, "%d-%m-%Y").date() for texto in periodo)
+        except ValueError:
+            inicio = None  # Datas inválidas ou quantidade de datas diferente de duas
+        if inicio is None or fim < inicio:
+            print("\n@@@ Período inválido! @@@")
+            return False
     
     print("\n========== EXTRATO ==========")
-    extrato = ""
-    transacoes = conta.historico.gerar_relatorio()  # Gera o relatório de transações
+    if inicio is not None:
+        escrever_saldo_inicial_extrato(conta, sys.stdout, inicio)
+    cursor = 0
+    while cursor is not None:
+        cursor = escrever_extrato(conta, sys.stdout, TAMANHO_PAGINA_EXTRATO, cursor, inicio, fim)  # Escreve uma página
+        print()
+        if cursor is not None and ler_entrada("\n[Enter] Próxima página | [q] Encerrar: ").strip().lower() == "q":
+            break
+    escrever_rodape_extrato(conta, sys.stdout, fim)
+    return True
+
+def escrever_extrato(conta, escritor, tamanho_pagina=None, cursor=0, inicio=None, fim=None):
+    """
+    Escreve as movimentações da conta linha a linha no escritor, sem acumular o extrato em memória.
+
+    :param conta: Conta cujo extrato será escrito.
+    :param escritor: Objeto com método write (ex.: sys.stdout ou um arquivo aberto).
+    :param tamanho_pagina: Quantidade máxima de linhas a escrever; None escreve tudo.
+    :param cursor: Cursor retornado pela página anterior (0 para a primeira página).
+    :param inicio: Data inicial do período, inclusiva (opcional).
+    :param fim: Data final do período, inclusiva (opcional).
+    :return: Cursor da próxima página, ou None se o extrato terminou.
+    """
+    escritas = 0
+    for transacao in conta.historico.gerar_relatorio(inicio, fim, a_partir_de=cursor):
+        if tamanho_pagina is not None and escritas == tamanho_pagina:
+            return cursor + escritas  # Ainda há movimentações: devolve onde continuar
+        escritor.write(f"\n{transacao['tipo']}:\tR${transacao['valor']:.2f}\t Data: {transacao['data']}")
+        escritas += 1
+
+    if cursor == 0 and escritas == 0:
+        escritor.write("Não foram realizadas movimentações.")
+    return None
+
+def escrever_saldo_inicial_extrato(conta, escritor, inicio):
+    """
+    Escreve o saldo de abertura de um extrato por período (o saldo logo antes do início).
+
+    :param conta: Conta cujo extrato será escrito.
+    :param escritor: Objeto com método write.
+    :param inicio: Data inicial do período, inclusiva.
+    """
+    anterior = inicio - (timedelta(microseconds=1) if isinstance(inicio, datetime) else timedelta(days=1))
+    escritor.write(f"Saldo inicial:\tR${conta.historico.saldo_em(anterior):.2f}\n")
 
-    if not transacoes:
-        extrato = "Não foram realizadas movimentações."
+def escrever_rodape_extrato(conta, escritor, fim=None):
+    """
+    Escreve o saldo e o rodapé do extrato.
+
+    :param conta: Conta cujo extrato foi escrito.
+    :param escritor: Objeto com método write.
+    :param fim: Data final do período, inclusiva (opcional); com ela, escreve o saldo de fechamento do período.
+    """
+    if fim is None:
+        escritor.write(f"\nSaldo:\t\tR${conta.saldo:.2f}\n==============================\n")
     else:
-        for transacao in transacoes:
-            extrato += f"\n{transacao['tipo']}:\tR${transacao['valor']:.2f}\t Data: {transacao['data']}"
-    
-    print(extrato)
-    print(f"\nSaldo:\t\tR${conta.saldo:.2f}")
-    print("==============================")
+        escritor.write(f"\nSaldo final:\tR${conta.historico.saldo_em(fim):.2f}\n==============================\n")
+
+def gerar_extratos(contas, diretorio, inicio=None, fim=None):
+    """
+    Gera um arquivo de extrato por conta, em lote, com memória constante por conta.
+
+    :param contas: Iterável de contas.
+    :param diretorio: Diretório de destino (criado se não existir).
+    :param inicio: Data inicial do período, inclusiva (opcional).
+    :param fim: Data final do período, inclusiva (opcional).
+    :return: Quantidade de extratos gerados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    gerados = 0
+    for conta in contas:
+        caminho = os.path.join(diretorio, f"extrato-{conta.agencia}-{conta.numero}.txt")
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write("========== EXTRATO ==========\n")
+            if inicio is not None:
+                escrever_saldo_inicial_extrato(conta, arquivo, inicio)
+            escrever_extrato(conta, arquivo, inicio=inicio, fim=fim)
+            arquivo.write("\n")
+            escrever_rodape_extrato(conta, arquivo, fim)
+        gerados += 1
+    return gerados
 
 @log_transacao
 def criar_cliente(clientes):
     """
-    Cria um novo cliente e o adiciona à lista de clientes.
+    Cria um novo cliente e o adiciona ao registro de clientes.
 
-    :param clientes: Lista de clientes do sistema.
+    :param clientes: Registro de clientes do sistema.
+    :return: True se o cliente foi criado, False caso contrário.
     """
-    cpf = input("Informe o CPF (somente números): ")
+    cpf = ler_entrada("Informe o CPF (somente números): ")
     cliente = filtrar_cliente(cpf, clientes)
 
     if cliente:
         print("\n@@@ Já existe um cliente com esse CPF! @@@")
-        return
+        registrar_auditoria("Cliente", False, cpf=cpf)
+        return False
 
-    nome = input("Informe o nome completo: ")
-    data_nascimento = input("Informe a data de nascimento (dd-mm-aaaa): ")
-    endereco = input("Informe o endereço: ")
+    nome = ler_entrada("Informe o nome completo: ")
+    data_nascimento = ler_entrada("Informe a data de nascimento (dd-mm-aaaa): ")
+    endereco = ler_entrada("Informe o endereço: ")
 
     cliente = PessoaFisica(nome, data_nascimento, cpf, endereco)  # Cria um novo cliente
-    clientes.append(cliente)  # Adiciona o cliente à lista
+    registrar_no_diario("Cliente", cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
+    clientes.adicionar(cliente)  # Adiciona o cliente ao registro
+    registrar_auditoria("Cliente", True, cpf=cpf)
 
     print("\n=== Cliente criado com sucesso! ===")
+    return True
 
 @log_transacao
 def criar_conta(numero_conta, clientes, contas):
@@ -533,74 +1231,154 @@ def criar_conta(numero_conta, clientes, contas):
     Cria uma nova conta para um cliente.
 
     :param numero_conta: Número da nova conta.
-    :param clientes: Lista de clientes do sistema.
+    :param clientes: Registro de clientes do sistema.
     :param contas: Lista de contas do sistema.
+    :return: True se a conta foi criada, False caso contrário.
     """
-    cpf = input("Informe o CPF do cliente: ")
+    cpf = ler_entrada("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
     if not cliente:
         print("\n@@@ Cliente não encontrado! @@@")
-        return
+        registrar_auditoria("Conta", False, cpf=cpf)
+        return False
 
     conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)  # Cria nova conta
+    registrar_no_diario(
+        "Conta", agencia=conta.agencia, numero=conta.numero, cpf=cliente.cpf, limite=conta.limite, limite_saques=conta._limite_saques
+    )
     cliente.adicionar_conta(conta)  # Adiciona a conta ao cliente
     contas.append(conta)  # Adiciona a conta à lista de contas
+    registrar_auditoria("Conta", True, cpf=cliente.cpf, agencia=conta.agencia, conta=conta.numero)
 
     print("\n=== Conta criada com sucesso! ===")
+    return True
 
 @log_transacao
-def listar_contas(contas):
+def listar_contas(contas, agencia=None, titular=None, ordem="numero"):
     """
-    Lista todas as contas cadastradas no sistema.
+    Lista as contas cadastradas no sistema, uma página de cada vez.
 
     :param contas: Lista de contas do sistema.
+    :param agencia: Agência das contas a listar (opcional).
+    :param titular: Cliente cujas contas serão listadas (opcional).
+    :param ordem: "numero" ou "saldo".
     """
     if not contas:
         print("\n@@@ Não existem contas cadastradas! @@@")
     else:
         print("\n=== Listagem de Contas ===")
-        iterador = ContasIterador(contas)
-        for conta in iterador:
-            print(conta)  # Mostra as informações da conta
+        iterador = ContasIterador(contas, agencia=agencia, titular=titular, ordem=ordem)
+        while iterador.escrever_pagina(sys.stdout, TAMANHO_PAGINA_CONTAS) is not None:  # Uma escrita por página
+            if ler_entrada("\n[Enter] Próxima página | [q] Encerrar: ").strip().lower() == "q":
+                break
         print("===========================")
 
-def main():
+def main(
+    diretorio_dados=None, snapshot_a_cada=1000, arquivo_metricas=None, diretorio_auditoria=None, politica_auditoria="bloquear",
+    arquivo_sqlite=None, entrada=None,
+):
     """
     Função principal que executa o sistema bancário interativo.
     Permite ao usuário interagir com o sistema, realizar operações e gerenciar contas e clientes.
-    """
-    clientes = []  # Lista de clientes cadastrados
-    contas = []    # Lista de contas cadastradas
-    numero_conta = 1001  # Número inicial da conta
-    while True:
-        opcao = menu()  # Chama a função menu para obter a opção do usuário
-
-        if opcao == 'd':  # Depositar
-            depositar(clientes)  # Chama a função de depósito
-
-        elif opcao == 's':  # Sacar
-            sacar(clientes)  # Chama a função de saque
-
-        elif opcao == 'e':  # Extrato
-            exibir_extrato(clientes)  # Chama a função de exibição de extrato
-
-        elif opcao == 'nc':  # Nova conta
-            criar_conta(numero_conta, clientes, contas)  # Chama a função de criação de conta
-            numero_conta += 1  # Incrementa o número da conta
 
-        elif opcao == 'lc':  # Listar contas
-            listar_contas(contas)  # Chama a função de listar contas
-
-        elif opcao == 'nu':  # Criar cliente
-            criar_cliente(clientes)  # Chama a função de criação de cliente
-
-        elif opcao == 'q':  # Sair
-            print("\n=== Saindo do sistema... ===")
-            break  # Encerra o loop
-
-        else:
-            print("\n@@@ Opção inválida! Tente novamente. @@@")  # Mensagem de erro
+    :param diretorio_dados: Diretório de snapshots e diário; se informado, o estado é restaurado na
+                            inicialização e cada mutação é gravada antes de ser confirmada.
+    :param snapshot_a_cada: Quantidade de operações entre dois snapshots.
+    :param arquivo_metricas: Arquivo onde as métricas são gravadas ao sair (.json em JSON; outros no formato do Prometheus).
+    :param diretorio_auditoria: Diretório do log de auditoria (opcional); os registros pendentes são gravados ao sair.
+    :param politica_auditoria: Política do log de auditoria com a fila cheia (ver auditoria.POLITICAS).
+    :param arquivo_sqlite: Banco SQLite com clientes, contas e histórico (opcional, alternativa a diretorio_dados).
+    :param entrada: Função que recebe a pergunta e retorna a resposta (opcional); o padrão é input().
+    """
+    global ler_entrada
+    persistencia = repositorio = None
+    if arquivo_sqlite:
+        from repositorio_sqlite import RepositorioSQLite
+        repositorio = RepositorioSQLite(arquivo_sqlite)
+        Conta.ledger = repositorio  # Antes de carregar: as contas leem o histórico do banco
+        clientes, contas, numero_conta = repositorio.carregar()
+    elif diretorio_dados:
+        from persistencia import Persistencia  # Importado aqui porque persistencia depende deste módulo
+        persistencia = Persistencia(diretorio_dados)
+        clientes, contas, numero_conta = persistencia.carregar()  # Último snapshot + cauda do diário
+    else:
+        clientes = ClienteRegistry()  # Registro de clientes indexado por CPF
+        contas = []    # Lista de contas cadastradas
+        numero_conta = 1001  # Número inicial da conta
+    if diretorio_auditoria:
+        from auditoria import LogAuditoria
+        Conta.auditoria = LogAuditoria(diretorio_auditoria, politica=politica_auditoria)
+    operacoes = 0  # Operações desde o último snapshot
+    entrada_anterior = ler_entrada
+    if entrada is not None:
+        ler_entrada = entrada  # Usada por todas as perguntas do menu até main() retornar
+    try:
+        while True:
+            opcao = menu()  # Chama a função menu para obter a opção do usuário
+            operacoes += 1
+            if persistencia and operacoes >= snapshot_a_cada:
+                persistencia.salvar_snapshot(clientes, contas, numero_conta)  # Snapshot periódico
+                operacoes = 0
+
+            if opcao == 'd':  # Depositar
+                depositar(clientes)  # Chama a função de depósito
+
+            elif opcao == 's':  # Sacar
+                sacar(clientes)  # Chama a função de saque
+
+            elif opcao == 'e':  # Extrato
+                exibir_extrato(clientes)  # Chama a função de exibição de extrato
+
+            elif opcao == 'nc':  # Nova conta
+                if criar_conta(numero_conta, clientes, contas):  # Chama a função de criação de conta
+                    numero_conta += 1  # Incrementa o número da conta
+
+            elif opcao == 'lc':  # Listar contas
+                listar_contas(contas)  # Chama a função de listar contas
+
+            elif opcao == 'nu':  # Criar cliente
+                criar_cliente(clientes)  # Chama a função de criação de cliente
+
+            elif opcao == 'q':  # Sair
+                if persistencia:
+                    persistencia.salvar_snapshot(clientes, contas, numero_conta)  # Acelera a próxima inicialização
+                    persistencia.fechar()
+                if arquivo_metricas:
+                    gravar_metricas(arquivo_metricas)
+                print("\n=== Saindo do sistema... ===")
+                break  # Encerra o loop
+
+            else:
+                print("\n@@@ Opção inválida! Tente novamente. @@@")  # Mensagem de erro
+    finally:
+        ler_entrada = entrada_anterior
+        if repositorio:
+            repositorio.fechar()  # Grava o lote pendente
+            Conta.ledger = None
+        if Conta.auditoria is not None:
+            Conta.auditoria.fechar()  # Grava a auditoria pendente mesmo em saídas inesperadas (ex.: Ctrl+C)
+            Conta.auditoria = None
 
 if __name__ == "__main__":
-    main()  # Executa a função principal ao rodar o script
+    sys.modules.setdefault("banco_poo_datetime", sys.modules[__name__])  # Os demais módulos usam as classes deste script
+
+    parser = argparse.ArgumentParser(description="Sistema bancário interativo.")
+    armazenamento = parser.add_mutually_exclusive_group()
+    armazenamento.add_argument("--dados", help="diretório de snapshots e diário para persistir o estado")
+    armazenamento.add_argument(
+        "--sqlite",
+        help="banco SQLite com clientes, contas e histórico; as gravações vão em lotes e, sem diário, as do lote ainda"
+             " não aplicado (até 256 operações já confirmadas) se perdem numa queda do processo",
+    )
+    parser.add_argument("--metricas", help="arquivo onde gravar as métricas ao sair (.json ou texto do Prometheus)")
+    parser.add_argument("--auditoria", help="diretório do log de auditoria (arquivos rotativos)")
+    parser.add_argument(
+        "--politica-auditoria", default="bloquear", choices=("bloquear", "descartar_novos", "descartar_antigos"),
+        help="o que fazer quando a fila da auditoria enche",
+    )
+    argumentos = parser.parse_args()
+    main(
+        diretorio_dados=argumentos.dados, arquivo_metricas=argumentos.metricas, diretorio_auditoria=argumentos.auditoria,
+        politica_auditoria=argumentos.politica_auditoria, arquivo_sqlite=argumentos.sqlite,
+    )  # Executa a função principal ao rodar o script
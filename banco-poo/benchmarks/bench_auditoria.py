@@ -0,0 +1,126 @@
+"""
+Benchmark do log de auditoria (auditoria.py): vazão de depósitos com várias threads sem
+auditoria, com escrita síncrona a cada operação (como o antigo print de log_transacao) e com o
+log assíncrono em cada política de fila cheia. Mostra também os registros gravados e descartados.
+
+Uso: python benchmarks/bench_auditoria.py [--threads N] [--operacoes N] [--capacidade N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from auditoria import LogAuditoria
+from banco_poo_datetime import Conta, ContaCorrente, Deposito, PessoaFisica
+
+class AuditoriaSincrona:
+    """
+    Referência: escreve e descarrega cada registro no próprio caminho da operação.
+    """
+    def __init__(self, diretorio):
+        """
+        Abre o arquivo de referência.
+
+        :param diretorio: Diretório do arquivo.
+        """
+        self._arquivo = open(Path(diretorio) / "sincrona.log", "a", encoding="utf-8")
+        self._trava = threading.Lock()
+        self.descartados = 0
+
+    def registrar(self, operacao, nivel="INFO", **dados):
+        """
+        Escreve o registro imediatamente.
+        """
+        linha = json.dumps({"instante": time.time(), "nivel": nivel, "op": operacao, **dados}) + "\n"
+        with self._trava:
+            self._arquivo.write(linha)
+            self._arquivo.flush()
+
+    def fechar(self):
+        """
+        Fecha o arquivo.
+        """
+        self._arquivo.close()
+
+def medir(auditoria, threads, operacoes):
+    """
+    Executa depósitos em paralelo, cada um em um dia diferente (sem esbarrar no limite diário).
+
+    :param auditoria: Log de auditoria a usar (None desativa).
+    :param threads: Número de threads.
+    :param operacoes: Depósitos por thread.
+    :return: Operações por segundo (incluindo o fechamento do log, que grava o que restou na fila).
+    """
+    cliente = PessoaFisica("Cliente", "01-01-1990", "00000000000", "Rua")
+    contas = [ContaCorrente.nova_conta(cliente=cliente, numero=numero) for numero in range(threads)]
+    inicio_dias = datetime(2024, 1, 1, 12)
+
+    def trabalhar(conta):
+        for dia in range(operacoes):
+            cliente.realizar_transacao(conta, Deposito(10.0, inicio_dias + timedelta(days=dia)))
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(conta,)) for conta in contas]
+    Conta.auditoria = auditoria
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    if auditoria:
+        auditoria.fechar()
+    duracao = time.perf_counter() - inicio
+    Conta.auditoria = None
+    return threads * operacoes / duracao
+
+def contar_linhas(diretorio):
+    """
+    Conta as linhas de todos os arquivos de log do diretório (inclusive os rotacionados).
+
+    :param diretorio: Diretório dos arquivos.
+    :return: Quantidade de registros gravados.
+    """
+    total = 0
+    for arquivo in Path(diretorio).iterdir():
+        with open(arquivo, "rb") as conteudo:
+            total += sum(1 for _linha in conteudo)
+    return total
+
+def main():
+    """
+    Mede cada configuração e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operacoes", type=int, default=5_000, help="depósitos por thread")
+    parser.add_argument("--capacidade", type=int, default=1_000, help="capacidade da fila do log assíncrono")
+    args = parser.parse_args()
+
+    configuracoes = [("sem auditoria", None), ("síncrona", "sincrona")] + [
+        (politica, politica) for politica in ("bloquear", "descartar_novos", "descartar_antigos")
+    ]
+    print(f"{'configuração':<20}{'ops/s':>10}{'gravados':>10}{'descartados':>13}")
+    with open(os.devnull, "w") as silencio:
+        for nome, tipo in configuracoes:
+            with tempfile.TemporaryDirectory() as diretorio:
+                if tipo is None:
+                    auditoria = None
+                elif tipo == "sincrona":
+                    auditoria = AuditoriaSincrona(diretorio)
+                else:
+                    auditoria = LogAuditoria(diretorio, politica=tipo, capacidade=args.capacidade, tamanho_maximo=1024 * 1024)
+                with redirect_stdout(silencio):  # Descarta as mensagens das operações
+                    ops = medir(auditoria, args.threads, args.operacoes)
+                gravados = contar_linhas(diretorio) if auditoria else 0
+                descartados = auditoria.descartados if auditoria else 0
+                print(f"{nome:<20}{ops:>10.0f}{gravados:>10}{descartados:>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark do cadastro em lote (cadastro_lote.py): clientes e contas cadastrados por segundo
+pelas funções interativas criar_cliente/criar_conta (um registro de cada vez, com a entrada
+simulada) e por cadastrar_em_lote. Com --diario, ambos gravam no diário em modo grupo.
+
+Uso: python benchmarks/bench_cadastro_lote.py [--clientes N] [--tamanho-bloco N] [--diario]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+import banco_poo_datetime
+from banco_poo_datetime import Conta, criar_cliente, criar_conta
+from cadastro_lote import cadastrar_em_lote
+from diario import Diario
+from registro_clientes import ClienteRegistry
+
+def gerar_registros(quantidade):
+    """
+    Gera registros de cliente e pedidos de conta sintéticos, com alguns CPFs repetidos.
+
+    :param quantidade: Quantidade de clientes.
+    :return: Tupla (registros de cliente, pedidos de conta).
+    """
+    registros = [
+        {"cpf": f"{indice % (quantidade - quantidade // 100):011d}", "nome": f"Cliente {indice}", "data_nascimento": "01-01-1990",
+         "endereco": "Rua A, 1"}
+        for indice in range(quantidade)
+    ]  # O último 1% repete CPFs do começo
+    pedidos = [{"cpf": registro["cpf"]} for registro in registros]
+    return registros, pedidos
+
+def medir_interativo(registros, pedidos):
+    """
+    Cadastra um registro de cada vez pelas funções do menu, com a entrada simulada.
+
+    :param registros: Registros de cliente.
+    :param pedidos: Pedidos de conta.
+    :return: Registros por segundo.
+    """
+    respostas = iter(
+        [valor for registro in registros for valor in (registro["cpf"], registro["nome"], registro["data_nascimento"], registro["endereco"])]
+    )
+    clientes, contas, numero_conta = ClienteRegistry(), [], 1001
+    entrada_original = banco_poo_datetime.ler_entrada
+    banco_poo_datetime.ler_entrada = lambda _mensagem="": next(respostas)
+    inicio = time.perf_counter()
+    try:
+        for registro in registros:
+            # Um CPF repetido interrompe criar_cliente após a primeira pergunta: descarta as demais respostas
+            if not criar_cliente(clientes):
+                for _ in range(3):
+                    next(respostas)
+        respostas = iter([pedido["cpf"] for pedido in pedidos])
+        for _pedido in pedidos:
+            if criar_conta(numero_conta, clientes, contas):
+                numero_conta += 1
+    finally:
+        banco_poo_datetime.ler_entrada = entrada_original
+    return (len(registros) + len(pedidos)) / (time.perf_counter() - inicio)
+
+def main():
+    """
+    Mede as duas formas de cadastro e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=50_000)
+    parser.add_argument("--tamanho-bloco", type=int, default=1024)
+    parser.add_argument("--diario", action="store_true", help="grava no diário (modo grupo) durante o cadastro")
+    args = parser.parse_args()
+
+    registros, pedidos = gerar_registros(args.clientes)
+    print(f"{'forma':<14}{'registros/s':>14}{'contas':>10}{'rejeitados':>12}")
+    for forma in ("interativo", "lote"):
+        with tempfile.TemporaryDirectory() as diretorio, open(os.devnull, "w") as silencio:
+            Conta.diario = Diario(os.path.join(diretorio, "banco.journal"), janela_ms=1) if args.diario else None
+            try:
+                if forma == "interativo":
+                    with redirect_stdout(silencio):  # Descarta as mensagens das operações
+                        vazao = medir_interativo(registros, pedidos)
+                    contas, rejeitados = "-", "-"
+                else:
+                    relatorio = cadastrar_em_lote(registros, pedidos, ClienteRegistry(), [], tamanho_bloco=args.tamanho_bloco)
+                    vazao, contas, rejeitados = relatorio["vazao"], relatorio["contas"], len(relatorio["rejeitados"])
+            finally:
+                if Conta.diario is not None:
+                    Conta.diario.fechar()
+                    Conta.diario = None
+        print(f"{forma:<14}{vazao:>14.0f}{contas:>10}{rejeitados:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark da conciliação de fim de dia (conciliacao.py): contas e transações conciliadas por
+segundo de 1 até N processos, e o tempo de uma nova execução que reaproveita os checkpoints.
+
+Uso: python benchmarks/bench_conciliacao.py [--contas N] [--dias N] [--processos 1 2 4 ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import ContaCorrente, Deposito, PessoaFisica, Saque
+from conciliacao import TAMANHO_PARTICAO, conciliar
+
+def criar_contas(quantidade, dias):
+    """
+    Cria as contas com um depósito e um saque por dia (dentro dos limites diários).
+
+    :param quantidade: Quantidade de contas.
+    :param dias: Dias de movimentação por conta.
+    :return: Lista de contas.
+    """
+    contas = []
+    inicio = datetime(2024, 1, 1, 10)
+    with open(os.devnull, "w") as silencio, redirect_stdout(silencio):  # Descarta as mensagens das operações
+        for indice in range(quantidade):
+            cliente = PessoaFisica(f"Cliente {indice}", "01-01-1990", f"{indice:011d}", "Rua")
+            conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001 + indice)
+            cliente.adicionar_conta(conta)
+            for dia in range(dias):
+                data = inicio + timedelta(days=dia)
+                cliente.realizar_transacao(conta, Deposito(100.0, data))
+                cliente.realizar_transacao(conta, Saque(30.0, data + timedelta(hours=1)))
+            contas.append(conta)
+    return contas
+
+def main():
+    """
+    Concilia as contas com cada quantidade de processos e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=50_000)
+    parser.add_argument("--dias", type=int, default=10, help="dias de movimentação por conta (2 transações por dia)")
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tamanho-particao", type=int, default=TAMANHO_PARTICAO // 4)
+    args = parser.parse_args()
+
+    contas = criar_contas(args.contas, args.dias)
+    print(f"{'processos':>10}{'contas/s':>12}{'transações/s':>15}{'reexecução (s)':>16}{'divergências':>14}")
+    for processos in args.processos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            relatorio = conciliar(contas, diretorio, processos, args.tamanho_particao)
+            reexecucao = conciliar(contas, diretorio, processos, args.tamanho_particao)  # Todas as partições têm checkpoint
+        assert reexecucao["reaproveitadas"] == relatorio["particoes"]
+        print(
+            f"{processos:>10}{relatorio['contas'] / relatorio['segundos']:>12.0f}"
+            f"{relatorio['transacoes'] / relatorio['segundos']:>15.0f}{reexecucao['segundos']:>16.3f}"
+            f"{len(relatorio['divergencias']):>14}"
+        )
+
+if __name__ == "__main__":
+    main()
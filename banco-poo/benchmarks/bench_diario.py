@@ -0,0 +1,70 @@
+"""
+Benchmark do diário de escrita antecipada: operações por segundo com fsync por registro
+e com group commit em diferentes janelas de tempo.
+Cada thread registra depósitos na sua própria conta, e todas compartilham o mesmo diário.
+
+Uso: python benchmarks/bench_diario.py [--threads N] [--operacoes N] [--janelas 0.5 1 5 ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import Conta, ContaCorrente, Deposito, PessoaFisica
+from diario import Diario
+
+def medir(diario, threads, operacoes):
+    """
+    Executa os depósitos em paralelo gravando no diário informado.
+
+    :param diario: Diário a ser usado pelas contas.
+    :param threads: Número de threads.
+    :param operacoes: Depósitos por thread.
+    :return: Operações por segundo.
+    """
+    cliente = PessoaFisica("Cliente", "01-01-1990", "00000000000", "Rua")
+    contas = [ContaCorrente.nova_conta(cliente=cliente, numero=numero) for numero in range(threads)]
+
+    def trabalhar(conta):
+        for _ in range(operacoes):
+            Deposito(1.0).registrar(conta)
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(conta,)) for conta in contas]
+    Conta.diario = diario
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    duracao = time.perf_counter() - inicio
+    Conta.diario = None
+    diario.fechar()
+    return threads * operacoes / duracao
+
+def main():
+    """
+    Mede o modo síncrono e o group commit em cada janela e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--operacoes", type=int, default=500, help="depósitos por thread")
+    parser.add_argument("--janelas", type=float, nargs="+", default=(0, 0.5, 1, 2, 5), help="janelas em ms")
+    args = parser.parse_args()
+
+    configuracoes = [("sincrono", 0)] + [("grupo", janela) for janela in args.janelas]
+    print(f"{'modo':<10}{'janela (ms)':>12}{'ops/s':>12}")
+    with tempfile.TemporaryDirectory() as diretorio, open(os.devnull, "w") as silencio:
+        for indice, (modo, janela) in enumerate(configuracoes):
+            diario = Diario(os.path.join(diretorio, f"diario-{indice}.log"), modo=modo, janela_ms=janela)
+            with redirect_stdout(silencio):  # Descarta as mensagens de sucesso das operações
+                ops = medir(diario, args.threads, args.operacoes)
+            print(f"{modo:<10}{janela:>12}{ops:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark de inicialização: tempo para carregar o último snapshot e reaplicar a cauda do
+diário, para estados de tamanhos crescentes (curva tamanho do estado x tempo de carga).
+
+Uso: python benchmarks/bench_inicializacao.py [--contas 1000 10000 ...] [--historico N] [--cauda N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import ContaCorrente, Deposito, PessoaFisica
+from persistencia import Persistencia
+
+def preparar(diretorio, quantidade_contas, historico, cauda):
+    """
+    Cria um estado com a quantidade de contas informada, grava o snapshot e acrescenta a cauda no diário.
+
+    :param diretorio: Diretório de dados.
+    :param quantidade_contas: Número de clientes (um por conta).
+    :param historico: Transações por conta incluídas no snapshot.
+    :param cauda: Depósitos gravados no diário depois do snapshot.
+    :return: Tamanho do snapshot em bytes.
+    """
+    persistencia = Persistencia(diretorio, modo_diario="grupo", janela_ms=0, transacoes_recentes=historico)
+    clientes, contas, numero_conta = persistencia.carregar()
+    inicio = datetime(2024, 1, 1)
+    for indice in range(quantidade_contas):
+        cliente = PessoaFisica("Cliente", "01-01-1990", f"{indice:011d}", "Rua")
+        clientes.adicionar(cliente)
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+        numero_conta += 1
+        for passo in range(historico):
+            conta.historico.adicionar_entrada("Deposito", 10.0, inicio + timedelta(minutes=passo))
+        conta.restaurar_saldo(10.0 * historico)
+    snapshot = persistencia.salvar_snapshot(clientes, contas, numero_conta)
+
+    with open(os.devnull, "w") as silencio, redirect_stdout(silencio):
+        for indice in range(cauda):
+            Deposito(1.0).registrar(contas[indice % len(contas)])
+    persistencia.fechar()
+    return snapshot.stat().st_size
+
+def main():
+    """
+    Executa o benchmark para cada tamanho e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, nargs="+", default=(1_000, 10_000, 100_000))
+    parser.add_argument("--historico", type=int, default=20, help="transações por conta no snapshot")
+    parser.add_argument("--cauda", type=int, default=5_000, help="registros do diário após o snapshot")
+    args = parser.parse_args()
+
+    print(f"{'contas':>10}{'transações':>12}{'snapshot (MB)':>15}{'cauda':>8}{'carga (s)':>11}")
+    for quantidade in args.contas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            tamanho = preparar(diretorio, quantidade, args.historico, args.cauda)
+            inicio = time.perf_counter()
+            persistencia = Persistencia(diretorio)
+            persistencia.carregar()
+            duracao = time.perf_counter() - inicio
+            persistencia.fechar()
+        print(f"{quantidade:>10}{quantidade * args.historico:>12}{tamanho / 2**20:>15.2f}{args.cauda:>8}{duracao:>11.3f}")
+
+if __name__ == "__main__":
+    main()
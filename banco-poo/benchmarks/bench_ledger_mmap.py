@@ -0,0 +1,64 @@
+"""
+Benchmark do histórico em ledger mapeado na memória (ledger_mmap) comparado aos armazenamentos
+em memória: uso de heap (tracemalloc) e velocidade de varredura de uma conta de vida longa.
+
+Uso: python benchmarks/bench_ledger_mmap.py [--transacoes N]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from armazenamento_historico import ArmazenamentoColunar, ArmazenamentoDicionarios
+from banco_poo_datetime import Historico
+from ledger_mmap import LedgersMmap
+
+def medir(nome, criar_armazenamento, quantidade):
+    """
+    Preenche o histórico de uma conta e mede heap e tempos de varredura.
+
+    :param nome: Nome exibido na tabela.
+    :param criar_armazenamento: Função sem argumentos que cria o armazenamento.
+    :param quantidade: Número de transações.
+    """
+    inicio_dia = datetime(2024, 1, 1)
+    tracemalloc.start()
+    historico = Historico(criar_armazenamento())
+    for indice in range(quantidade):
+        historico.adicionar_entrada("Deposito" if indice & 1 else "Saque", 10.0, inicio_dia + timedelta(seconds=indice * 30))
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    total = sum(valor for _tipo, valor, _instante in historico.entradas())
+    varredura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    linhas = sum(1 for _linha in historico.gerar_relatorio())
+    relatorio = time.perf_counter() - inicio
+    assert linhas == quantidade and total == 10.0 * quantidade
+    print(f"{nome:<14}{heap / quantidade:>14.1f}{quantidade / varredura / 1e6:>18.2f}{quantidade / relatorio / 1e6:>18.2f}")
+
+def main():
+    """
+    Executa o benchmark para cada armazenamento e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transacoes", type=int, default=500_000)
+    args = parser.parse_args()
+
+    print(f"{'armazenamento':<14}{'heap (B/tx)':>14}{'entradas (M/s)':>18}{'relatório (M/s)':>18}")
+    medir("dicionarios", ArmazenamentoDicionarios, args.transacoes)
+    medir("colunar", ArmazenamentoColunar, args.transacoes)
+    with tempfile.TemporaryDirectory() as diretorio:
+        ledgers = LedgersMmap(diretorio, shards=1)
+        medir("mmap", lambda: ledgers.armazenamento("0001", 1001), args.transacoes)
+        ledgers.fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark de memória do Historico: bytes por transação no armazenamento de dicionários
+(padrão) comparado ao armazenamento colunar compacto.
+
+Uso: python benchmarks/bench_memoria_historico.py [--transacoes N]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from armazenamento_historico import ArmazenamentoColunar, ArmazenamentoDicionarios
+from banco_poo_datetime import Deposito, Historico, Saque
+
+def medir(armazenamento, quantidade):
+    """
+    Preenche um histórico e mede a memória alocada e o tempo de escrita.
+
+    :param armazenamento: Classe de armazenamento a ser usada.
+    :param quantidade: Número de transações a registrar.
+    :return: Tupla (bytes por transação, microssegundos por escrita).
+    """
+    transacoes = [Deposito(10.5), Saque(3.25)]
+    inicio_dia = datetime(2024, 1, 1)
+    datas = [inicio_dia + timedelta(seconds=indice * 7) for indice in range(quantidade)]
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    historico = Historico(armazenamento())
+    inicio = time.perf_counter()
+    for indice, data in enumerate(datas):
+        historico.adicionar_transacao(transacoes[indice & 1], data)
+    duracao = time.perf_counter() - inicio
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (depois - antes) / quantidade, duracao / quantidade * 1e6
+
+def main():
+    """
+    Executa o benchmark para os dois armazenamentos e imprime os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transacoes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'armazenamento':<28}{'bytes/transação':>16}{'µs/escrita':>12}")
+    for armazenamento in (ArmazenamentoDicionarios, ArmazenamentoColunar):
+        bytes_por_transacao, micros = medir(armazenamento, args.transacoes)
+        print(f"{armazenamento.__name__:<28}{bytes_por_transacao:>16.1f}{micros:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de memória das classes de domínio: constrói N clientes com uma conta e uma
+transação cada e reporta o RSS e o pico do tracemalloc para as classes originais
+(com __dict__) e para as variantes compactas (com __slots__).
+Cada variante roda em um processo separado para que o RSS de uma não contamine a outra.
+
+Uso: python benchmarks/bench_memoria_objetos.py [--clientes N]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+VARIANTES = ("original", "compacta")
+
+def rss_atual_kb():
+    """
+    Retorna o RSS atual do processo em KB (lido de /proc no Linux, pico do processo nos demais sistemas).
+
+    :return: RSS em KB.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for linha in status:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def classes(variante):
+    """
+    Retorna as classes de cliente, conta e transação da variante.
+
+    :param variante: "original" ou "compacta".
+    :return: Tupla (PessoaFisica, ContaCorrente, Deposito).
+    """
+    if variante == "compacta":
+        from banco_compacto import ContaCorrenteCompacta, DepositoCompacto, PessoaFisicaCompacta
+        return PessoaFisicaCompacta, ContaCorrenteCompacta, DepositoCompacto
+    from banco_poo_datetime import ContaCorrente, Deposito, PessoaFisica
+    return PessoaFisica, ContaCorrente, Deposito
+
+def medir(variante, quantidade):
+    """
+    Constrói os objetos da variante e imprime RSS e pico do tracemalloc.
+
+    :param variante: "original" ou "compacta".
+    :param quantidade: Número de clientes (e contas) a construir.
+    """
+    pessoa_fisica, conta_corrente, deposito = classes(variante)
+    rss_inicial = rss_atual_kb()
+    tracemalloc.start()
+    clientes, contas, transacoes = [], [], []
+    for indice in range(quantidade):
+        cliente = pessoa_fisica("Cliente", "01-01-1990", f"{indice:011d}", "Rua")
+        conta = conta_corrente.nova_conta(cliente=cliente, numero=indice)
+        cliente.adicionar_conta(conta)
+        clientes.append(cliente)
+        contas.append(conta)
+        transacoes.append(deposito(10.0))
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss = rss_atual_kb() - rss_inicial
+    print(f"{variante:<10}{quantidade:>12}{rss / 1024:>12.1f}{pico / 2**20:>18.1f}{pico / quantidade:>14.1f}")
+
+def main():
+    """
+    Executa cada variante em um subprocesso e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument("--variante", choices=VARIANTES, help=argparse.SUPPRESS)  # Uso interno do subprocesso
+    args = parser.parse_args()
+
+    if args.variante:
+        medir(args.variante, args.clientes)
+        return
+
+    print(f"{'variante':<10}{'clientes':>12}{'RSS (MB)':>12}{'tracemalloc (MB)':>18}{'bytes/cliente':>14}")
+    for variante in VARIANTES:
+        subprocess.run(
+            [sys.executable, __file__, "--clientes", str(args.clientes), "--variante", variante], check=True
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark do custo da instrumentação (metricas.py): tempo por chamada de uma função vazia com e
+sem o decorador log_transacao, e o custo isolado de MetricaOperacao.registrar.
+A meta é ficar abaixo de 1 µs por chamada.
+
+Uso: python benchmarks/bench_metricas.py [--chamadas N] [--repeticoes N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import log_transacao
+from metricas import METRICAS
+
+def cronometrar(funcao, chamadas, repeticoes):
+    """
+    Mede o menor tempo por chamada entre as repetições.
+
+    :param funcao: Função sem argumentos a ser chamada.
+    :param chamadas: Chamadas por repetição.
+    :param repeticoes: Quantidade de repetições.
+    :return: Nanossegundos por chamada.
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        for _ in range(chamadas):
+            funcao()
+        melhor = min(melhor, (time.perf_counter_ns() - inicio) / chamadas)
+    return melhor
+
+def main():
+    """
+    Mede as variantes e imprime o custo por chamada.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chamadas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    def operacao_vazia():
+        return True
+
+    instrumentada = log_transacao(operacao_vazia)
+    metrica = METRICAS.operacao("bench")
+
+    base = cronometrar(operacao_vazia, args.chamadas, args.repeticoes)
+    decorada = cronometrar(instrumentada, args.chamadas, args.repeticoes)
+    registro = cronometrar(lambda: metrica.registrar(1_500, True), args.chamadas, args.repeticoes)
+    custo = decorada - base
+
+    print(f"{'variante':<28}{'ns/chamada':>12}")
+    print(f"{'função vazia':<28}{base:>12.0f}")
+    print(f"{'com log_transacao':<28}{decorada:>12.0f}")
+    print(f"{'MetricaOperacao.registrar':<28}{registro:>12.0f}")
+    print(f"\ncusto da instrumentação: {custo:.0f} ns por chamada ({'dentro' if custo < 1_000 else 'FORA'} da meta de 1 µs)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark dos modelos de leitura (modelos_leitura.py): custo por transação com os modelos ativos,
+tempo de consulta dos totais comparado a percorrer todas as contas e históricos, e tempo da
+verificação de consistência (reconstrução completa).
+
+Uso: python benchmarks/bench_modelos_leitura.py [--contas N] [--transacoes N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import Conta, ContaCorrente, Deposito, PessoaFisica, Saque
+from modelos_leitura import ModelosLeitura
+
+AGENCIAS = ("0001", "0002", "0003", "0004")
+
+def criar_contas(quantidade):
+    """
+    Cria as contas, distribuídas entre as agências.
+
+    :param quantidade: Quantidade de contas.
+    :return: Lista de contas.
+    """
+    contas = []
+    for indice in range(quantidade):
+        cliente = PessoaFisica(f"Cliente {indice}", "01-01-1990", f"{indice:011d}", "Rua")
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001 + indice, agencia=AGENCIAS[indice % len(AGENCIAS)])
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+    return contas
+
+def movimentar(contas, transacoes, semente):
+    """
+    Faz depósitos e saques sorteados, cada um num dia diferente da conta (sem esbarrar no limite diário).
+
+    :param contas: Lista de contas.
+    :param transacoes: Quantidade de transações.
+    :param semente: Semente do gerador aleatório.
+    :return: Transações por segundo.
+    """
+    gerador = random.Random(semente)
+    inicio_dias = datetime(2024, 1, 1, 12)
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as silencio, redirect_stdout(silencio):  # Descarta as mensagens das operações
+        for indice in range(transacoes):
+            conta = contas[indice % len(contas)]
+            data = inicio_dias + timedelta(days=indice // len(contas))
+            transacao = Deposito(gerador.randint(100, 50_000) / 100, data) if gerador.random() < 0.7 else Saque(100.0, data)
+            conta.cliente.realizar_transacao(conta, transacao)
+    return transacoes / (time.perf_counter() - inicio)
+
+def totais_por_varredura(contas, agencia, dia):
+    """
+    Calcula o saldo da agência e o total depositado no dia percorrendo todas as contas e históricos.
+
+    :param contas: Lista de contas.
+    :param agencia: Código da agência.
+    :param dia: date do dia.
+    :return: Tupla (saldo da agência, total depositado no dia).
+    """
+    saldo = sum(conta.saldo for conta in contas if conta.agencia == agencia)
+    depositado = sum(
+        valor for conta in contas for tipo, valor, instante in conta.historico.entradas()
+        if tipo == "Deposito" and date.fromtimestamp(instante) == dia
+    )
+    return saldo, depositado
+
+def main():
+    """
+    Mede as transações sem e com os modelos, as consultas e a verificação, e imprime os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=200_000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'modelos':<10}{'transações/s':>14}")
+    sem_modelos = movimentar(criar_contas(args.contas), args.transacoes, args.semente)
+    print(f"{'inativos':<10}{sem_modelos:>14.0f}")
+    contas = criar_contas(args.contas)
+    Conta.modelos_leitura = modelos = ModelosLeitura()
+    try:
+        com_modelos = movimentar(contas, args.transacoes, args.semente)
+    finally:
+        Conta.modelos_leitura = None
+    print(f"{'ativos':<10}{com_modelos:>14.0f}")
+
+    dia = date(2024, 1, 2)
+    inicio = time.perf_counter()
+    esperado = totais_por_varredura(contas, AGENCIAS[0], dia)
+    varredura = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    obtido = (modelos.totais_agencia(AGENCIAS[0])["saldo"], modelos.totais_dia(dia)["Deposito"]["valor"])
+    modelo = time.perf_counter() - inicio
+    assert all(abs(a - b) < 0.005 for a, b in zip(esperado, obtido)), (esperado, obtido)
+    inicio = time.perf_counter()
+    modelos.maiores_saldos(10)
+    maiores = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    divergencias = modelos.verificar(contas)
+    verificacao = time.perf_counter() - inicio
+
+    print(f"\n{'consulta':<34}{'segundos':>12}")
+    print(f"{'saldo da agência + depósitos do dia':<34}{'':>12}")
+    print(f"{'  varredura':<34}{varredura:>12.6f}")
+    print(f"{'  modelos':<34}{modelo:>12.6f}")
+    print(f"{'10 maiores saldos (modelos)':<34}{maiores:>12.6f}")
+    print(f"{'verificação (reconstrução)':<34}{verificacao:>12.3f}")
+    print(f"\ndivergências: {len(divergencias)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark da busca de clientes por CPF no ClienteRegistry.
+Mostra que o custo da consulta permanece constante conforme o número de clientes cresce.
+
+Uso: python benchmarks/bench_registro_clientes.py [--tamanhos 1000 10000 ...] [--consultas N]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import PessoaFisica, filtrar_cliente
+from registro_clientes import ClienteRegistry
+
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+def montar_registro(quantidade):
+    """
+    Cria um registro com a quantidade de clientes informada.
+
+    :param quantidade: Número de clientes a serem cadastrados.
+    :return: ClienteRegistry preenchido.
+    """
+    registro = ClienteRegistry()
+    for indice in range(quantidade):
+        registro.adicionar(PessoaFisica("Cliente", "01-01-1990", f"{indice:011d}", "Rua"))
+    return registro
+
+def medir_consultas(registro, quantidade, consultas):
+    """
+    Mede o tempo médio de uma consulta por CPF existente.
+
+    :param registro: Registro de clientes.
+    :param quantidade: Número de clientes no registro.
+    :param consultas: Número de consultas a realizar.
+    :return: Nanossegundos por consulta.
+    """
+    gerador = random.Random(42)
+    cpfs = [f"{gerador.randrange(quantidade):011d}" for _ in range(consultas)]
+    inicio = time.perf_counter_ns()
+    for cpf in cpfs:
+        filtrar_cliente(cpf, registro)
+    return (time.perf_counter_ns() - inicio) / consultas
+
+def main():
+    """
+    Executa o benchmark para cada tamanho e imprime uma tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO)
+    parser.add_argument("--consultas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'clientes':>12}  {'ns/consulta':>12}")
+    for quantidade in args.tamanhos:
+        registro = montar_registro(quantidade)
+        print(f"{quantidade:>12}  {medir_consultas(registro, quantidade, args.consultas):>12.1f}")
+        del registro  # Libera a memória antes do próximo tamanho
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark do modo particionado (shards.py): vazão de operações em função da quantidade de
+processos trabalhadores, de 1 até o número de núcleos. O roteador envia os pedidos em lotes,
+um por shard, e os shards os processam em paralelo.
+
+Uso: python benchmarks/bench_shards.py [--shards 1 2 4 ...] [--clientes N] [--operacoes N] [--lote N]
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from shards import RoteadorShards
+
+def medir(shards, clientes, operacoes, lote, semente):
+    """
+    Cadastra os clientes e mede a vazão de depósitos, saques e extratos.
+
+    :param shards: Quantidade de processos trabalhadores.
+    :param clientes: Quantidade de clientes (uma conta cada).
+    :param operacoes: Quantidade de operações medidas.
+    :param lote: Pedidos enviados por vez ao roteador.
+    :param semente: Semente do gerador aleatório.
+    :return: Tupla (operações por segundo, contas listadas pelo fan-out).
+    """
+    roteador = RoteadorShards(shards)
+    cpfs = [f"{indice:011d}" for indice in range(clientes)]
+    roteador.executar_lote([
+        {"op": "criar_cliente", "cpf": cpf, "nome": f"Cliente {cpf}", "data_nascimento": "01-01-1990", "endereco": "Rua"}
+        for cpf in cpfs
+    ])
+    roteador.executar_lote([{"op": "criar_conta", "cpf": cpf} for cpf in cpfs])
+
+    gerador = random.Random(semente)
+    pedidos = []
+    for _ in range(operacoes):
+        cpf, sorteio = gerador.choice(cpfs), gerador.random()
+        if sorteio < 0.4:
+            pedidos.append({"op": "depositar", "cpf": cpf, "valor": 10})
+        elif sorteio < 0.7:
+            pedidos.append({"op": "sacar", "cpf": cpf, "valor": 10})
+        else:
+            pedidos.append({"op": "extrato", "cpf": cpf, "tamanho_pagina": 20})
+
+    inicio = time.perf_counter()
+    for posicao in range(0, operacoes, lote):
+        roteador.executar_lote(pedidos[posicao:posicao + lote])
+    duracao = time.perf_counter() - inicio
+
+    listadas, cursor = 0, None
+    while True:  # Percorre a listagem global para conferir o fan-out
+        pagina = roteador.executar({"op": "listar_contas", "cursor": cursor, "limite": 500})
+        listadas += len(pagina["contas"])
+        if (cursor := pagina["cursor"]) is None:
+            break
+    roteador.fechar()
+    return operacoes / duracao, listadas
+
+def main():
+    """
+    Mede cada quantidade de shards e imprime a tabela de resultados.
+    """
+    nucleos = multiprocessing.cpu_count()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=sorted({1, 2, 4, 8, nucleos} & set(range(1, nucleos + 1))))
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    parser.add_argument("--lote", type=int, default=2_000, help="pedidos enviados por vez ao roteador")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"núcleos: {nucleos}")
+    print(f"{'shards':>7}{'ops/s':>12}{'aceleração':>12}{'contas listadas':>17}")
+    base = None
+    for shards in args.shards:
+        ops, listadas = medir(shards, args.clientes, args.operacoes, args.lote, args.semente)
+        base = base or ops
+        print(f"{shards:>7}{ops:>12.0f}{ops / base:>11.2f}x{listadas:>17}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark do repositório SQLite (repositorio_sqlite.py) comparado ao estado em memória (padrão):
+depósitos por segundo, leitura do extrato e, no SQLite, o tempo para reabrir o banco e carregar
+clientes e contas. Mostra também o efeito do tamanho do lote de gravação.
+
+Uso: python benchmarks/bench_sqlite.py [--contas N] [--depositos N] [--lotes 1 256 ...]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import Conta, ContaCorrente, Deposito, PessoaFisica, escrever_extrato
+from registro_clientes import ClienteRegistry
+from repositorio_sqlite import RepositorioSQLite
+
+def medir(repositorio, contas_por_execucao, depositos):
+    """
+    Cadastra as contas, faz os depósitos (cada um em um dia, sem esbarrar no limite diário) e lê os extratos.
+
+    :param repositorio: RepositorioSQLite a usar, ou None para o estado em memória.
+    :param contas_por_execucao: Quantidade de contas.
+    :param depositos: Depósitos por conta.
+    :return: Tupla (depósitos por segundo, linhas de extrato por segundo).
+    """
+    Conta.ledger = repositorio
+    clientes, contas, _numero = repositorio.carregar() if repositorio else (ClienteRegistry(), [], 1001)
+    for indice in range(contas_por_execucao):
+        cliente = PessoaFisica(f"Cliente {indice}", "01-01-1990", f"{indice:011d}", "Rua")
+        clientes.adicionar(cliente)
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001 + indice)
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+
+    inicio_dias = datetime(2024, 1, 1, 12)
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as silencio, redirect_stdout(silencio):  # Descarta as mensagens das operações
+        for dia in range(depositos):
+            data = inicio_dias + timedelta(days=dia)
+            for conta in contas:
+                conta.cliente.realizar_transacao(conta, Deposito(10.0, data))
+    if repositorio:
+        repositorio.sincronizar()  # Conta o último lote
+    escrita = len(contas) * depositos / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    for conta in contas:
+        escrever_extrato(conta, io.StringIO())
+    leitura = len(contas) * depositos / (time.perf_counter() - inicio)
+    Conta.ledger = None
+    return escrita, leitura
+
+def main():
+    """
+    Mede o estado em memória e o SQLite com cada tamanho de lote e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=1_000)
+    parser.add_argument("--depositos", type=int, default=50, help="depósitos por conta")
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 256, 4096], help="tamanhos de lote do SQLite")
+    args = parser.parse_args()
+
+    print(f"{'armazenamento':<18}{'depósitos/s':>14}{'extrato (linhas/s)':>20}{'carga (s)':>12}")
+    escrita, leitura = medir(None, args.contas, args.depositos)
+    print(f"{'memória':<18}{escrita:>14.0f}{leitura:>20.0f}{'-':>12}")
+    for lote in args.lotes:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "banco.db")
+            repositorio = RepositorioSQLite(caminho, tamanho_lote=lote)
+            escrita, leitura = medir(repositorio, args.contas, args.depositos)
+            repositorio.fechar()
+
+            inicio = time.perf_counter()
+            repositorio = RepositorioSQLite(caminho)
+            Conta.ledger = repositorio
+            _clientes, contas, _numero = repositorio.carregar()
+            carga = time.perf_counter() - inicio
+            assert len(contas) == args.contas and contas[0].saldo == 10.0 * args.depositos
+            Conta.ledger = None
+            repositorio.fechar()
+        print(f"{f'sqlite (lote {lote})':<18}{escrita:>14.0f}{leitura:>20.0f}{carga:>12.3f}")
+
+if __name__ == "__main__":
+    main()
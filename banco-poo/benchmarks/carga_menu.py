@@ -0,0 +1,307 @@
+"""
+Teste de carga longa (soak) dos menus interativos: gera uma carga sintética determinística
+(N clientes, M contas e uma mistura configurável das opções d/s/e/nc/lc/nu) e a responde,
+pergunta a pergunta, pelo main() real de banco_poo_datetime e de sistema_bancario_simples,
+com a entrada injetada em main(entrada=...).
+
+A fase de carga é dividida em janelas com vazão, latência p50/p99 e RSS de cada uma: uma
+vazão que cai de janela em janela (ou um RSS que só cresce) denuncia custos que crescem com
+o histórico. No fim, mostra a latência por opção do menu.
+
+Por padrão, a regra de transações por dia (Conta.LIMITES) é desativada para que o histórico
+das contas cresça durante o teste; --manter-limites a mantém.
+
+Uso: python benchmarks/carga_menu.py [--sistema poo simples] [--clientes N] [--contas M]
+                                     [--operacoes N] [--mistura d=40,s=25,e=20,nc=5,lc=5,nu=5]
+                                     [--armazenamento memoria|dados|sqlite]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent / "sistema-bancario-simples"))  # E o sistema procedural
+
+import banco_poo_datetime
+import sistema_bancario_simples
+from banco_poo_datetime import Conta
+
+MISTURA_PADRAO = "d=40,s=25,e=20,nc=5,lc=5,nu=5"
+OPCOES = {  # Opção do menu de cada sistema para cada operação da carga
+    "poo": {"nu": "nu", "nc": "nc", "d": "d", "s": "s", "e": "e", "lc": "lc", "q": "q"},
+    "simples": {"nu": "1", "nc": "2", "d": "3", "s": "4", "e": "5", "lc": "6", "q": "7"},
+}
+RESPOSTAS = (  # (trecho da pergunta em minúsculas, campo da operação); a primeira correspondência vale
+    ("conta (", "conta"),
+    ("cpf", "cpf"),
+    ("nome", "nome"),
+    ("nascimento", "data_nascimento"),
+    ("endere", "endereco"),
+    ("valor", "valor"),
+    ("período", "periodo"),
+    ("próxima página", "pagina"),
+)
+
+def rss_atual_kb():
+    """
+    Retorna o RSS atual do processo em KB (lido de /proc no Linux, pico do processo nos demais sistemas).
+
+    :return: RSS em KB.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for linha in status:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def percentil(ordenados, fracao):
+    """
+    Retorna o percentil de uma lista ordenada (método do vizinho mais próximo).
+
+    :param ordenados: Valores em ordem crescente.
+    :param fracao: Percentil entre 0 e 1.
+    :return: Valor do percentil.
+    """
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+def interpretar_mistura(texto):
+    """
+    Interpreta a mistura de operações no formato "d=40,s=25,...".
+
+    :param texto: Mistura informada na linha de comando.
+    :return: Tupla (operações, pesos).
+    :raises ValueError: Se alguma operação não existir no menu.
+    """
+    pesos = {}
+    for parte in texto.split(","):
+        operacao, _, peso = parte.partition("=")
+        if operacao.strip() not in OPCOES["poo"] or operacao.strip() == "q":
+            raise ValueError(f"Operação desconhecida na mistura: {operacao!r}")
+        pesos[operacao.strip()] = float(peso)
+    return tuple(pesos), tuple(pesos.values())
+
+def gerar_carga(clientes, contas, operacoes, mistura, semente):
+    """
+    Gera a carga sintética: primeiro os clientes e as contas, depois as operações sorteadas.
+    A mesma semente gera sempre a mesma sequência.
+
+    :param clientes: Quantidade de clientes iniciais.
+    :param contas: Quantidade de contas iniciais (distribuídas entre os clientes).
+    :param operacoes: Quantidade de operações da fase de carga.
+    :param mistura: Tupla (operações, pesos) de interpretar_mistura.
+    :param semente: Semente do gerador aleatório.
+    :yield: Tupla (fase, operação), com fase "preparo" ou "carga" e a operação em dicionário.
+    """
+    gerador = random.Random(semente)
+    cpfs = []
+    contas_por_cpf = {}  # CPF -> números das contas, na ordem de criação (como o main() os atribui)
+    proximo_numero = 1001
+
+    def novo_cliente():
+        cpf = f"{len(cpfs):011d}"
+        cpfs.append(cpf)
+        contas_por_cpf[cpf] = []
+        return {"op": "nu", "cpf": cpf, "nome": f"Cliente {cpf}", "data_nascimento": "01-01-1990", "endereco": "Rua A, 1"}
+
+    def nova_conta(cpf):
+        nonlocal proximo_numero
+        contas_por_cpf[cpf].append(proximo_numero)
+        proximo_numero += 1
+        return {"op": "nc", "cpf": cpf}
+
+    for _ in range(clientes):
+        yield "preparo", novo_cliente()
+    for indice in range(contas):
+        yield "preparo", nova_conta(cpfs[indice % len(cpfs)])
+
+    tipos, pesos = mistura
+    for tipo in gerador.choices(tipos, pesos, k=operacoes):
+        if tipo == "nu":
+            yield "carga", novo_cliente()
+            continue
+        cpf = gerador.choice(cpfs)
+        if tipo == "nc":
+            yield "carga", nova_conta(cpf)
+        elif tipo == "lc":
+            yield "carga", {"op": "lc"}
+        else:
+            numeros = contas_por_cpf[cpf]
+            operacao = {"op": tipo, "cpf": cpf, "conta": str(gerador.choice(numeros)) if numeros else ""}
+            if tipo == "d":
+                operacao["valor"] = str(gerador.randint(10, 500))
+            elif tipo == "s":
+                operacao["valor"] = str(gerador.randint(10, 300))
+            yield "carga", operacao
+
+class EntradaRoteirizada:
+    """
+    Fonte de entrada para main(entrada=...): responde cada pergunta a partir da operação em curso
+    e mede a latência de cada operação (de uma exibição do menu até a seguinte).
+    """
+    def __init__(self, carga, opcoes, janelas, total_carga):
+        """
+        Prepara a fonte de entrada.
+
+        :param carga: Iterável de (fase, operação) de gerar_carga.
+        :param opcoes: Opções do menu do sistema (ver OPCOES).
+        :param janelas: Quantidade de janelas da fase de carga.
+        :param total_carga: Quantidade de operações da fase de carga.
+        """
+        self._carga = iter(carga)
+        self._opcoes = opcoes
+        self._operacao = None
+        self._fase = None
+        self._inicio = None
+        self._tamanho_janela = max(1, total_carga // janelas)
+        self._janela = []  # Latências da janela em curso
+        self.janelas = []  # (operações, segundos, p50, p99, RSS em KB) de cada janela
+        self.por_opcao = {}  # Operação -> latências (segundos) na fase de carga
+        self.preparo = [0, 0.0]  # [operações, segundos] da fase de preparo
+        self._inicio_janela = None
+
+    def __call__(self, pergunta):
+        """
+        Responde uma pergunta do menu.
+
+        :param pergunta: Texto exibido por input().
+        :return: Resposta.
+        :raises ValueError: Se a pergunta não for reconhecida.
+        """
+        if "MENU" in pergunta:
+            agora = time.perf_counter()
+            if self._operacao is not None:
+                self._concluir(agora)
+            fase, self._operacao = next(self._carga, (None, None))
+            if self._operacao is None:
+                return self._opcoes["q"]
+            if fase == "carga" and self._fase != "carga":
+                self._inicio_janela = agora
+            self._fase, self._inicio = fase, agora
+            return self._opcoes[self._operacao["op"]]
+
+        texto = pergunta.lower()
+        for trecho, campo in RESPOSTAS:
+            if trecho in texto:
+                if campo == "periodo":
+                    return ""  # Extrato completo
+                if campo == "pagina":
+                    return "q"  # Só a primeira página
+                return self._operacao.get(campo, "")
+        raise ValueError(f"Pergunta inesperada: {pergunta!r}")
+
+    def _concluir(self, agora):
+        """
+        Registra a latência da operação em curso e fecha a janela, se completa.
+
+        :param agora: Instante (perf_counter) em que o menu voltou a ser exibido.
+        """
+        latencia = agora - self._inicio
+        if self._fase == "preparo":
+            self.preparo[0] += 1
+            self.preparo[1] += latencia
+            return
+        self.por_opcao.setdefault(self._operacao["op"], []).append(latencia)
+        self._janela.append(latencia)
+        if len(self._janela) >= self._tamanho_janela:
+            self.fechar_janela(agora)
+
+    def fechar_janela(self, agora=None):
+        """
+        Fecha a janela em curso, se tiver operações, guardando suas estatísticas.
+
+        :param agora: Instante de fechamento (padrão: agora).
+        """
+        if not self._janela:
+            return
+        agora = time.perf_counter() if agora is None else agora
+        latencias = sorted(self._janela)
+        self.janelas.append(
+            (len(latencias), agora - self._inicio_janela, percentil(latencias, 0.50), percentil(latencias, 0.99), rss_atual_kb())
+        )
+        self._janela = []
+        self._inicio_janela = agora
+
+def executar(sistema, args, mistura):
+    """
+    Executa a carga no main() do sistema, com as mensagens descartadas.
+
+    :param sistema: "poo" ou "simples".
+    :param args: Argumentos da linha de comando.
+    :param mistura: Tupla (operações, pesos).
+    :return: EntradaRoteirizada com as medições.
+    """
+    carga = gerar_carga(args.clientes, args.contas, args.operacoes, mistura, args.semente)
+    entrada = EntradaRoteirizada(carga, OPCOES[sistema], args.janelas, args.operacoes)
+    limites_originais = Conta.LIMITES
+    with tempfile.TemporaryDirectory() as diretorio, open(os.devnull, "w") as silencio, redirect_stdout(silencio):
+        if sistema == "simples":
+            sistema_bancario_simples.main(entrada=entrada)
+        else:
+            if not args.manter_limites:
+                Conta.LIMITES = ()  # Deixa o histórico crescer além de 2 transações por conta e dia
+            try:
+                banco_poo_datetime.main(
+                    diretorio_dados=diretorio if args.armazenamento == "dados" else None,
+                    arquivo_sqlite=os.path.join(diretorio, "banco.db") if args.armazenamento == "sqlite" else None,
+                    entrada=entrada,
+                )
+            finally:
+                Conta.LIMITES = limites_originais
+    entrada.fechar_janela()
+    return entrada
+
+def imprimir(sistema, entrada):
+    """
+    Imprime as tabelas de resultados de um sistema.
+
+    :param sistema: "poo" ou "simples".
+    :param entrada: EntradaRoteirizada com as medições.
+    """
+    operacoes, segundos = entrada.preparo
+    print(f"\n[{sistema}] preparo: {operacoes} operações em {segundos:.2f} s")
+    print(f"{'janela':>7}{'operações':>11}{'ops/s':>10}{'p50 (µs)':>11}{'p99 (µs)':>11}{'RSS (MB)':>10}")
+    for indice, (quantidade, duracao, p50, p99, rss) in enumerate(entrada.janelas, 1):
+        print(f"{indice:>7}{quantidade:>11}{quantidade / duracao:>10.0f}{p50 * 1e6:>11.0f}{p99 * 1e6:>11.0f}{rss / 1024:>10.1f}")
+    print(f"{'opção':>7}{'operações':>11}{'p50 (µs)':>11}{'p99 (µs)':>11}")
+    for opcao, latencias in sorted(entrada.por_opcao.items()):
+        latencias.sort()
+        print(f"{opcao:>7}{len(latencias):>11}{percentil(latencias, 0.50) * 1e6:>11.0f}{percentil(latencias, 0.99) * 1e6:>11.0f}")
+
+def main():
+    """
+    Executa a carga em cada sistema escolhido e imprime os resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sistema", nargs="+", choices=tuple(OPCOES), default=list(OPCOES))
+    parser.add_argument("--clientes", type=int, default=1_000)
+    parser.add_argument("--contas", type=int, default=1_500)
+    parser.add_argument("--operacoes", type=int, default=100_000, help="operações da fase de carga")
+    parser.add_argument("--mistura", default=MISTURA_PADRAO, help="pesos das operações (d, s, e, nc, lc, nu)")
+    parser.add_argument("--janelas", type=int, default=10)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument(
+        "--armazenamento", choices=("memoria", "dados", "sqlite"), default="memoria", help="estado do sistema poo",
+    )
+    parser.add_argument("--manter-limites", action="store_true", help="mantém a regra de transações por dia")
+    args = parser.parse_args()
+    if args.clientes < 1:
+        parser.error("--clientes deve ser pelo menos 1")
+    try:
+        mistura = interpretar_mistura(args.mistura)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    for sistema in args.sistema:
+        imprimir(sistema, executar(sistema, args, mistura))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Teste de carga do servidor asyncio (servidor.py): abre muitas conexões simultâneas, cada uma
+enviando pedidos em sequência (depósitos, saques, extratos e listagens), e mede a latência de
+cada pedido. Reporta vazão, p50 e p99.
+
+Sem --porta, inicia um servidor local em um subprocesso e o encerra ao final.
+
+Uso: python benchmarks/carga_servidor.py [--conexoes 100 1000 ...] [--pedidos N] [--porta P]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DIRETORIO_BANCO = Path(__file__).resolve().parent.parent
+
+async def enviar(leitor, escritor, pedido):
+    """
+    Envia um pedido e espera a resposta.
+
+    :param leitor: StreamReader da conexão.
+    :param escritor: StreamWriter da conexão.
+    :param pedido: Dicionário do pedido.
+    :return: Dicionário da resposta.
+    """
+    escritor.write(json.dumps(pedido).encode() + b"\n")
+    await escritor.drain()
+    return json.loads(await leitor.readline())
+
+async def preparar(host, porta, clientes):
+    """
+    Cadastra os clientes, uma conta para cada um e um depósito inicial.
+
+    :param host: Endereço do servidor.
+    :param porta: Porta do servidor.
+    :param clientes: Quantidade de clientes.
+    :return: Lista de CPFs cadastrados.
+    """
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    cpfs = [f"{indice:011d}" for indice in range(clientes)]
+    for cpf in cpfs:
+        await enviar(leitor, escritor, {"op": "criar_cliente", "cpf": cpf, "nome": f"Cliente {cpf}", "data_nascimento": "01-01-1990", "endereco": "Rua"})
+        await enviar(leitor, escritor, {"op": "criar_conta", "cpf": cpf})
+        await enviar(leitor, escritor, {"op": "depositar", "cpf": cpf, "valor": 1_000})
+    escritor.close()
+    return cpfs
+
+async def conexao(host, porta, cpfs, pedidos, latencias, gerador):
+    """
+    Abre uma conexão e envia os pedidos em sequência, guardando a latência de cada um.
+
+    :param host: Endereço do servidor.
+    :param porta: Porta do servidor.
+    :param cpfs: CPFs cadastrados.
+    :param pedidos: Quantidade de pedidos.
+    :param latencias: Lista onde as latências (segundos) são acrescentadas.
+    :param gerador: Gerador aleatório.
+    :return: Quantidade de respostas com ok verdadeiro.
+    """
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    sucessos = 0
+    for _ in range(pedidos):
+        cpf, sorteio = gerador.choice(cpfs), gerador.random()
+        if sorteio < 0.4:
+            pedido = {"op": "depositar", "cpf": cpf, "valor": 10}
+        elif sorteio < 0.7:
+            pedido = {"op": "sacar", "cpf": cpf, "valor": 10}
+        elif sorteio < 0.95:
+            pedido = {"op": "extrato", "cpf": cpf, "tamanho_pagina": 20}
+        else:
+            pedido = {"op": "listar_contas", "limite": 20}
+        inicio = time.perf_counter()
+        resposta = await enviar(leitor, escritor, pedido)
+        latencias.append(time.perf_counter() - inicio)
+        sucessos += resposta["ok"]
+    escritor.close()
+    return sucessos
+
+async def rodada(host, porta, cpfs, conexoes, pedidos, semente):
+    """
+    Executa uma rodada com conexões simultâneas.
+
+    :return: Tupla (pedidos por segundo, p50 em ms, p99 em ms, fração de sucessos).
+    """
+    latencias = []
+    gerador = random.Random(semente)
+    inicio = time.perf_counter()
+    sucessos = await asyncio.gather(*(
+        conexao(host, porta, cpfs, pedidos, latencias, random.Random(gerador.random())) for _ in range(conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return (
+        len(latencias) / duracao, percentil(latencias, 0.50) * 1e3, percentil(latencias, 0.99) * 1e3,
+        sum(sucessos) / len(latencias),
+    )
+
+def percentil(ordenados, fracao):
+    """
+    Retorna o percentil de uma lista ordenada (método do vizinho mais próximo).
+
+    :param ordenados: Valores em ordem crescente.
+    :param fracao: Percentil entre 0 e 1.
+    :return: Valor do percentil.
+    """
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+def iniciar_servidor(argumentos_servidor):
+    """
+    Inicia o servidor em um subprocesso numa porta livre e espera ele aceitar conexões.
+
+    :param argumentos_servidor: Argumentos extras de servidor.py.
+    :return: Tupla (processo, porta).
+    """
+    with socket.socket() as sonda:
+        sonda.bind(("127.0.0.1", 0))
+        porta = sonda.getsockname()[1]
+    processo = subprocess.Popen(
+        [sys.executable, str(DIRETORIO_BANCO / "servidor.py"), "--porta", str(porta), *argumentos_servidor],
+        stderr=subprocess.PIPE, text=True,
+    )
+    processo.stderr.readline()  # "Servidor ouvindo em ..."
+    return processo, porta
+
+def main():
+    """
+    Executa uma rodada para cada quantidade de conexões e imprime a tabela de resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, help="porta de um servidor já em execução")
+    parser.add_argument("--dados", help="diretório de dados do servidor iniciado pelo teste (ativa o diário)")
+    parser.add_argument("--clientes", type=int, default=200)
+    parser.add_argument("--conexoes", type=int, nargs="+", default=(10, 100, 1000, 2000))
+    parser.add_argument("--pedidos", type=int, default=20, help="pedidos por conexão")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    processo, porta = None, args.porta
+    if porta is None:
+        processo, porta = iniciar_servidor(["--dados", args.dados] if args.dados else [])
+    try:
+        cpfs = asyncio.run(preparar(args.host, porta, args.clientes))
+        print(f"{'conexões':>9}{'pedidos':>10}{'pedidos/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}{'ok':>8}")
+        for conexoes in args.conexoes:
+            vazao, p50, p99, sucessos = asyncio.run(rodada(args.host, porta, cpfs, conexoes, args.pedidos, args.semente))
+            print(f"{conexoes:>9}{conexoes * args.pedidos:>10}{vazao:>12.0f}{p50:>11.2f}{p99:>11.2f}{sucessos:>8.0%}")
+    finally:
+        if processo:
+            processo.terminate()
+            processo.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Suíte de microbenchmarks dos caminhos mais usados do sistema, em tamanhos parametrizáveis
+(clientes, contas e tamanho do histórico). Os resultados vão para um arquivo JSON, e o comando
+comparar aponta regressões entre duas execuções.
+
+Casos medidos:
+    filtrar_cliente               busca por CPF no registro de clientes        (tamanho: clientes)
+    realizar_transacao_deposito   Cliente.realizar_transacao com Deposito      (tamanho: histórico)
+    realizar_transacao_saque      Cliente.realizar_transacao com Saque         (tamanho: histórico)
+    conta_corrente_sacar          ContaCorrente.sacar                          (tamanho: histórico)
+    historico_adicionar           Historico.adicionar_transacao                (tamanho: histórico)
+    historico_transacoes_do_dia   Historico.transacoes_do_dia                  (tamanho: histórico)
+    historico_saldo_em            Historico.saldo_em em instantes aleatórios   (tamanho: histórico)
+    exibir_extrato                exibir_extrato completo, com todas as páginas (tamanho: histórico)
+    contas_iterador               ContasIterador sobre todas as contas         (tamanho: contas)
+    contas_pagina                 páginas de ContasIterador, no meio           (tamanho: contas)
+
+Uso:
+    python benchmarks/micro.py executar [--saida micro.json] [--clientes 1000 ...] [--historico 100 ...] [--contas 1000 ...]
+    python benchmarks/micro.py comparar base.json novo.json [--tolerancia 0.10]
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+import banco_poo_datetime
+from banco_poo_datetime import (
+    ContaCorrente, ContasIterador, Deposito, PessoaFisica, Saque, TAMANHO_PAGINA_CONTAS, filtrar_cliente,
+)
+from registro_clientes import ClienteRegistry
+
+INICIO = datetime(2024, 1, 1, 9)  # Data da primeira transação dos históricos gerados
+POR_DIA = 20  # Transações por dia nos históricos gerados
+
+def _nova_conta(historico, limite_saques=10**9):
+    """
+    Cria um cliente com uma conta cujo histórico tem o tamanho pedido, distribuído em dias.
+
+    :param historico: Quantidade de transações no histórico.
+    :param limite_saques: Limite de saques da conta.
+    :return: Tupla (cliente, conta).
+    """
+    cliente = PessoaFisica("Cliente", "01-01-1990", "00000000000", "Rua")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001, limite=10**9, limite_saques=limite_saques)
+    cliente.adicionar_conta(conta)
+    for indice in range(historico):
+        data = INICIO + timedelta(days=indice // POR_DIA, seconds=indice % POR_DIA)
+        conta.historico.adicionar_entrada("Deposito" if indice % 3 else "Saque", 10.0, data)
+    conta.restaurar_saldo(10.0**9)
+    return cliente, conta
+
+def _dias_livres(historico):
+    """
+    Gera datas em dias sem transações, depois do fim do histórico (não esbarram no limite diário).
+
+    :param historico: Tamanho do histórico gerado por _nova_conta.
+    :yield: datetime de cada dia livre.
+    """
+    for dia in itertools.count(historico // POR_DIA + 1):
+        yield INICIO + timedelta(days=dia)
+
+def caso_filtrar_cliente(clientes):
+    """
+    Buscas por CPF em um registro com a quantidade de clientes informada.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    registro = ClienteRegistry(PessoaFisica("Cliente", "01-01-1990", f"{indice:011d}", "Rua") for indice in range(clientes))
+    cpfs = [f"{random.randrange(clientes):011d}" for _ in range(100_000)]
+    def executar():
+        for cpf in cpfs:
+            filtrar_cliente(cpf, registro)
+        return len(cpfs)
+    return executar
+
+def caso_realizar_transacao_deposito(historico):
+    """
+    Depósitos pelo cliente, cada um em um dia livre, numa conta com o histórico informado.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    cliente, conta = _nova_conta(historico)
+    dias = _dias_livres(historico)
+    def executar():
+        for data in itertools.islice(dias, 2_000):
+            cliente.realizar_transacao(conta, Deposito(10.0, data))
+        return 2_000
+    return executar
+
+def caso_realizar_transacao_saque(historico):
+    """
+    Saques pelo cliente, cada um em um dia livre, numa conta com o histórico informado.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    cliente, conta = _nova_conta(historico)
+    dias = _dias_livres(historico)
+    def executar():
+        for data in itertools.islice(dias, 500):
+            cliente.realizar_transacao(conta, Saque(10.0, data))
+        return 500
+    return executar
+
+def caso_conta_corrente_sacar(historico):
+    """
+    Chamadas diretas de ContaCorrente.sacar numa conta com o histórico informado.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    _cliente, conta = _nova_conta(historico)
+    data = next(_dias_livres(historico))
+    def executar():
+        for _ in range(500):
+            conta.sacar(1.0, data)
+        return 500
+    return executar
+
+def caso_historico_adicionar(historico):
+    """
+    Inserções num histórico que já tem o tamanho informado.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    _cliente, conta = _nova_conta(historico)
+    transacao = Deposito(10.0)
+    datas = [INICIO + timedelta(days=historico // POR_DIA, seconds=indice) for indice in range(10_000)]
+    def executar():
+        for data in datas:
+            conta.historico.adicionar_transacao(transacao, data)
+        return len(datas)
+    return executar
+
+def caso_historico_transacoes_do_dia(historico):
+    """
+    Consultas de dias aleatórios num histórico com o tamanho informado.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    _cliente, conta = _nova_conta(historico)
+    dias = [(INICIO + timedelta(days=random.randrange(max(historico // POR_DIA, 1)))).date() for _ in range(10_000)]
+    def executar():
+        for dia in dias:
+            conta.historico.transacoes_do_dia(dia)
+        return len(dias)
+    return executar
+
+def caso_historico_saldo_em(historico):
+    """
+    Consultas de saldo em instantes aleatórios num histórico com o tamanho informado.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    _cliente, conta = _nova_conta(historico)
+    conta.historico.saldo_em(INICIO)  # Calcula os checkpoints fora da medição
+    instantes = [INICIO + timedelta(days=random.randrange(max(historico // POR_DIA, 1)), seconds=random.randrange(POR_DIA)) for _ in range(10_000)]
+    def executar():
+        for instante in instantes:
+            conta.historico.saldo_em(instante)
+        return len(instantes)
+    return executar
+
+def caso_exibir_extrato(historico):
+    """
+    Extrato completo (todas as páginas) de uma conta com o histórico informado; cada operação é um extrato.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    cliente, _conta = _nova_conta(historico)
+    clientes = ClienteRegistry([cliente])
+    def executar():
+        respostas = itertools.chain([cliente.cpf], itertools.repeat(""))  # CPF e [Enter] em cada página
+        leitura_anterior = banco_poo_datetime.ler_entrada
+        banco_poo_datetime.ler_entrada = lambda _mensagem="": next(respostas)
+        try:
+            banco_poo_datetime.exibir_extrato(clientes)
+        finally:
+            banco_poo_datetime.ler_entrada = leitura_anterior
+        return 1
+    return executar
+
+def caso_contas_iterador(contas):
+    """
+    Iteração formatada sobre a quantidade de contas informada.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    cliente = PessoaFisica("Cliente", "01-01-1990", "00000000000", "Rua")
+    lista = [ContaCorrente.nova_conta(cliente=cliente, numero=numero) for numero in range(contas)]
+    def executar():
+        for _linha in ContasIterador(lista):
+            pass
+        return len(lista)
+    return executar
+
+def caso_contas_pagina(contas):
+    """
+    Escritas de uma página de contas a partir de um cursor no meio da lista; cada operação é uma página.
+
+    :return: Função que executa as operações e retorna quantas executou.
+    """
+    cliente = PessoaFisica("Cliente", "01-01-1990", "00000000000", "Rua")
+    lista = [ContaCorrente.nova_conta(cliente=cliente, numero=numero) for numero in range(contas)]
+    def executar():
+        for _ in range(1_000):  # Uma página sozinha dura poucos microssegundos, perto da resolução do relógio
+            ContasIterador(lista, cursor=contas // 2).escrever_pagina(io.StringIO(), TAMANHO_PAGINA_CONTAS)
+        return 1_000
+    return executar
+
+CASOS = {  # Caso -> (função de preparo, dimensão do tamanho)
+    "filtrar_cliente": (caso_filtrar_cliente, "clientes"),
+    "realizar_transacao_deposito": (caso_realizar_transacao_deposito, "historico"),
+    "realizar_transacao_saque": (caso_realizar_transacao_saque, "historico"),
+    "conta_corrente_sacar": (caso_conta_corrente_sacar, "historico"),
+    "historico_adicionar": (caso_historico_adicionar, "historico"),
+    "historico_transacoes_do_dia": (caso_historico_transacoes_do_dia, "historico"),
+    "historico_saldo_em": (caso_historico_saldo_em, "historico"),
+    "exibir_extrato": (caso_exibir_extrato, "historico"),
+    "contas_iterador": (caso_contas_iterador, "contas"),
+    "contas_pagina": (caso_contas_pagina, "contas"),
+}
+
+def medir(preparar, tamanho, repeticoes):
+    """
+    Mede um caso: prepara o estado uma vez para cada repetição e cronometra a execução.
+
+    :param preparar: Função de preparo do caso.
+    :param tamanho: Tamanho do caso.
+    :param repeticoes: Quantidade de repetições.
+    :return: Dicionário com o menor e o mediano tempo por operação, em nanossegundos.
+    """
+    tempos = []
+    with open(os.devnull, "w") as silencio, redirect_stdout(silencio):  # Descarta mensagens e extratos
+        for _ in range(repeticoes):
+            executar = preparar(tamanho)
+            inicio = time.perf_counter_ns()
+            operacoes = executar()
+            tempos.append((time.perf_counter_ns() - inicio) / operacoes)
+    return {"ns_por_op_min": min(tempos), "ns_por_op_mediana": statistics.median(tempos)}
+
+def executar_suite(args):
+    """
+    Executa os casos selecionados em cada tamanho e grava o arquivo de resultados.
+    """
+    random.seed(args.semente)
+    tamanhos = {"clientes": args.clientes, "historico": args.historico, "contas": args.contas}
+    resultados = []
+    print(f"{'caso':<30}{'dimensão':>10}{'tamanho':>10}{'ns/op (min)':>14}{'ns/op (med)':>14}")
+    for nome in args.casos or CASOS:
+        preparar, dimensao = CASOS[nome]
+        for tamanho in tamanhos[dimensao]:
+            medida = medir(preparar, tamanho, args.repeticoes)
+            resultados.append({"caso": nome, "dimensao": dimensao, "tamanho": tamanho, **medida})
+            print(f"{nome:<30}{dimensao:>10}{tamanho:>10}{medida['ns_por_op_min']:>14.0f}{medida['ns_por_op_mediana']:>14.0f}")
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "resultados": resultados,
+    }
+    Path(args.saida).write_text(json.dumps(relatorio, indent=2), encoding="utf-8")
+    print(f"\nResultados gravados em {args.saida}")
+
+def comparar(args):
+    """
+    Compara duas execuções caso a caso pelo menor tempo por operação.
+
+    :return: 1 se houver regressão acima da tolerância, 0 caso contrário.
+    """
+    def carregar(caminho):
+        dados = json.loads(Path(caminho).read_text(encoding="utf-8"))
+        return {(item["caso"], item["tamanho"]): item["ns_por_op_min"] for item in dados["resultados"]}
+
+    base, novo = carregar(args.base), carregar(args.novo)
+    regressoes = 0
+    print(f"{'caso':<30}{'tamanho':>10}{'base (ns)':>12}{'novo (ns)':>12}{'variação':>10}  situação")
+    for chave in sorted(base.keys() & novo.keys()):
+        variacao = novo[chave] / base[chave] - 1
+        if variacao > args.tolerancia:
+            situacao, regressoes = "REGRESSÃO", regressoes + 1
+        elif variacao < -args.tolerancia:
+            situacao = "melhora"
+        else:
+            situacao = "ok"
+        print(f"{chave[0]:<30}{chave[1]:>10}{base[chave]:>12.0f}{novo[chave]:>12.0f}{variacao:>+10.1%}  {situacao}")
+    for chave in sorted(base.keys() ^ novo.keys()):
+        print(f"{chave[0]:<30}{chave[1]:>10}  presente em apenas uma das execuções")
+    print(f"\n{regressoes} regressão(ões) acima de {args.tolerancia:.0%}")
+    return 1 if regressoes else 0
+
+def main():
+    """
+    Interpreta a linha de comando e executa a suíte ou a comparação.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    suite = comandos.add_parser("executar", help="executa a suíte e grava os resultados")
+    suite.add_argument("--saida", default="micro.json", help="arquivo JSON de resultados")
+    suite.add_argument("--clientes", type=int, nargs="+", default=(1_000, 100_000))
+    suite.add_argument("--historico", type=int, nargs="+", default=(100, 10_000))
+    suite.add_argument("--contas", type=int, nargs="+", default=(1_000, 100_000))
+    suite.add_argument("--casos", nargs="+", choices=CASOS, help="executa só os casos indicados")
+    suite.add_argument("--repeticoes", type=int, default=5)
+    suite.add_argument("--semente", type=int, default=42)
+
+    comparacao = comandos.add_parser("comparar", help="compara dois arquivos de resultados")
+    comparacao.add_argument("base")
+    comparacao.add_argument("novo")
+    comparacao.add_argument("--tolerancia", type=float, default=0.10, help="aumento relativo tolerado (0.10 = 10%%)")
+
+    args = parser.parse_args()
+    if args.comando == "executar":
+        executar_suite(args)
+    else:
+        sys.exit(comparar(args))
+
+if __name__ == "__main__":
+    main()
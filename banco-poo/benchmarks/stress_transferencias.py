@@ -0,0 +1,94 @@
+"""
+Teste de estresse multithread das contas: threads fazem transferências aleatórias (em ambas as
+direções, o que provocaria deadlock sem a ordem de travamento), depósitos e saques.
+Ao final verifica a conservação do dinheiro e a coerência entre saldo e histórico de cada conta,
+e mede a vazão para cada quantidade de threads.
+
+Uso: python benchmarks/stress_transferencias.py [--contas N] [--operacoes N] [--threads 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import (
+    TRANSFERENCIA_ENVIADA, ContaCorrente, Deposito, PessoaFisica, Saque, Transferencia,
+)
+
+SINAIS = {"Deposito": 1, "Saque": -1, TRANSFERENCIA_ENVIADA: -1}  # Demais tipos (recebidas) somam
+
+def executar(quantidade_contas, threads, operacoes, semente):
+    """
+    Executa a carga e verifica os invariantes.
+
+    :param quantidade_contas: Número de contas.
+    :param threads: Número de threads.
+    :param operacoes: Operações por thread.
+    :param semente: Semente do gerador aleatório.
+    :return: Operações por segundo.
+    :raises AssertionError: Quando algum invariante é violado.
+    """
+    cliente = PessoaFisica("Cliente", "01-01-1990", "00000000000", "Rua")
+    contas = [ContaCorrente.nova_conta(cliente=cliente, numero=numero, limite_saques=10**9) for numero in range(quantidade_contas)]
+    for conta in contas:
+        Deposito(1_000).registrar(conta)
+    movimentos = [0] * threads  # Depósitos menos saques de cada thread
+
+    def trabalhar(indice):
+        gerador = random.Random(semente + indice)
+        for _ in range(operacoes):
+            origem, destino = gerador.sample(contas, 2)
+            sorteio = gerador.random()
+            if sorteio < 0.8:
+                Transferencia(gerador.randint(1, 50), destino).registrar(origem)
+            elif sorteio < 0.9:
+                valor = gerador.randint(1, 50)
+                if Deposito(valor).registrar(origem):
+                    movimentos[indice] += valor
+            else:
+                valor = gerador.randint(1, 50)
+                if Saque(valor).registrar(origem):
+                    movimentos[indice] -= valor
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(indice,)) for indice in range(threads)]
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    duracao = time.perf_counter() - inicio
+
+    total_esperado = 1_000 * quantidade_contas + sum(movimentos)
+    assert sum(conta.saldo for conta in contas) == total_esperado, "dinheiro criado ou destruído"
+    for conta in contas:
+        assert conta.saldo >= 0, f"saldo negativo na conta {conta.numero}"
+        saldo_historico = sum(SINAIS.get(tipo, 1) * valor for tipo, valor, _instante in conta.historico.entradas())
+        assert saldo_historico == conta.saldo, f"histórico incoerente na conta {conta.numero}"
+    return threads * operacoes / duracao
+
+def main():
+    """
+    Executa o teste para cada quantidade de threads e imprime a vazão.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=50)
+    parser.add_argument("--operacoes", type=int, default=20_000, help="operações por thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=(1, 2, 4, 8, 16))
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'threads':>8}{'ops/s':>12}{'invariantes':>14}")
+    with open(os.devnull, "w") as silencio:
+        for threads in args.threads:
+            with redirect_stdout(silencio):  # Descarta as mensagens das operações
+                ops = executar(args.contas, threads, args.operacoes, args.semente)
+            print(f"{threads:>8}{ops:>12.0f}{'ok':>14}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Cadastro em lote de clientes e contas (migrações de outros sistemas e aberturas em massa).
+Os registros são validados, gravados no diário e aplicados em blocos: cada bloco custa uma
+única espera de durabilidade no diário e reserva de uma vez uma faixa contígua de números
+de conta, em vez de um número por conta como no menu interativo.
+
+Registros de cliente: dicionários com cpf, nome, data_nascimento e endereco.
+Pedidos de conta: dicionários com cpf e, opcionalmente, agencia, limite e limite_saques.
+
+Uso:
+    relatorio = cadastrar_em_lote(registros_clientes, pedidos_contas, clientes, contas, numero_conta)
+    numero_conta = relatorio["proximo_numero"]
+
+Os registros podem vir de arquivos CSV ou JSONL com ingestao_lote.ler_registros.
+"""
+import math
+import threading
+import time
+from itertools import islice
+
+from banco_poo_datetime import AGENCIA_PADRAO, Conta, ContaCorrente, PessoaFisica, registrar_auditoria
+from registro_clientes import normalizar_cpf
+
+CAMPOS_CLIENTE = ("cpf", "nome", "data_nascimento", "endereco")
+TAMANHO_BLOCO = 1024  # Registros validados, gravados no diário e aplicados de uma vez
+
+class CadastroInvalido(Exception):
+    """
+    Erro de um registro que não pode ser cadastrado; a mensagem é o motivo da rejeição.
+    """
+
+class AlocadorNumeros:
+    """
+    Distribui números de conta em faixas contíguas.
+    Cada reserva adquire a trava uma única vez, qualquer que seja o tamanho da faixa.
+    """
+    def __init__(self, proximo=1001, passo=1):
+        """
+        Inicializa o alocador.
+
+        :param proximo: Próximo número de conta livre.
+        :param passo: Distância entre números consecutivos (ver servico.ServicoBanco, com shards).
+        """
+        self._proximo = proximo
+        self._passo = passo
+        self._trava = threading.Lock()
+
+    @property
+    def proximo(self):
+        """
+        Retorna o próximo número de conta livre.
+
+        :return: Número da conta.
+        """
+        return self._proximo
+
+    def reservar(self, quantidade):
+        """
+        Reserva uma faixa de números de conta.
+
+        :param quantidade: Quantidade de números.
+        :return: range com os números reservados.
+        """
+        with self._trava:
+            inicio = self._proximo
+            self._proximo += quantidade * self._passo
+        return range(inicio, inicio + quantidade * self._passo, self._passo)
+
+def interpretar_cliente(registro):
+    """
+    Valida um registro de cliente.
+
+    :param registro: Dicionário com cpf, nome, data_nascimento e endereco.
+    :return: Tupla (CPF normalizado, nome, data de nascimento, endereço).
+    :raises CadastroInvalido: Quando algum campo está ausente ou vazio.
+    """
+    if not isinstance(registro, dict):
+        raise CadastroInvalido("registro mal formado")
+    for campo in CAMPOS_CLIENTE:
+        if not str(registro.get(campo) or "").strip():
+            raise CadastroInvalido(f"campo ausente: {campo}")
+    cpf = normalizar_cpf(str(registro["cpf"]))
+    if not cpf:
+        raise CadastroInvalido(f"CPF inválido: {registro['cpf']}")
+    return cpf, str(registro["nome"]).strip(), str(registro["data_nascimento"]).strip(), str(registro["endereco"]).strip()
+
+def interpretar_pedido_conta(pedido):
+    """
+    Valida um pedido de abertura de conta.
+
+    :param pedido: Dicionário com cpf e, opcionalmente, agencia, limite e limite_saques.
+    :return: Tupla (cpf, agência, limite, limite de saques).
+    :raises CadastroInvalido: Quando algum campo está ausente ou inválido.
+    """
+    if not isinstance(pedido, dict):
+        raise CadastroInvalido("registro mal formado")
+    if not str(pedido.get("cpf") or "").strip():
+        raise CadastroInvalido("campo ausente: cpf")
+    limite, limite_saques = pedido.get("limite"), pedido.get("limite_saques")
+    try:
+        limite = 500.0 if limite in (None, "") else float(limite)  # Um 0 explícito é um limite zerado, não o padrão
+        limite_saques = 3 if limite_saques in (None, "") else int(limite_saques)  # "" é a coluna vazia de um CSV
+    except (TypeError, ValueError):
+        raise CadastroInvalido("limite inválido") from None
+    if not math.isfinite(limite) or limite < 0 or limite_saques < 0:
+        raise CadastroInvalido("limite inválido")
+    return str(pedido["cpf"]), str(pedido.get("agencia") or AGENCIA_PADRAO), limite, limite_saques
+
+def cadastrar_clientes(registros, clientes, rejeitados, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Cadastra clientes, recusando CPFs já cadastrados ou repetidos no próprio lote.
+
+    :param registros: Iterável de registros de cliente.
+    :param clientes: Registro de clientes do sistema.
+    :param rejeitados: Lista onde acrescentar os registros rejeitados.
+    :param tamanho_bloco: Registros aplicados de uma vez.
+    :return: Quantidade de clientes cadastrados.
+    """
+    vistos = set()  # CPFs normalizados aceitos neste lote
+    numerados = enumerate(registros, start=1)
+    cadastrados = 0
+    while bloco := list(islice(numerados, tamanho_bloco)):
+        novos = []
+        for posicao, registro in bloco:
+            try:
+                cpf, nome, data_nascimento, endereco = interpretar_cliente(registro)
+                if cpf in vistos:
+                    raise CadastroInvalido("CPF repetido no lote")
+                if cpf in clientes:
+                    raise CadastroInvalido("CPF já cadastrado")
+            except CadastroInvalido as erro:
+                rejeitados.append({"tipo": "cliente", "posicao": posicao, "motivo": str(erro), "registro": registro})
+                continue
+            vistos.add(cpf)
+            novos.append(PessoaFisica(nome, data_nascimento, cpf, endereco))
+
+        if Conta.diario is not None:
+            Conta.diario.registrar_lote(
+                ("Cliente", {"cpf": cliente.cpf, "nome": cliente.nome, "data_nascimento": cliente.data_nascimento, "endereco": cliente.endereco})
+                for cliente in novos
+            )  # Uma espera de durabilidade por bloco
+        for cliente in novos:
+            clientes.adicionar(cliente)
+        cadastrados += len(novos)
+    return cadastrados
+
+def abrir_contas(pedidos, clientes, contas, alocador, rejeitados, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Abre contas correntes para clientes já cadastrados.
+
+    :param pedidos: Iterável de pedidos de conta.
+    :param clientes: Registro de clientes do sistema.
+    :param contas: Lista de contas do sistema.
+    :param alocador: AlocadorNumeros de onde saem os números das contas.
+    :param rejeitados: Lista onde acrescentar os pedidos rejeitados.
+    :param tamanho_bloco: Pedidos aplicados de uma vez.
+    :return: Quantidade de contas abertas.
+    """
+    numerados = enumerate(pedidos, start=1)
+    abertas = 0
+    while bloco := list(islice(numerados, tamanho_bloco)):
+        validos = []
+        for posicao, pedido in bloco:
+            try:
+                cpf, agencia, limite, limite_saques = interpretar_pedido_conta(pedido)
+                cliente = clientes.buscar(cpf)
+                if not cliente:
+                    raise CadastroInvalido("cliente não encontrado")
+            except CadastroInvalido as erro:
+                rejeitados.append({"tipo": "conta", "posicao": posicao, "motivo": str(erro), "registro": pedido})
+                continue
+            validos.append((cliente, agencia, limite, limite_saques))
+
+        novas = [
+            ContaCorrente(numero, cliente, limite=limite, limite_saques=limite_saques, agencia=agencia)
+            for numero, (cliente, agencia, limite, limite_saques) in zip(alocador.reservar(len(validos)), validos)
+        ]  # Uma faixa contígua de números por bloco
+        if Conta.diario is not None:
+            Conta.diario.registrar_lote(
+                ("Conta", {"agencia": conta.agencia, "numero": conta.numero, "cpf": conta.cliente.cpf, "limite": conta.limite,
+                           "limite_saques": conta._limite_saques})
+                for conta in novas
+            )
+        for conta in novas:
+            conta.cliente.adicionar_conta(conta)
+        contas.extend(novas)
+        abertas += len(novas)
+    return abertas
+
+def cadastrar_em_lote(registros_clientes, pedidos_contas, clientes, contas, numero_conta=1001, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Cadastra os clientes e, em seguida, abre as contas pedidas, percorrendo cada iterável uma única vez.
+
+    :param registros_clientes: Iterável de registros de cliente.
+    :param pedidos_contas: Iterável de pedidos de conta (podem referir clientes do mesmo lote).
+    :param clientes: Registro de clientes do sistema.
+    :param contas: Lista de contas do sistema.
+    :param numero_conta: Próximo número de conta livre.
+    :param tamanho_bloco: Registros aplicados de uma vez.
+    :return: Dicionário com clientes, contas, rejeitados (lista com tipo, posição, motivo e registro),
+             segundos, vazao (registros por segundo) e proximo_numero.
+    """
+    rejeitados = []
+    alocador = AlocadorNumeros(numero_conta)
+    inicio = time.perf_counter()
+    cadastrados = cadastrar_clientes(registros_clientes, clientes, rejeitados, tamanho_bloco)
+    abertas = abrir_contas(pedidos_contas, clientes, contas, alocador, rejeitados, tamanho_bloco)
+    segundos = time.perf_counter() - inicio
+    processados = cadastrados + abertas + len(rejeitados)
+    registrar_auditoria("CadastroLote", True, clientes=cadastrados, contas=abertas, rejeitados=len(rejeitados))
+    return {
+        "clientes": cadastrados,
+        "contas": abertas,
+        "rejeitados": rejeitados,
+        "segundos": segundos,
+        "vazao": processados / segundos if segundos else 0.0,
+        "proximo_numero": alocador.proximo,
+    }
@@ -0,0 +1,281 @@
+"""
+Conciliação de fim de dia: prova, conta a conta, que o saldo é o saldo inicial do histórico mais
+os créditos menos os débitos, que o saldo nunca ficou negativo e que nenhuma transação excedeu os
+limites da conta (valor por saque e as regras de limites.py, reaplicadas sobre o histórico).
+
+As contas são divididas em partições de contas consecutivas, conciliadas em paralelo por um pool
+de processos que percorrem o histórico de cada conta sem montá-lo na memória. Cada partição
+concluída grava um checkpoint (JSON) no diretório do trabalho; ao rodar de novo no mesmo
+diretório, só as partições sem checkpoint válido (as que falharam ou não chegaram a rodar) são
+refeitas. O relatório (relatorio.json) junta as divergências de todos os checkpoints.
+
+Os processos herdam as contas já carregadas pelo processo principal (fork), sem recarregá-las nem
+copiá-las por pipe; onde não há fork, as partições rodam no próprio processo.
+
+Uso:
+    python conciliacao.py --dados dados/ --trabalho conciliacao-2024-01-31/ [--processos 4]
+    python conciliacao.py --sqlite banco.db --trabalho conciliacao-2024-01-31/
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from banco_poo_datetime import TRANSFERENCIA_ENVIADA, Conta, Historico
+from limites import MotorLimites
+
+TAMANHO_PARTICAO = 10_000  # Contas por partição (e por checkpoint)
+TIPOS_VERIFICADOS = {"Deposito": "Deposito", "Saque": "Saque", TRANSFERENCIA_ENVIADA: "Transferencia"}  # Tipo no histórico -> tipo verificado em realizar_transacao
+
+_CONTAS = []  # Contas do trabalho em curso, herdadas pelos processos do pool
+
+def conciliar_conta(conta):
+    """
+    Concilia uma conta percorrendo o seu histórico uma única vez.
+
+    :param conta: Conta a conciliar.
+    :return: Tupla (divergências, transações percorridas); cada divergência é um dicionário com
+             agencia, numero, motivo e os dados da transação ou dos saldos.
+    """
+    divergencias = []
+    if conta.historico.saldo_inicial_derivado:  # Ex.: snapshot BPSNAP01; o saldo final conferiria por construção
+        divergencias.append({"agencia": conta.agencia, "numero": conta.numero, "motivo": "saldo_inicial_derivado"})
+    motor = MotorLimites(conta.politica_limites())  # Contadores novos, alimentados na ordem do histórico
+    limite_valor = getattr(conta, "limite", None)  # Valor máximo por saque (conta corrente)
+    saldo = round(conta.historico.saldo_inicial * 100)  # Gravado pelo snapshot; nunca deduzido de conta.saldo
+    transacoes = 0
+    for posicao, (tipo, valor, instante) in enumerate(conta.historico.entradas()):
+        transacoes += 1
+        data = datetime.fromtimestamp(instante)
+        motivos = []
+        verificado = TIPOS_VERIFICADOS.get(tipo)
+        if verificado is not None:
+            limite = motor.verificar(verificado, valor, data)
+            if limite is not None:
+                motivos.append(limite.motivo)
+        if tipo == "Saque" and limite_valor is not None and valor > limite_valor:
+            motivos.append("limite_valor")
+        motor.registrar(tipo, valor, data)
+        saldo += Historico.SINAIS.get(tipo, 0) * round(valor * 100)
+        if saldo < 0:
+            motivos.append("saldo_negativo")
+        for motivo in motivos:
+            divergencias.append({
+                "agencia": conta.agencia, "numero": conta.numero, "motivo": motivo, "posicao": posicao, "tipo": tipo,
+                "valor": valor, "data": data.isoformat(),
+            })
+    if saldo != round(conta.saldo * 100):
+        divergencias.append({
+            "agencia": conta.agencia, "numero": conta.numero, "motivo": "saldo", "esperado": saldo / 100, "registrado": conta.saldo,
+        })
+    return divergencias, transacoes
+
+def particionar(contas, tamanho_particao=TAMANHO_PARTICAO):
+    """
+    Divide as contas em partições de contas consecutivas.
+
+    :param contas: Lista de contas.
+    :param tamanho_particao: Contas por partição.
+    :return: Lista de dicionários com particao, inicio e fim (posições em contas) e primeira e ultima (números).
+    """
+    return [
+        {
+            "particao": indice, "inicio": inicio, "fim": min(inicio + tamanho_particao, len(contas)),
+            "primeira": contas[inicio].numero, "ultima": contas[min(inicio + tamanho_particao, len(contas)) - 1].numero,
+        }
+        for indice, inicio in enumerate(range(0, len(contas), tamanho_particao))
+    ]
+
+def conciliar(contas, diretorio, processos=None, tamanho_particao=TAMANHO_PARTICAO):
+    """
+    Concilia as contas em paralelo, reaproveitando os checkpoints válidos do diretório do trabalho,
+    e grava o relatório.
+
+    :param contas: Lista de contas (as mesmas a cada nova execução do trabalho).
+    :param diretorio: Diretório do trabalho (checkpoints e relatório); criado se não existir.
+    :param processos: Processos do pool (padrão: número de núcleos; 1 concilia no próprio processo).
+    :param tamanho_particao: Contas por partição.
+    :return: Relatório com as quantidades, as partições que falharam e as divergências.
+    """
+    global _CONTAS
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    inicio = time.perf_counter()
+    particoes = particionar(contas, tamanho_particao)
+    resultados, pendentes, falhas = {}, [], []
+    for particao in particoes:
+        checkpoint = _ler_checkpoint(diretorio, particao)
+        if checkpoint is None:
+            pendentes.append(particao)
+        else:
+            resultados[particao["particao"]] = checkpoint
+
+    processos = processos or os.cpu_count() or 1
+    if "fork" not in multiprocessing.get_all_start_methods():
+        processos = 1  # Sem fork, os processos não herdariam as contas
+    if pendentes and processos > 1:
+        if Conta.ledger is not None and hasattr(Conta.ledger, "sincronizar"):
+            Conta.ledger.sincronizar()  # Os processos leem o histórico gravado, não o lote pendente
+        _CONTAS = contas
+        try:
+            with ProcessPoolExecutor(
+                min(processos, len(pendentes)), mp_context=multiprocessing.get_context("fork"), initializer=_iniciar_processo,
+            ) as pool:
+                futuros = {pool.submit(_conciliar_particao, particao, str(diretorio)): particao for particao in pendentes}
+                for futuro in as_completed(futuros):
+                    particao = futuros[futuro]
+                    try:
+                        resultados[particao["particao"]] = futuro.result()
+                    except Exception as erro:  # A partição fica sem checkpoint e é refeita na próxima execução
+                        falhas.append({"particao": particao["particao"], "erro": repr(erro)})
+        finally:
+            _CONTAS = []
+    else:
+        _CONTAS = contas
+        try:
+            for particao in pendentes:
+                try:
+                    resultados[particao["particao"]] = _conciliar_particao(particao, str(diretorio))
+                except Exception as erro:
+                    falhas.append({"particao": particao["particao"], "erro": repr(erro)})
+        finally:
+            _CONTAS = []
+
+    concluidos = [resultados[indice] for indice in sorted(resultados)]
+    relatorio = {
+        "particoes": len(particoes),
+        "refeitas": len(pendentes) - len(falhas),
+        "reaproveitadas": len(particoes) - len(pendentes),
+        "falhas": sorted(falhas, key=lambda falha: falha["particao"]),
+        "contas": sum(checkpoint["contas"] for checkpoint in concluidos),
+        "transacoes": sum(checkpoint["transacoes"] for checkpoint in concluidos),
+        "divergencias": [divergencia for checkpoint in concluidos for divergencia in checkpoint["divergencias"]],
+        "segundos": time.perf_counter() - inicio,
+    }
+    _gravar_json(diretorio / "relatorio.json", relatorio)
+    return relatorio
+
+def _iniciar_processo():
+    """
+    Prepara um processo do pool: o repositório SQLite herdado precisa de uma conexão própria.
+    """
+    if Conta.ledger is not None and hasattr(Conta.ledger, "reabrir"):
+        Conta.ledger.reabrir()
+
+def _conciliar_particao(particao, diretorio):
+    """
+    Concilia as contas de uma partição e grava o seu checkpoint.
+
+    :param particao: Partição (ver particionar).
+    :param diretorio: Diretório do trabalho.
+    :return: Checkpoint da partição.
+    """
+    inicio = time.perf_counter()
+    divergencias, transacoes = [], 0
+    for conta in _CONTAS[particao["inicio"]:particao["fim"]]:
+        divergencias_conta, transacoes_conta = conciliar_conta(conta)
+        divergencias.extend(divergencias_conta)
+        transacoes += transacoes_conta
+    checkpoint = dict(
+        particao, contas=particao["fim"] - particao["inicio"], transacoes=transacoes, divergencias=divergencias,
+        segundos=time.perf_counter() - inicio,
+    )
+    _gravar_json(_caminho_checkpoint(diretorio, particao), checkpoint)
+    return checkpoint
+
+def _ler_checkpoint(diretorio, particao):
+    """
+    Lê o checkpoint de uma partição, se existir e corresponder às mesmas contas.
+
+    :param diretorio: Diretório do trabalho.
+    :param particao: Partição (ver particionar).
+    :return: Checkpoint ou None se a partição precisa ser conciliada.
+    """
+    try:
+        with open(_caminho_checkpoint(diretorio, particao), encoding="utf-8") as arquivo:
+            checkpoint = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    if any(checkpoint.get(campo) != particao[campo] for campo in ("inicio", "fim", "primeira", "ultima")):
+        return None  # As contas mudaram desde a execução anterior
+    return checkpoint
+
+def _caminho_checkpoint(diretorio, particao):
+    """
+    Retorna o caminho do checkpoint de uma partição.
+
+    :param diretorio: Diretório do trabalho.
+    :param particao: Partição (ver particionar).
+    :return: Path do arquivo.
+    """
+    return Path(diretorio) / f"particao-{particao['particao']:06d}.json"
+
+def _gravar_json(caminho, dados):
+    """
+    Grava um arquivo JSON de forma atômica (arquivo temporário + rename), para que uma queda no
+    meio da gravação não deixe um checkpoint pela metade.
+
+    :param caminho: Caminho do arquivo.
+    :param dados: Dados a gravar.
+    """
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+def main():
+    """
+    Carrega o estado, concilia as contas e imprime o resumo. Sai com código 1 se houver
+    divergências ou partições com falha.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    armazenamento = parser.add_mutually_exclusive_group(required=True)
+    armazenamento.add_argument("--dados", help="diretório de snapshots e diário")
+    armazenamento.add_argument(
+        "--sqlite", help="banco SQLite com clientes, contas e histórico (sem saldo gravado: cada conta sai com saldo_inicial_derivado)",
+    )
+    parser.add_argument("--trabalho", required=True, help="diretório dos checkpoints e do relatório")
+    parser.add_argument("--processos", type=int, help="processos do pool (padrão: número de núcleos)")
+    parser.add_argument("--tamanho-particao", type=int, default=TAMANHO_PARTICAO)
+    args = parser.parse_args()
+
+    repositorio = None
+    if args.sqlite:
+        from repositorio_sqlite import RepositorioSQLite
+        repositorio = RepositorioSQLite(args.sqlite)
+        Conta.ledger = repositorio  # Antes de carregar: as contas leem o histórico do banco
+        _clientes, contas, _numero_conta = repositorio.carregar()
+    else:
+        from persistencia import Persistencia
+        persistencia = Persistencia(args.dados)
+        _clientes, contas, _numero_conta = persistencia.carregar()
+        persistencia.fechar()  # A conciliação só lê o estado
+    try:
+        relatorio = conciliar(contas, args.trabalho, args.processos, args.tamanho_particao)
+    finally:
+        if repositorio:
+            repositorio.fechar()
+            Conta.ledger = None
+
+    print(
+        f"\n=== Conciliação: {relatorio['contas']} contas, {relatorio['transacoes']} transações, "
+        f"{relatorio['refeitas']} partições conciliadas e {relatorio['reaproveitadas']} reaproveitadas "
+        f"em {relatorio['segundos']:.2f} s ==="
+    )
+    for falha in relatorio["falhas"]:
+        print(f"\n@@@ Partição {falha['particao']} falhou: {falha['erro']} @@@")
+    for divergencia in relatorio["divergencias"][:20]:
+        print(f"@@@ Divergência: {json.dumps(divergencia, ensure_ascii=False)} @@@")
+    if len(relatorio["divergencias"]) > 20:
+        print(f"@@@ ... e mais {len(relatorio['divergencias']) - 20} (ver relatorio.json) @@@")
+    return 1 if relatorio["falhas"] or relatorio["divergencias"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Diário (journal) de escrita antecipada, somente de acréscimo, para as mutações das contas.
+Cada mutação é gravada e sincronizada em disco antes de ser confirmada.
+
+Modos:
+    "sincrono": um fsync por registro.
+    "grupo": os registros são acumulados e sincronizados juntos (group commit) quando a
+             janela de tempo expira ou o lote atinge o tamanho máximo; quem registrou
+             espera até que o seu registro esteja em disco. Com janela 0, o lote é tudo o
+             que chegou enquanto o fsync anterior acontecia.
+
+Se uma gravação falhar (ex.: disco cheio), quem espera recebe um OSError com a causa, e as
+chamadas seguintes falham imediatamente: os registros pendentes não chegaram ao disco.
+
+Uso:
+    Conta.diario = Diario("banco.journal", modo="grupo", janela_ms=2)
+"""
+import json
+import os
+import threading
+
+class Diario:
+    """
+    Diário de mutações gravado como JSON, uma linha por registro, com número de sequência (lsn).
+    """
+    def __init__(self, caminho, modo="grupo", janela_ms=5.0, tamanho_lote=512, ultimo_lsn=0):
+        """
+        Abre (ou cria) o diário para acréscimo.
+
+        :param caminho: Caminho do arquivo do diário.
+        :param modo: "sincrono" ou "grupo".
+        :param janela_ms: Tempo máximo, em milissegundos, que um lote espera antes do fsync (modo grupo).
+        :param tamanho_lote: Quantidade de registros que dispara o fsync imediatamente (modo grupo).
+        :param ultimo_lsn: lsn a partir do qual numerar um diário novo (ex.: o lsn do último snapshot).
+        """
+        if modo not in ("sincrono", "grupo"):
+            raise ValueError(f"Modo de diário inválido: {modo}")
+        self.caminho = caminho
+        self.modo = modo
+        self._janela = janela_ms / 1000
+        self._tamanho_lote = tamanho_lote
+        self._ultimo_lsn = max(_recuperar(caminho), ultimo_lsn)  # Continua a numeração de um diário existente
+        self._arquivo = open(caminho, "ab")
+        self._trava = threading.Lock()
+        self._condicao = threading.Condition(self._trava)  # Sinaliza quem espera pela durabilidade
+        self._ha_pendentes = threading.Condition(self._trava)  # Acorda o gravador
+        self._pendentes = []  # Registros codificados ainda não gravados
+        self._lsn_duravel = self._ultimo_lsn  # Maior lsn já sincronizado em disco
+        self._fechado = False
+        self._falha = None  # Exceção da gravação que falhou; o diário deixa de aceitar registros
+        self._gravador = None
+        if modo == "grupo":
+            self._gravador = threading.Thread(target=self._gravar_em_grupo, name="diario-group-commit", daemon=True)
+            self._gravador.start()
+
+    @property
+    def ultimo_lsn(self):
+        """
+        Retorna o lsn do último registro aceito pelo diário.
+
+        :return: Último lsn.
+        """
+        return self._ultimo_lsn
+
+    def registrar(self, operacao, **dados):
+        """
+        Grava uma mutação e só retorna depois que ela estiver em disco.
+
+        :param operacao: Nome da operação (ex.: "Deposito").
+        :param dados: Campos da mutação (devem ser serializáveis em JSON).
+        :return: Número de sequência (lsn) do registro.
+        """
+        with self._condicao:
+            if self._fechado:
+                raise ValueError("O diário está fechado.")
+            self._verificar_falha()
+            self._ultimo_lsn += 1
+            lsn = self._ultimo_lsn
+            self._pendentes.append(_codificar(lsn, operacao, dados))
+            if self.modo == "sincrono":
+                self._descarregar()
+                return lsn
+            if len(self._pendentes) in (1, self._tamanho_lote):
+                self._ha_pendentes.notify()  # Primeiro registro do lote, ou lote cheio: acorda o gravador
+            while self._lsn_duravel < lsn:
+                self._verificar_falha()
+                self._condicao.wait()
+        return lsn
+
+    def registrar_lote(self, registros):
+        """
+        Grava várias mutações de uma vez e só retorna depois que todas estiverem em disco.
+        Custa uma espera de durabilidade por lote, em vez de uma por registro.
+
+        :param registros: Iterável de tuplas (operação, dicionário de campos).
+        :return: lsn do último registro do lote (ou o último lsn, se o lote for vazio).
+        """
+        with self._condicao:
+            if self._fechado:
+                raise ValueError("O diário está fechado.")
+            self._verificar_falha()
+            for operacao, dados in registros:
+                self._ultimo_lsn += 1
+                self._pendentes.append(_codificar(self._ultimo_lsn, operacao, dados))
+            lsn = self._ultimo_lsn
+            if self.modo == "sincrono":
+                self._descarregar()
+                return lsn
+            self._ha_pendentes.notify()  # O lote já é grande o bastante: não há por que esperar a janela
+            while self._lsn_duravel < lsn:
+                self._verificar_falha()
+                self._condicao.wait()
+        return lsn
+
+    def _descarregar(self):
+        """
+        Grava e sincroniza os registros pendentes. Deve ser chamado com a trava adquirida (modo síncrono).
+        """
+        try:
+            self._gravar(self._pendentes)
+        except Exception as erro:
+            self._falha = erro
+            raise
+        self._pendentes = []
+        self._lsn_duravel = self._ultimo_lsn
+
+    def _verificar_falha(self):
+        """
+        Recusa a operação se uma gravação anterior falhou. Deve ser chamado com a trava adquirida.
+
+        :raises OSError: Quando o diário não conseguiu gravar um lote.
+        """
+        if self._falha is not None:
+            raise OSError(f"O diário {self.caminho} falhou ao gravar: {self._falha}") from self._falha
+
+    def _gravar(self, lote):
+        """
+        Grava um lote de registros codificados e sincroniza o arquivo em disco.
+
+        :param lote: Lista de registros codificados.
+        """
+        if lote:
+            self._arquivo.write(b"".join(lote))
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+
+    def _gravar_em_grupo(self):
+        """
+        Laço do gravador: espera o primeiro registro, acumula outros durante a janela (ou até o
+        lote encher), sincroniza e acorda quem espera. O fsync acontece fora da trava, para que
+        novos registros se acumulem no próximo lote. Se a gravação falhar, guarda a exceção,
+        acorda quem espera (que a recebe) e termina.
+        """
+        while True:
+            with self._condicao:
+                while not self._pendentes and not self._fechado:
+                    self._ha_pendentes.wait()
+                if self._janela and len(self._pendentes) < self._tamanho_lote and not self._fechado:
+                    self._ha_pendentes.wait(self._janela)
+                if self._fechado and not self._pendentes:
+                    return
+                lote, self._pendentes = self._pendentes, []
+                lsn_lote = self._ultimo_lsn
+            try:
+                self._gravar(lote)
+            except Exception as erro:
+                with self._condicao:
+                    self._falha = erro
+                    self._condicao.notify_all()
+                return
+            with self._condicao:
+                self._lsn_duravel = lsn_lote
+                self._condicao.notify_all()
+
+    def fechar(self):
+        """
+        Sincroniza os registros pendentes e fecha o diário.
+        """
+        with self._condicao:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._ha_pendentes.notify()
+        if self._gravador:
+            self._gravador.join()  # O gravador descarrega o que restou antes de terminar
+        elif self._falha is None:
+            with self._condicao:
+                self._descarregar()
+        self._arquivo.close()
+
+    def __enter__(self):
+        """
+        Permite usar o diário com a instrução with.
+
+        :return: O próprio diário.
+        """
+        return self
+
+    def __exit__(self, *excecao):
+        """
+        Fecha o diário ao sair do bloco with.
+        """
+        self.fechar()
+
+def _codificar(lsn, operacao, dados):
+    """
+    Codifica um registro do diário como uma linha JSON.
+
+    :param lsn: Número de sequência do registro.
+    :param operacao: Nome da operação.
+    :param dados: Campos da mutação.
+    :return: Linha codificada em bytes.
+    """
+    return (json.dumps({"lsn": lsn, "op": operacao, **dados}, separators=(",", ":")) + "\n").encode()
+
+def ler_diario(caminho, apos_lsn=0):
+    """
+    Lê os registros de um diário em ordem, ignorando uma última linha incompleta (escrita interrompida).
+
+    :param caminho: Caminho do arquivo do diário.
+    :param apos_lsn: Só retorna registros com lsn maior que este.
+    :yield: Cada registro como dicionário.
+    """
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            if not linha.endswith(b"\n"):
+                break  # Registro parcial de uma queda durante a escrita
+            registro = json.loads(linha)
+            if registro["lsn"] > apos_lsn:
+                yield registro
+
+def _recuperar(caminho):
+    """
+    Descarta uma última linha incompleta do diário e retorna o último lsn válido.
+
+    :param caminho: Caminho do arquivo do diário.
+    :return: Último lsn gravado (0 se o diário não existir).
+    """
+    if not os.path.exists(caminho):
+        return 0
+    lsn = tamanho_valido = 0
+    with open(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            if not linha.endswith(b"\n"):
+                break
+            lsn = json.loads(linha)["lsn"]
+            tamanho_valido += len(linha)
+    if tamanho_valido != os.path.getsize(caminho):
+        os.truncate(caminho, tamanho_valido)  # Remove o registro parcial para não corromper os próximos
+    return lsn
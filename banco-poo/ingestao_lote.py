@@ -0,0 +1,166 @@
+"""
+Ingestão em lote de depósitos e saques a partir de arquivos CSV ou JSONL.
+Cada registro tem os campos cpf, conta, tipo, valor e timestamp (e, opcionalmente, agencia) e é aplicado por meio de
+Cliente.realizar_transacao, sem carregar o arquivo inteiro na memória.
+
+Uso:
+    resumo = ingerir("movimentos.csv", clientes, caminho_rejeitados="rejeitados.jsonl")
+"""
+import csv
+import json
+import math
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from banco_poo_datetime import AGENCIA_PADRAO, Deposito, Saque, coletar_mensagens, filtrar_cliente
+
+TIPOS = {"deposito": Deposito, "d": Deposito, "saque": Saque, "s": Saque}  # Tipo informado -> classe da transação
+
+class RegistroInvalido(Exception):
+    """
+    Erro de um registro que não pode ser aplicado; a mensagem é o motivo da rejeição.
+    """
+
+def ler_registros(caminho):
+    """
+    Lê os registros de um arquivo CSV (com cabeçalho) ou JSONL, um de cada vez.
+
+    :param caminho: Caminho do arquivo; a extensão .csv indica CSV, qualquer outra indica JSONL.
+    :yield: Tupla (número da linha, registro como dicionário ou texto da linha inválida).
+    """
+    caminho = Path(caminho)
+    with caminho.open(newline="", encoding="utf-8") as arquivo:
+        if caminho.suffix.lower() == ".csv":
+            for numero_linha, registro in enumerate(csv.DictReader(arquivo), start=2):
+                yield numero_linha, registro
+        else:
+            for numero_linha, linha in enumerate(arquivo, start=1):
+                if not linha.strip():
+                    continue  # Ignora linhas em branco
+                try:
+                    yield numero_linha, json.loads(linha)
+                except json.JSONDecodeError:
+                    yield numero_linha, linha.rstrip("\n")
+
+def interpretar(registro):
+    """
+    Converte um registro lido do arquivo em (cpf, agência, número da conta, transação).
+
+    :param registro: Dicionário com cpf, conta, tipo, valor, timestamp e, opcionalmente, agencia.
+    :return: Tupla (cpf, agência, número da conta, transação).
+    :raises RegistroInvalido: Quando algum campo está ausente ou inválido.
+    """
+    if not isinstance(registro, dict):
+        raise RegistroInvalido("linha mal formada")
+    try:
+        cpf, conta, tipo, valor = registro["cpf"], registro["conta"], registro["tipo"], registro["valor"]
+    except KeyError as erro:
+        raise RegistroInvalido(f"campo ausente: {erro.args[0]}") from None
+
+    classe = TIPOS.get(str(tipo).strip().lower())
+    if classe is None:
+        raise RegistroInvalido(f"tipo desconhecido: {tipo}")
+    try:
+        numero = int(conta)
+    except (TypeError, ValueError):
+        raise RegistroInvalido(f"conta inválida: {conta}") from None
+    try:
+        valor_numerico = float(valor)
+    except (TypeError, ValueError):
+        raise RegistroInvalido(f"valor inválido: {valor}") from None
+    if not math.isfinite(valor_numerico) or valor_numerico <= 0:
+        raise RegistroInvalido(f"valor inválido: {valor}")  # nan, inf e valores não positivos
+    agencia = str(registro.get("agencia") or AGENCIA_PADRAO)
+    return str(cpf), agencia, numero, classe(valor_numerico, interpretar_timestamp(registro.get("timestamp")))
+
+def interpretar_timestamp(timestamp):
+    """
+    Converte o timestamp do registro em datetime.
+
+    :param timestamp: Segundos desde a época, data ISO-8601 ou vazio (usa o momento do registro).
+    :return: datetime correspondente ou None.
+    :raises RegistroInvalido: Quando o timestamp não pode ser interpretado.
+    """
+    if timestamp in (None, ""):
+        return None
+    try:
+        if isinstance(timestamp, (int, float)) or str(timestamp).replace(".", "", 1).isdigit():
+            return datetime.fromtimestamp(float(timestamp))
+        return datetime.fromisoformat(str(timestamp))
+    except (ValueError, OverflowError, OSError):
+        raise RegistroInvalido(f"timestamp inválido: {timestamp}") from None
+
+def localizar_conta(clientes, cliente, agencia, numero):
+    """
+    Localiza uma conta do cliente pelo índice de contas do registro, em tempo constante.
+
+    :param clientes: Registro de clientes do sistema.
+    :param cliente: Cliente que deve ser o dono da conta.
+    :param agencia: Agência da conta.
+    :param numero: Número da conta.
+    :return: Conta correspondente ou None (inclusive se a conta for de outro cliente).
+    """
+    conta = clientes.buscar_conta(agencia, numero)
+    return conta if conta is not None and conta.cliente is cliente else None
+
+def aplicar(registros, clientes):
+    """
+    Aplica os registros às contas, produzindo o resultado de cada um.
+
+    :param registros: Iterável de tuplas (número da linha, registro).
+    :param clientes: Registro de clientes do sistema.
+    :yield: Tupla (número da linha, registro, motivo da rejeição ou None se aceito).
+    """
+    for numero_linha, registro in registros:
+        try:
+            cpf, agencia, numero_conta, transacao = interpretar(registro)
+            cliente = filtrar_cliente(cpf, clientes)
+            if not cliente:
+                raise RegistroInvalido("cliente não encontrado")
+            conta = localizar_conta(clientes, cliente, agencia, numero_conta)
+            if not conta:
+                raise RegistroInvalido("conta não encontrada")
+            with coletar_mensagens() as mensagens:  # Na thread atual, sem trocar sys.stdout
+                realizada = cliente.realizar_transacao(conta, transacao)
+            if not realizada:
+                motivo = " ".join(mensagem.strip("\n @=") for mensagem in mensagens)  # Ex.: "Saldo insuficiente!"
+                raise RegistroInvalido(f"transação recusada: {motivo}" if motivo else "transação recusada")
+        except RegistroInvalido as erro:
+            yield numero_linha, registro, str(erro)
+        else:
+            yield numero_linha, registro, None
+
+def ingerir(caminho, clientes, caminho_rejeitados=None, saida=sys.stdout):
+    """
+    Ingere um arquivo de movimentações, grava os rejeitados em um arquivo à parte e
+    imprime a vazão ao final. As mensagens das operações individuais não são impressas; as das
+    recusadas vão para o motivo no arquivo de rejeitados.
+
+    :param caminho: Arquivo CSV ou JSONL de entrada.
+    :param clientes: Registro de clientes do sistema.
+    :param caminho_rejeitados: Arquivo JSONL para os registros rejeitados (padrão: <entrada>.rejeitados.jsonl).
+    :param saida: Onde imprimir o resumo.
+    :return: Dicionário com processados, aceitos, rejeitados e segundos.
+    """
+    caminho_rejeitados = caminho_rejeitados or f"{caminho}.rejeitados.jsonl"
+    aceitos = rejeitados = 0
+    inicio = time.perf_counter()
+
+    with open(caminho_rejeitados, "w", encoding="utf-8") as arquivo_rejeitados:
+        for numero_linha, registro, motivo in aplicar(ler_registros(caminho), clientes):
+            if motivo is None:
+                aceitos += 1
+                continue
+            rejeitados += 1
+            arquivo_rejeitados.write(
+                json.dumps({"linha": numero_linha, "motivo": motivo, "registro": registro}, ensure_ascii=False) + "\n"
+            )
+
+    segundos = time.perf_counter() - inicio
+    processados = aceitos + rejeitados
+    print(f"\n=== Lote {caminho} processado ===", file=saida)
+    print(f"Registros:\t{processados}\nAceitos:\t{aceitos}\nRejeitados:\t{rejeitados} ({caminho_rejeitados})", file=saida)
+    print(f"Tempo:\t\t{segundos:.2f}s\nVazão:\t\t{processados / segundos if segundos else 0:.0f} registros/s", file=saida)
+    return {"processados": processados, "aceitos": aceitos, "rejeitados": rejeitados, "segundos": segundos}
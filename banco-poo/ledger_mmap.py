@@ -0,0 +1,233 @@
+"""
+Armazenamento do histórico em arquivos de registros binários de tamanho fixo, lidos via mmap.
+As contas são distribuídas em shards (um arquivo por shard); cada conta mantém na memória
+apenas as posições dos seus registros, e as leituras vêm direto do page cache. Cada registro
+identifica a conta pela agência e pelo número, e o tipo por um código da tabela fixa
+armazenamento_historico.TIPOS_PERSISTIDOS. Uma trava por shard serializa as gravações das
+contas que compartilham o arquivo.
+
+Uso:
+    Conta.ledger = LedgersMmap("ledger", shards=16)  # Novas contas passam a gravar o histórico nos shards
+"""
+import mmap
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+
+from armazenamento_historico import TIPOS_PERSISTIDOS, codigo_persistido, formatar_data
+
+MAGICO = b"BPLEDG02"  # Identifica o formato (e a versão) do arquivo
+CABECALHO = struct.Struct("<8sQ")  # Mágico e quantidade de registros gravados
+REGISTRO = struct.Struct("<qqqb7s")  # Número da conta, centavos, instante, código do tipo, agência (32 bytes)
+REGISTROS_INICIAIS = 4096  # Capacidade inicial do arquivo, em registros
+
+class LedgerMmap:
+    """
+    Arquivo de um shard: cabeçalho seguido de registros de tamanho fixo, somente de acréscimo.
+    """
+    def __init__(self, caminho):
+        """
+        Abre (ou cria) o arquivo do shard e o mapeia na memória.
+
+        :param caminho: Caminho do arquivo.
+        """
+        self.caminho = Path(caminho)
+        novo = not self.caminho.exists() or self.caminho.stat().st_size < CABECALHO.size
+        self._arquivo = open(self.caminho, "r+b" if not novo else "w+b")
+        if novo:
+            self._arquivo.truncate(CABECALHO.size + REGISTROS_INICIAIS * REGISTRO.size)
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0)
+        if novo:
+            CABECALHO.pack_into(self._mapa, 0, MAGICO, 0)
+        magico, self._quantidade = CABECALHO.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"{caminho} não é um arquivo de ledger válido (ou é de outra versão).")
+        self._trava = threading.Lock()  # Reserva da posição, gravação e remapeamento são exclusivos
+        self._indices = {}  # (agência, número) -> posições (array) dos registros da conta no arquivo
+        for indice in range(self._quantidade):
+            numero, _centavos, _instante, _codigo, agencia = REGISTRO.unpack_from(self._mapa, CABECALHO.size + indice * REGISTRO.size)
+            self.indices((agencia.rstrip(b"\0"), numero)).append(indice)
+
+    def indices(self, conta):
+        """
+        Retorna as posições dos registros de uma conta, na ordem em que foram gravados.
+
+        :param conta: Identificador da conta no shard: tupla (agência codificada, número).
+        :return: array com as posições.
+        """
+        posicoes = self._indices.get(conta)
+        if posicoes is None:
+            posicoes = self._indices[conta] = array("q")
+        return posicoes
+
+    def anexar(self, conta, codigo, centavos, instante):
+        """
+        Acrescenta um registro ao final do arquivo, aumentando o mapeamento se necessário.
+        Seguro entre threads: contas diferentes do mesmo shard gravam em posições distintas.
+
+        :param conta: Identificador da conta no shard: tupla (agência codificada, número).
+        :param codigo: Código do tipo da transação.
+        :param centavos: Valor em centavos.
+        :param instante: Segundos desde a época.
+        :return: Posição do registro.
+        """
+        agencia, numero = conta
+        with self._trava:
+            indice = self._quantidade
+            deslocamento = CABECALHO.size + indice * REGISTRO.size
+            if deslocamento + REGISTRO.size > len(self._mapa):
+                self._crescer()
+            REGISTRO.pack_into(self._mapa, deslocamento, numero, centavos, instante, codigo, agencia)
+            self._quantidade += 1
+            CABECALHO.pack_into(self._mapa, 0, MAGICO, self._quantidade)
+            self.indices(conta).append(indice)
+        return indice
+
+    def registro(self, indice):
+        """
+        Lê um registro diretamente do mapeamento.
+
+        :param indice: Posição do registro.
+        :return: Tupla (número da conta, centavos, instante, código do tipo, agência codificada).
+        """
+        with self._trava:  # O mapeamento pode ser refeito por uma gravação concorrente
+            return REGISTRO.unpack_from(self._mapa, CABECALHO.size + indice * REGISTRO.size)
+
+    def _crescer(self):
+        """
+        Dobra o tamanho do arquivo e refaz o mapeamento.
+        """
+        self._mapa.flush()
+        self._mapa.close()
+        self._arquivo.truncate(os.fstat(self._arquivo.fileno()).st_size * 2)
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0)
+
+    def sincronizar(self):
+        """
+        Força a gravação das páginas modificadas em disco.
+        """
+        self._mapa.flush()
+
+    def fechar(self):
+        """
+        Sincroniza e fecha o arquivo.
+        """
+        with self._trava:
+            self._mapa.flush()
+            self._mapa.close()
+            self._arquivo.close()
+
+    def __len__(self):
+        """
+        Retorna a quantidade de registros gravados no shard.
+
+        :return: Número de registros.
+        """
+        return self._quantidade
+
+class LedgersMmap:
+    """
+    Conjunto de shards em um diretório; cada conta pertence ao shard numero % shards.
+    """
+    def __init__(self, diretorio, shards=16):
+        """
+        Abre (ou cria) os arquivos dos shards.
+
+        :param diretorio: Diretório dos arquivos.
+        :param shards: Quantidade de shards.
+        """
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self._shards = [LedgerMmap(self.diretorio / f"shard-{indice:03d}.ledger") for indice in range(shards)]
+
+    def armazenamento(self, agencia, numero):
+        """
+        Cria o armazenamento do histórico de uma conta no seu shard.
+
+        :param agencia: Agência da conta (até 7 caracteres).
+        :param numero: Número da conta.
+        :return: ArmazenamentoMmap da conta.
+        """
+        codificada = agencia.encode()
+        if len(codificada) > 7:
+            raise ValueError(f"Agência longa demais para o ledger: {agencia}")
+        return ArmazenamentoMmap(self._shards[numero % len(self._shards)], (codificada, numero))
+
+    def sincronizar(self):
+        """
+        Força a gravação de todos os shards em disco.
+        """
+        for shard in self._shards:
+            shard.sincronizar()
+
+    def fechar(self):
+        """
+        Fecha todos os shards.
+        """
+        for shard in self._shards:
+            shard.fechar()
+
+class ArmazenamentoMmap:
+    """
+    Armazenamento do histórico de uma conta em um shard mapeado na memória.
+    Segue a mesma interface de ArmazenamentoDicionarios e ArmazenamentoColunar.
+    """
+    def __init__(self, ledger, conta):
+        """
+        Associa o armazenamento à conta no shard, reaproveitando registros já gravados.
+
+        :param ledger: LedgerMmap do shard.
+        :param conta: Identificador da conta no shard: tupla (agência codificada, número).
+        """
+        self._ledger = ledger
+        self._conta = conta
+        self._indices = ledger.indices(conta)  # Posições dos registros desta conta no shard
+
+    def anexar(self, tipo, valor, instante):
+        """
+        Grava uma transação no shard.
+
+        :param tipo: Nome do tipo da transação.
+        :param valor: Valor da transação.
+        :param instante: Segundos desde a época.
+        """
+        self._ledger.anexar(self._conta, codigo_persistido(tipo), round(valor * 100), instante)
+
+    def entrada(self, posicao):
+        """
+        Retorna a transação na posição informada sem montar um dicionário.
+
+        :param posicao: Posição da transação no histórico da conta.
+        :return: Tupla (tipo, valor, instante).
+        """
+        _numero, centavos, instante, codigo, _agencia = self._ledger.registro(self._indices[posicao])
+        return TIPOS_PERSISTIDOS[codigo], centavos / 100, instante
+
+    def __getitem__(self, posicao):
+        """
+        Retorna a transação na posição informada.
+
+        :param posicao: Posição da transação no histórico da conta.
+        :return: Dicionário com tipo, valor e data.
+        """
+        tipo, valor, instante = self.entrada(posicao)
+        return {"tipo": tipo, "valor": valor, "data": formatar_data(instante)}
+
+    def __iter__(self):
+        """
+        Percorre as transações da conta, lendo cada registro do mapeamento.
+
+        :yield: Dicionário de cada transação.
+        """
+        for posicao in range(len(self._indices)):
+            yield self[posicao]
+
+    def __len__(self):
+        """
+        Retorna a quantidade de transações da conta.
+
+        :return: Número de transações.
+        """
+        return len(self._indices)
@@ -0,0 +1,202 @@
+"""
+Motor de limites das contas: regras de quantidade e de valor por dia do calendário ou por janela
+móvel, verificadas com contadores mantidos a cada transação registrada, sem reler o histórico.
+Cada verificação custa O(número de regras), qualquer que seja o tamanho do histórico.
+
+As regras de cada tipo de conta ficam em Conta.LIMITES (e em Conta.politica_limites, para
+regras que dependem da conta, como o limite de saques da conta corrente).
+
+Exemplo (no máximo R$ 1.000,00 em saques a cada 24 horas, além das regras padrão):
+    class ContaRestrita(ContaCorrente):
+        LIMITES = ContaCorrente.LIMITES + (
+            Limite("limite_valor_janela", "Valor de saques excedido!", valor=1000, tipos=("Saque",), janela=86400),
+        )
+"""
+from collections import deque
+from functools import lru_cache
+
+class Limite:
+    """
+    Regra de limite: quantidade máxima e/ou valor máximo das transações de certos tipos,
+    por dia do calendário (janela None) ou numa janela móvel de segundos.
+    """
+    __slots__ = ("motivo", "mensagem", "quantidade", "valor", "tipos", "janela")
+
+    def __init__(self, motivo, mensagem, quantidade=None, valor=None, tipos=None, janela=None):
+        """
+        Define a regra.
+
+        :param motivo: Motivo da rejeição nas métricas (ex.: "limite_saques").
+        :param mensagem: Mensagem exibida ao recusar uma transação.
+        :param quantidade: Quantidade máxima de transações (None: sem limite).
+        :param valor: Soma máxima dos valores das transações (None: sem limite).
+        :param tipos: Tipos de transação aos quais a regra se aplica (None: todos).
+        :param janela: Duração da janela móvel em segundos; None usa o dia do calendário.
+        """
+        self.motivo = motivo
+        self.mensagem = mensagem
+        self.quantidade = quantidade
+        self.valor = valor
+        self.tipos = frozenset(tipos) if tipos is not None else None
+        self.janela = janela
+
+    def contador(self):
+        """
+        Cria o contador adequado à janela da regra.
+
+        :return: ContadorDia ou ContadorJanela.
+        """
+        return ContadorDia() if self.janela is None else ContadorJanela(self.janela)
+
+@lru_cache(maxsize=None)
+def limite_saques(quantidade):
+    """
+    Regra do limite de saques por dia da conta corrente, compartilhada entre as contas com o mesmo limite.
+
+    :param quantidade: Quantidade máxima de saques por dia.
+    :return: Limite correspondente.
+    """
+    return Limite("limite_saques", "Número de saques excedido!", quantidade=quantidade, tipos=("Saque",))
+
+class ContadorDia:
+    """
+    Quantidade e soma, em centavos, das transações do dia do calendário mais recente.
+    Só esse dia é mantido: quando chega uma transação de um dia posterior, os totais recomeçam,
+    e a memória não cresce com os dias de vida da conta. Uma transação com data anterior ao dia
+    mantido é verificada e somada com os totais dele (os dias já encerrados não são guardados).
+    """
+    __slots__ = ("_dia", "_quantidade", "_centavos")
+
+    def __init__(self):
+        """
+        Inicializa o contador vazio.
+        """
+        self._dia = None  # Dia (ordinal) mantido
+        self._quantidade = 0
+        self._centavos = 0
+
+    def total(self, data):
+        """
+        Retorna os totais do dia da data.
+
+        :param data: datetime da transação.
+        :return: Tupla (quantidade, centavos).
+        """
+        if self._dia is None or data.toordinal() > self._dia:
+            return 0, 0  # Dia novo: nada registrado ainda
+        return self._quantidade, self._centavos
+
+    def somar(self, data, centavos):
+        """
+        Soma uma transação ao seu dia, descartando os totais do dia anterior se ela abrir um dia novo.
+
+        :param data: datetime da transação.
+        :param centavos: Valor da transação em centavos.
+        """
+        dia = data.toordinal()
+        if self._dia is None or dia > self._dia:
+            self._dia, self._quantidade, self._centavos = dia, 0, 0
+        self._quantidade += 1
+        self._centavos += centavos
+
+class ContadorJanela:
+    """
+    Quantidade e soma, em centavos, das transações dos últimos segundos (janela móvel).
+    As transações que saem da janela são descartadas pela esquerda: custo O(1) amortizado.
+    Para transações com data anterior às já registradas, a janela inclui também as posteriores,
+    o que torna a verificação mais restritiva, nunca mais permissiva.
+    """
+    __slots__ = ("_janela", "_eventos", "_quantidade", "_centavos")
+
+    def __init__(self, janela):
+        """
+        Inicializa o contador vazio.
+
+        :param janela: Duração da janela em segundos.
+        """
+        self._janela = janela
+        self._eventos = deque()  # (instante, centavos) em ordem de registro
+        self._quantidade = 0
+        self._centavos = 0
+
+    def total(self, data):
+        """
+        Retorna os totais da janela que termina na data.
+
+        :param data: datetime da transação.
+        :return: Tupla (quantidade, centavos).
+        """
+        self._descartar(data.timestamp() - self._janela)
+        return self._quantidade, self._centavos
+
+    def somar(self, data, centavos):
+        """
+        Soma uma transação à janela.
+
+        :param data: datetime da transação.
+        :param centavos: Valor da transação em centavos.
+        """
+        instante = data.timestamp()
+        self._descartar(instante - self._janela)
+        self._eventos.append((instante, centavos))
+        self._quantidade += 1
+        self._centavos += centavos
+
+    def _descartar(self, limite):
+        """
+        Descarta as transações ocorridas até o instante limite.
+
+        :param limite: Instante (segundos desde a época) a partir do qual as transações continuam na janela.
+        """
+        eventos = self._eventos
+        while eventos and eventos[0][0] <= limite:
+            _instante, centavos = eventos.popleft()
+            self._quantidade -= 1
+            self._centavos -= centavos
+
+class MotorLimites:
+    """
+    Regras de limite de uma conta, cada uma com o seu contador.
+    """
+    __slots__ = ("_regras",)
+
+    def __init__(self, limites):
+        """
+        Cria os contadores das regras.
+
+        :param limites: Iterável de Limite.
+        """
+        self._regras = [(limite, limite.contador()) for limite in limites]  # (regra, contador)
+
+    def verificar(self, tipo, valor, data):
+        """
+        Verifica se uma transação cabe em todas as regras aplicáveis, sem registrá-la.
+
+        :param tipo: Tipo da transação (ex.: "Saque").
+        :param valor: Valor da transação.
+        :param data: datetime da transação.
+        :return: Primeira regra violada, ou None se a transação é permitida.
+        """
+        centavos = round(valor * 100)
+        for limite, contador in self._regras:
+            if limite.tipos is not None and tipo not in limite.tipos:
+                continue
+            quantidade, total = contador.total(data)
+            if limite.quantidade is not None and quantidade >= limite.quantidade:
+                return limite
+            if limite.valor is not None and total + centavos > round(limite.valor * 100):
+                return limite
+        return None
+
+    def registrar(self, tipo, valor, data):
+        """
+        Soma uma transação registrada aos contadores das regras aplicáveis.
+
+        :param tipo: Tipo da transação.
+        :param valor: Valor da transação.
+        :param data: datetime da transação.
+        """
+        centavos = round(valor * 100)
+        for limite, contador in self._regras:
+            if limite.tipos is None or tipo in limite.tipos:
+                contador.somar(data, centavos)
@@ -0,0 +1,231 @@
+"""
+Métricas das operações do banco: contadores de chamadas, sucessos e falhas, motivos de rejeição
+e histogramas de latência com baldes fixos. Exporta em texto no formato do Prometheus ou em JSON.
+
+O registro de uma chamada não usa travas: cada thread incrementa os próprios contadores e o balde
+sai do bit_length da duração (baldes em potências de 2). O custo fica abaixo de 1 µs por chamada;
+ver benchmarks/bench_metricas.py.
+"""
+import threading
+
+LIMITES_NS = tuple(1 << expoente for expoente in range(10, 31))  # Limites dos baldes: ~1 µs a ~1 s, dobrando (o último balde é +Inf)
+_BALDE_POR_BITS = tuple(min(max(bits - 10, 0), len(LIMITES_NS)) for bits in range(65))  # bit_length da duração -> balde
+_BALDES = len(LIMITES_NS) + 1
+
+class MetricaOperacao:
+    """
+    Contadores e histograma de latência de uma operação.
+    Cada thread incrementa a sua própria lista de contadores, sem travas; as leituras somam as listas.
+    Lista de cada thread: baldes das chamadas com sucesso, baldes das falhas e, por fim, a soma das durações.
+    """
+    __slots__ = ("nome", "_local", "_contadores", "_trava")
+
+    def __init__(self, nome):
+        """
+        Inicializa os contadores zerados.
+
+        :param nome: Nome da operação.
+        """
+        self.nome = nome
+        self._local = threading.local()
+        self._contadores = []  # Listas de contadores de todas as threads que já registraram chamadas
+        self._trava = threading.Lock()  # Usada só ao criar a lista de uma thread
+
+    def registrar(self, duracao_ns, sucesso=True):
+        """
+        Registra uma chamada da operação.
+
+        :param duracao_ns: Duração da chamada, em nanossegundos.
+        :param sucesso: Se a chamada teve sucesso.
+        """
+        try:
+            contadores = self._local.contadores
+        except AttributeError:
+            contadores = self._contadores_da_thread()
+        contadores[_BALDE_POR_BITS[duracao_ns.bit_length()] + (0 if sucesso else _BALDES)] += 1
+        contadores[-1] += duracao_ns
+
+    @property
+    def baldes(self):
+        """
+        Retorna a quantidade de chamadas em cada balde de latência (não acumulada).
+
+        :return: Lista com um valor por balde, o último sendo +Inf.
+        """
+        totais = self._somar()
+        return [totais[indice] + totais[_BALDES + indice] for indice in range(_BALDES)]
+
+    @property
+    def sucessos(self):
+        """
+        Retorna a quantidade de chamadas com sucesso.
+
+        :return: Quantidade de chamadas.
+        """
+        return sum(self._somar()[:_BALDES])
+
+    @property
+    def falhas(self):
+        """
+        Retorna a quantidade de chamadas com falha.
+
+        :return: Quantidade de chamadas.
+        """
+        return sum(self._somar()[_BALDES:-1])
+
+    @property
+    def chamadas(self):
+        """
+        Retorna a quantidade total de chamadas.
+
+        :return: Quantidade de chamadas.
+        """
+        return sum(self._somar()[:-1])
+
+    @property
+    def soma_ns(self):
+        """
+        Retorna a soma das durações das chamadas.
+
+        :return: Soma em nanossegundos.
+        """
+        return self._somar()[-1]
+
+    def zerar(self):
+        """
+        Zera os contadores e o histograma.
+        """
+        with self._trava:
+            for contadores in self._contadores:
+                contadores[:] = [0] * len(contadores)
+
+    def _contadores_da_thread(self):
+        """
+        Cria e registra a lista de contadores da thread atual.
+
+        :return: Lista de contadores.
+        """
+        contadores = self._local.contadores = [0] * (2 * _BALDES + 1)
+        with self._trava:
+            self._contadores.append(contadores)
+        return contadores
+
+    def _somar(self):
+        """
+        Soma os contadores de todas as threads.
+
+        :return: Lista com os totais, no mesmo formato da lista de cada thread.
+        """
+        with self._trava:
+            listas = list(self._contadores)
+        return [sum(valores) for valores in zip(*listas)] if listas else [0] * (2 * _BALDES + 1)
+
+class Metricas:
+    """
+    Conjunto das métricas de todas as operações e dos motivos de rejeição.
+    """
+    def __init__(self):
+        """
+        Inicializa o conjunto vazio.
+        """
+        self._operacoes = {}  # Nome -> MetricaOperacao
+        self._rejeicoes = {}  # (operação, motivo) -> quantidade
+        self._trava = threading.Lock()
+
+    def operacao(self, nome):
+        """
+        Retorna (criando, se necessário) as métricas de uma operação.
+        Os chamadores frequentes devem guardar o objeto retornado em vez de buscá-lo a cada chamada.
+
+        :param nome: Nome da operação.
+        :return: MetricaOperacao da operação.
+        """
+        metrica = self._operacoes.get(nome)
+        if metrica is None:
+            with self._trava:
+                metrica = self._operacoes.setdefault(nome, MetricaOperacao(nome))
+        return metrica
+
+    def rejeitar(self, operacao, motivo):
+        """
+        Conta uma rejeição de regra de negócio (ex.: saque acima do limite).
+
+        :param operacao: Operação rejeitada (ex.: "Saque").
+        :param motivo: Motivo da rejeição (ex.: "saldo_insuficiente").
+        """
+        chave = (operacao, motivo)
+        with self._trava:
+            self._rejeicoes[chave] = self._rejeicoes.get(chave, 0) + 1
+
+    def zerar(self):
+        """
+        Descarta todas as métricas coletadas.
+        """
+        with self._trava:
+            for metrica in self._operacoes.values():
+                metrica.zerar()
+            self._rejeicoes.clear()
+
+    def exportar_json(self):
+        """
+        Retorna um retrato das métricas em estruturas compatíveis com JSON.
+
+        :return: Dicionário com as operações e as rejeições.
+        """
+        operacoes = {}
+        for nome, metrica in sorted(self._operacoes.items()):
+            totais = metrica._somar()  # Uma única leitura: os campos ficam coerentes entre si
+            sucessos, falhas = totais[:_BALDES], totais[_BALDES:-1]
+            operacoes[nome] = {
+                "chamadas": sum(sucessos) + sum(falhas),
+                "sucessos": sum(sucessos),
+                "falhas": sum(falhas),
+                "soma_ns": totais[-1],
+                "baldes": dict(zip([*map(str, LIMITES_NS), "+Inf"], map(sum, zip(sucessos, falhas)))),
+            }
+        with self._trava:
+            rejeicoes = [
+                {"operacao": operacao, "motivo": motivo, "quantidade": quantidade}
+                for (operacao, motivo), quantidade in sorted(self._rejeicoes.items())
+            ]
+        return {"limites_ns": list(LIMITES_NS), "operacoes": operacoes, "rejeicoes": rejeicoes}
+
+    def exportar_prometheus(self):
+        """
+        Retorna as métricas no formato de texto do Prometheus.
+
+        :return: Texto com contadores e histogramas.
+        """
+        dados = self.exportar_json()
+        linhas = [
+            "# HELP banco_operacoes_total Chamadas de cada operação, por resultado.",
+            "# TYPE banco_operacoes_total counter",
+        ]
+        for nome, metrica in dados["operacoes"].items():
+            linhas.append(f'banco_operacoes_total{{operacao="{nome}",resultado="sucesso"}} {metrica["sucessos"]}')
+            linhas.append(f'banco_operacoes_total{{operacao="{nome}",resultado="falha"}} {metrica["falhas"]}')
+
+        linhas += [
+            "# HELP banco_rejeicoes_total Rejeições de regras de negócio, por motivo.",
+            "# TYPE banco_rejeicoes_total counter",
+        ]
+        for rejeicao in dados["rejeicoes"]:
+            linhas.append(
+                f'banco_rejeicoes_total{{operacao="{rejeicao["operacao"]}",motivo="{rejeicao["motivo"]}"}} {rejeicao["quantidade"]}'
+            )
+
+        linhas += [
+            "# HELP banco_latencia_segundos Latência de cada operação.",
+            "# TYPE banco_latencia_segundos histogram",
+        ]
+        for nome, metrica in dados["operacoes"].items():
+            acumulado = 0
+            for limite, quantidade in metrica["baldes"].items():
+                acumulado += quantidade
+                le = limite if limite == "+Inf" else f"{int(limite) / 1e9:g}"
+                linhas.append(f'banco_latencia_segundos_bucket{{operacao="{nome}",le="{le}"}} {acumulado}')
+            linhas.append(f'banco_latencia_segundos_sum{{operacao="{nome}"}} {metrica["soma_ns"] / 1e9:.9f}')
+            linhas.append(f'banco_latencia_segundos_count{{operacao="{nome}"}} {metrica["chamadas"]}')
+        return "\n".join(linhas) + "\n"
+
+METRICAS = Metricas()  # Métricas do processo, alimentadas por log_transacao e pelas regras de negócio
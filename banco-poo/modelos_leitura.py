@@ -0,0 +1,230 @@
+"""
+Modelos de leitura do banco: totais por agência, por cliente e por dia e as contas de maior saldo,
+mantidos a cada transação registrada (Conta.modelos_leitura) em vez de percorrer as contas e os
+históricos a cada consulta. Os totais custam O(1) por transação; as maiores contas, O(log n).
+
+Os valores são guardados em centavos, para que a soma de muitas transações não acumule erros
+de arredondamento, e devolvidos em reais.
+
+Uso:
+    modelos = ModelosLeitura.reconstruir(contas)  # Estado inicial a partir das contas carregadas
+    Conta.modelos_leitura = modelos               # Passa a receber as transações registradas
+    modelos.totais_agencia("0001")                # {"saldo": ..., "creditos": ..., "debitos": ..., "transacoes": ...}
+    modelos.verificar(contas)                     # [] se os modelos batem com uma reconstrução completa
+"""
+import heapq
+import threading
+from datetime import date
+
+from banco_poo_datetime import Historico
+
+SALDO, CREDITOS, DEBITOS, TRANSACOES = range(4)  # Posições da lista de totais
+
+def _centavos(valor):
+    """
+    Converte um valor em reais para centavos.
+
+    :param valor: Valor em reais.
+    :return: Valor inteiro em centavos.
+    """
+    return round(valor * 100)
+
+def _em_reais(totais):
+    """
+    Converte uma lista de totais em dicionário, com os valores em reais.
+
+    :param totais: Lista [saldo, créditos, débitos, transações] em centavos (ou None).
+    :return: Dicionário com saldo, creditos, debitos e transacoes.
+    """
+    saldo, creditos, debitos, transacoes = totais or (0, 0, 0, 0)
+    return {"saldo": saldo / 100, "creditos": creditos / 100, "debitos": debitos / 100, "transacoes": transacoes}
+
+class ModelosLeitura:
+    """
+    Totais por agência, por cliente (CPF) e por dia, e o saldo de cada conta para as maiores contas.
+    Cada transação atualiza os modelos sob uma trava própria, curta, sem reler o histórico.
+    """
+    def __init__(self):
+        """
+        Inicializa os modelos vazios.
+        """
+        self._agencias = {}  # Agência -> [saldo, créditos, débitos, transações] em centavos
+        self._clientes = {}  # CPF -> [saldo, créditos, débitos, transações] em centavos
+        self._dias = {}  # Dia (ordinal) -> {tipo: [quantidade, centavos]}
+        self._saldos = {}  # (agência, número) -> saldo em centavos
+        self._maiores = []  # Heap de (-saldo, agência, número); entradas desatualizadas são descartadas nas consultas
+        self._trava = threading.Lock()
+
+    @classmethod
+    def reconstruir(cls, contas):
+        """
+        Constrói os modelos do zero: os saldos atuais das contas e os totais de todos os históricos.
+
+        :param contas: Iterável de contas.
+        :return: ModelosLeitura correspondente ao estado das contas.
+        """
+        modelos = cls()
+        for conta in contas:
+            chave = (conta.agencia, conta.numero)
+            cpf = getattr(conta.cliente, "cpf", None)
+            saldo = _centavos(conta.saldo)
+            modelos._linha(modelos._agencias, conta.agencia)[SALDO] += saldo
+            modelos._linha(modelos._clientes, cpf)[SALDO] += saldo
+            modelos._saldos[chave] = saldo
+            modelos._maiores.append((-saldo, conta.agencia, conta.numero))
+            for tipo, valor, instante in conta.historico.entradas():
+                modelos._acumular(conta.agencia, cpf, tipo, _centavos(valor), date.fromtimestamp(instante).toordinal())
+        heapq.heapify(modelos._maiores)
+        return modelos
+
+    def aplicar(self, conta, tipo, valor, data):
+        """
+        Aplica uma transação registrada na conta (chamado com a conta travada, após o registro).
+
+        :param conta: Conta cujo saldo e histórico mudaram.
+        :param tipo: Tipo da entrada no histórico (ex.: "Deposito", "TransferenciaEnviada").
+        :param valor: Valor da transação.
+        :param data: datetime da transação.
+        """
+        centavos = _centavos(valor)
+        sinal = Historico.SINAIS.get(tipo, 0)
+        chave = (conta.agencia, conta.numero)
+        cpf = getattr(conta.cliente, "cpf", None)
+        dia = data.toordinal()
+        with self._trava:
+            saldo = self._saldos.get(chave, 0) + sinal * centavos
+            self._saldos[chave] = saldo
+            self._acumular(conta.agencia, cpf, tipo, centavos, dia, sinal * centavos)
+            heapq.heappush(self._maiores, (-saldo, chave[0], chave[1]))
+            if len(self._maiores) > 2 * len(self._saldos) + 64:
+                self._compactar()  # O(n) a cada ~n transações: O(1) amortizado
+
+    def totais_agencia(self, agencia):
+        """
+        Retorna os totais das contas de uma agência.
+
+        :param agencia: Código da agência.
+        :return: Dicionário com saldo, creditos, debitos e transacoes.
+        """
+        with self._trava:
+            return _em_reais(self._agencias.get(agencia))
+
+    def totais_cliente(self, cpf):
+        """
+        Retorna os totais das contas de um cliente.
+
+        :param cpf: CPF do cliente.
+        :return: Dicionário com saldo, creditos, debitos e transacoes.
+        """
+        with self._trava:
+            return _em_reais(self._clientes.get(cpf))
+
+    def totais_dia(self, dia):
+        """
+        Retorna a quantidade e o valor das transações de um dia, por tipo.
+
+        :param dia: date do dia.
+        :return: Dicionário tipo -> {"quantidade": ..., "valor": ...}.
+        """
+        with self._trava:
+            return {
+                tipo: {"quantidade": quantidade, "valor": centavos / 100}
+                for tipo, (quantidade, centavos) in self._dias.get(dia.toordinal(), {}).items()
+            }
+
+    def maiores_saldos(self, quantidade=10):
+        """
+        Retorna as contas de maior saldo, do maior para o menor.
+
+        :param quantidade: Quantidade de contas.
+        :return: Lista de tuplas (agência, número, saldo).
+        """
+        with self._trava:
+            maiores, validas = [], []
+            while self._maiores and len(validas) < quantidade:
+                entrada = heapq.heappop(self._maiores)
+                saldo, agencia, numero = -entrada[0], entrada[1], entrada[2]
+                if self._saldos.get((agencia, numero)) == saldo and (not validas or validas[-1] != entrada):
+                    validas.append(entrada)
+                    maiores.append((agencia, numero, saldo / 100))
+                # Entradas desatualizadas (ou repetidas) ficam fora do heap
+            for entrada in validas:
+                heapq.heappush(self._maiores, entrada)
+            return maiores
+
+    def verificar(self, contas):
+        """
+        Reconstrói os modelos a partir das contas e compara com os mantidos incrementalmente.
+
+        :param contas: Iterável de contas (as mesmas que alimentaram os modelos).
+        :return: Lista de divergências (modelo, chave, esperado, mantido); vazia se tudo confere.
+        """
+        referencia = ModelosLeitura.reconstruir(contas)
+        divergencias = []
+        with self._trava:
+            for nome in ("_agencias", "_clientes", "_dias", "_saldos"):
+                esperados, mantidos = getattr(referencia, nome), getattr(self, nome)
+                for chave in esperados.keys() | mantidos.keys():
+                    esperado, mantido = esperados.get(chave), mantidos.get(chave)
+                    if _normalizar(esperado) != _normalizar(mantido):
+                        divergencias.append((nome.lstrip("_"), chave, esperado, mantido))
+        return divergencias
+
+    def _acumular(self, agencia, cpf, tipo, centavos, dia, variacao=0):
+        """
+        Soma uma transação aos créditos ou débitos da agência e do cliente e aos totais do dia.
+
+        :param agencia: Agência da conta.
+        :param cpf: CPF do titular.
+        :param tipo: Tipo da entrada no histórico.
+        :param centavos: Valor da transação em centavos.
+        :param dia: Dia (ordinal) da transação.
+        :param variacao: Variação do saldo em centavos (zero na reconstrução, que parte dos saldos atuais).
+        """
+        coluna = CREDITOS if Historico.SINAIS.get(tipo, 0) > 0 else DEBITOS
+        for totais, chave in ((self._agencias, agencia), (self._clientes, cpf)):
+            linha = self._linha(totais, chave)
+            linha[SALDO] += variacao
+            linha[coluna] += centavos
+            linha[TRANSACOES] += 1
+        por_tipo = self._dias.get(dia)
+        if por_tipo is None:
+            por_tipo = self._dias[dia] = {}
+        totais_tipo = por_tipo.get(tipo)
+        if totais_tipo is None:
+            por_tipo[tipo] = [1, centavos]
+        else:
+            totais_tipo[0] += 1
+            totais_tipo[1] += centavos
+
+    @staticmethod
+    def _linha(totais, chave):
+        """
+        Retorna a lista de totais de uma chave, criando-a zerada se necessário.
+
+        :param totais: Dicionário de totais.
+        :param chave: Agência ou CPF.
+        :return: Lista [saldo, créditos, débitos, transações].
+        """
+        linha = totais.get(chave)
+        if linha is None:
+            linha = totais[chave] = [0, 0, 0, 0]
+        return linha
+
+    def _compactar(self):
+        """
+        Refaz o heap das maiores contas só com as entradas atuais (uma por conta).
+        """
+        self._maiores = [(-saldo, agencia, numero) for (agencia, numero), saldo in self._saldos.items()]
+        heapq.heapify(self._maiores)
+
+def _normalizar(valor):
+    """
+    Trata totais zerados como ausentes na comparação (ex.: conta sem transações, que só a reconstrução conhece).
+
+    :param valor: Totais de uma chave (lista, dicionário, inteiro ou None).
+    :return: Valor comparável, ou None se zerado.
+    """
+    if not valor or valor == [0, 0, 0, 0]:
+        return None
+    return valor
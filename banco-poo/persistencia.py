@@ -0,0 +1,282 @@
+"""
+Persistência do estado do banco com snapshots periódicos e diário de mutações.
+Na inicialização, o último snapshot é carregado e apenas a cauda do diário gravada depois
+dele é reaplicada.
+
+Arquivos no diretório de dados:
+    snapshot-<lsn>.bin   Estado completo até o lsn indicado (formato binário, ver salvar_snapshot).
+    diario-<lsn>.log     Segmento do diário cujo primeiro registro tem o lsn indicado.
+"""
+import io
+import json
+import os
+import pickle
+import struct
+from datetime import datetime
+from pathlib import Path
+
+from banco_poo_datetime import TRANSFERENCIA_ENVIADA, TRANSFERENCIA_RECEBIDA, Conta, ContaCorrente, PessoaFisica
+from diario import Diario, ler_diario
+from registro_clientes import ClienteRegistry
+
+MAGICO = b"BPSNAP03"  # Identifica o formato (e a versão) do snapshot: corpo em JSON
+MAGICO_V1 = b"BPSNAP01"  # Corpo em pickle, sem o saldo inicial do histórico (ainda aceito na carga)
+MAGICO_V2 = b"BPSNAP02"  # Corpo em pickle (ainda aceito na carga)
+CABECALHO = struct.Struct("<8sQQQ")  # Mágico, lsn, próximo número de conta, tamanho do corpo
+NUMERO_CONTA_INICIAL = 1001  # Número da primeira conta do sistema
+
+class Persistencia:
+    """
+    Gerencia o diretório de dados: carrega o estado, mantém o diário ativo e grava snapshots.
+    """
+    def __init__(self, diretorio, modo_diario="grupo", janela_ms=2.0, transacoes_recentes=1000):
+        """
+        Inicializa a persistência em um diretório (criado se não existir).
+
+        :param diretorio: Diretório dos snapshots e do diário.
+        :param modo_diario: Modo do diário ("sincrono" ou "grupo").
+        :param janela_ms: Janela do group commit, em milissegundos.
+        :param transacoes_recentes: Quantidade de transações mais recentes de cada conta guardadas no snapshot.
+        """
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self._modo_diario = modo_diario
+        self._janela_ms = janela_ms
+        self._transacoes_recentes = transacoes_recentes
+        self.diario = None
+
+    def carregar(self):
+        """
+        Carrega o último snapshot, reaplica a cauda do diário e ativa o diário para novas mutações.
+
+        :return: Tupla (registro de clientes, lista de contas, próximo número de conta).
+        """
+        lsn = 0
+        clientes, contas, numero_conta = ClienteRegistry(), [], NUMERO_CONTA_INICIAL
+        snapshots = self._arquivos("snapshot", ".bin")
+        if snapshots:
+            lsn, arquivo = snapshots[-1]
+            clientes, contas, numero_conta = carregar_snapshot(arquivo)
+
+        contas_por_numero = {(conta.agencia, conta.numero): conta for conta in contas}
+        segmentos = self._arquivos("diario", ".log")
+        for indice, (inicio, arquivo) in enumerate(segmentos):
+            proximo = segmentos[indice + 1][0] if indice + 1 < len(segmentos) else None
+            if proximo is not None and proximo <= lsn + 1:
+                continue  # Segmento inteiro já coberto pelo snapshot
+            for registro in ler_diario(arquivo, apos_lsn=lsn):
+                numero_conta = reaplicar(registro, clientes, contas, contas_por_numero, numero_conta)
+                lsn = registro["lsn"]
+
+        arquivo_diario = segmentos[-1][1] if segmentos else self._caminho("diario", lsn + 1, ".log")
+        self._ativar_diario(arquivo_diario, lsn)
+        return clientes, contas, numero_conta
+
+    def salvar_snapshot(self, clientes, contas, numero_conta):
+        """
+        Grava um snapshot do estado atual, inicia um novo segmento do diário e remove os
+        snapshots e segmentos antigos, já cobertos pelo novo snapshot.
+
+        :param clientes: Registro de clientes.
+        :param contas: Lista de contas.
+        :param numero_conta: Próximo número de conta.
+        :return: Caminho do snapshot gravado.
+        """
+        lsn = self.diario.ultimo_lsn if self.diario else 0
+        destino = self._caminho("snapshot", lsn, ".bin")
+        salvar_snapshot(destino, clientes, contas, numero_conta, lsn, self._transacoes_recentes)
+
+        self._ativar_diario(self._caminho("diario", lsn + 1, ".log"), lsn)
+        for prefixo, sufixo, limite in (("snapshot", ".bin", lsn), ("diario", ".log", lsn + 1)):
+            for inicio, arquivo in self._arquivos(prefixo, sufixo):
+                if inicio < limite:
+                    arquivo.unlink()
+        return destino
+
+    def fechar(self):
+        """
+        Fecha o diário ativo e o desliga das contas.
+        """
+        if self.diario:
+            self.diario.fechar()
+            if Conta.diario is self.diario:
+                Conta.diario = None
+            self.diario = None
+
+    def _ativar_diario(self, caminho, lsn):
+        """
+        Fecha o diário atual (se houver) e passa a gravar as mutações no segmento informado.
+
+        :param caminho: Caminho do segmento do diário.
+        :param lsn: Último lsn já persistido.
+        """
+        if self.diario:
+            self.diario.fechar()
+        self.diario = Diario(str(caminho), modo=self._modo_diario, janela_ms=self._janela_ms, ultimo_lsn=lsn)
+        Conta.diario = self.diario
+
+    def _caminho(self, prefixo, lsn, sufixo):
+        """
+        Monta o caminho de um arquivo de dados.
+
+        :param prefixo: "snapshot" ou "diario".
+        :param lsn: lsn que compõe o nome do arquivo.
+        :param sufixo: Extensão do arquivo.
+        :return: Caminho do arquivo.
+        """
+        return self.diretorio / f"{prefixo}-{lsn:012d}{sufixo}"
+
+    def _arquivos(self, prefixo, sufixo):
+        """
+        Lista os arquivos de um tipo, ordenados pelo lsn do nome.
+
+        :param prefixo: "snapshot" ou "diario".
+        :param sufixo: Extensão do arquivo.
+        :return: Lista de tuplas (lsn, caminho).
+        """
+        arquivos = []
+        for arquivo in self.diretorio.glob(f"{prefixo}-*{sufixo}"):
+            numero = arquivo.name[len(prefixo) + 1:-len(sufixo)]
+            if numero.isdigit():
+                arquivos.append((int(numero), arquivo))
+        return sorted(arquivos)
+
+def salvar_snapshot(destino, clientes, contas, numero_conta, lsn, transacoes_recentes=1000):
+    """
+    Grava o estado em formato binário: um cabeçalho fixo (mágico, lsn, próximo número de conta,
+    tamanho do corpo) seguido do corpo em JSON (listas de textos e números; nada que execute código na carga).
+    Cada conta guarda o saldo anterior ao histórico completo e o anterior às transações guardadas,
+    ambos calculados pelo histórico, para que a conciliação não dependa do saldo da conta.
+    A gravação é atômica: escreve em um arquivo temporário, sincroniza e renomeia.
+
+    :param destino: Caminho do snapshot.
+    :param clientes: Registro de clientes.
+    :param contas: Lista de contas.
+    :param numero_conta: Próximo número de conta.
+    :param lsn: lsn do último registro do diário refletido no estado.
+    :param transacoes_recentes: Quantidade de transações mais recentes de cada conta a guardar.
+    """
+    dados_clientes = [
+        (cliente.cpf, cliente.nome, cliente.data_nascimento, cliente.endereco) for cliente in clientes
+    ]
+    dados_contas = []
+    for conta in contas:
+        historico = conta.historico
+        entradas = list(historico.entradas(-transacoes_recentes))
+        dados_contas.append((
+            conta.agencia, conta.numero, conta.cliente.cpf, conta.saldo, conta.limite, conta._limite_saques, entradas,
+            historico.saldo_inicial, historico.saldo_antes(len(historico.transacoes) - len(entradas)),
+        ))
+    corpo = json.dumps((dados_clientes, dados_contas), separators=(",", ":")).encode()
+
+    temporario = Path(f"{destino}.tmp")
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(CABECALHO.pack(MAGICO, lsn, numero_conta, len(corpo)))
+        arquivo.write(corpo)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, destino)
+
+def carregar_snapshot(origem):
+    """
+    Reconstrói clientes, contas e histórico recente a partir de um snapshot.
+
+    :param origem: Caminho do snapshot.
+    :return: Tupla (registro de clientes, lista de contas, próximo número de conta).
+    :raises ValueError: Quando o arquivo não é um snapshot válido.
+    """
+    with open(origem, "rb") as arquivo:
+        magico, _lsn, numero_conta, tamanho = CABECALHO.unpack(arquivo.read(CABECALHO.size))
+        if magico == MAGICO:
+            dados_clientes, dados_contas = json.loads(arquivo.read(tamanho))
+        elif magico in (MAGICO_V1, MAGICO_V2):
+            dados_clientes, dados_contas = _UnpicklerSemGlobais(io.BytesIO(arquivo.read(tamanho))).load()
+        else:
+            raise ValueError(f"{origem} não é um snapshot válido.")
+
+    clientes = ClienteRegistry(PessoaFisica(nome, nascimento, cpf, endereco) for cpf, nome, nascimento, endereco in dados_clientes)
+    contas = []
+    for agencia, numero, cpf, saldo, limite, limite_saques, entradas, *saldos_iniciais in dados_contas:
+        conta = _restaurar_conta(clientes.buscar(cpf), agencia, numero, limite, limite_saques)
+        conta.restaurar_saldo(saldo)
+        historico = conta.historico
+        completo = len(historico.transacoes) > 0  # Históricos em ledger_mmap já vêm preenchidos do disco
+        if not completo:
+            for tipo, valor, instante in entradas:
+                historico.adicionar_entrada(tipo, valor, datetime.fromtimestamp(instante))
+        if saldos_iniciais:
+            saldo_historico, saldo_janela = saldos_iniciais
+            historico.saldo_inicial = saldo_historico if completo else saldo_janela  # Como gravado, sem olhar o saldo
+        else:
+            historico.ajustar_saldo_inicial(saldo)  # Snapshot BPSNAP01: só dá para deduzir do saldo
+        contas.append(conta)
+    return clientes, contas, numero_conta
+
+def reaplicar(registro, clientes, contas, contas_por_numero, numero_conta):
+    """
+    Reaplica um registro do diário ao estado em memória, sem validar nem gravar no diário.
+
+    :param registro: Registro lido do diário.
+    :param clientes: Registro de clientes.
+    :param contas: Lista de contas.
+    :param contas_por_numero: Dicionário (agência, número) -> conta.
+    :param numero_conta: Próximo número de conta.
+    :return: Próximo número de conta atualizado.
+    :raises ValueError: Quando a operação do registro é desconhecida.
+    """
+    operacao = registro["op"]
+    if operacao == "Cliente":
+        clientes.adicionar(PessoaFisica(registro["nome"], registro["data_nascimento"], registro["cpf"], registro["endereco"]))
+    elif operacao == "Conta":
+        conta = _restaurar_conta(
+            clientes.buscar(registro["cpf"]), registro["agencia"], registro["numero"], registro["limite"], registro["limite_saques"]
+        )
+        contas.append(conta)
+        contas_por_numero[(conta.agencia, conta.numero)] = conta
+        numero_conta = max(numero_conta, conta.numero + 1)
+    elif operacao == "Transferencia":
+        origem = contas_por_numero[(registro["agencia"], registro["numero"])]
+        destino = contas_por_numero[(registro["destino_agencia"], registro["destino_numero"])]
+        valor, data = registro["valor"], datetime.fromtimestamp(registro["instante"])
+        origem.restaurar_saldo(origem.saldo - valor)
+        destino.restaurar_saldo(destino.saldo + valor)
+        if Conta.ledger is None:
+            origem.historico.adicionar_entrada(TRANSFERENCIA_ENVIADA, valor, data)
+            destino.historico.adicionar_entrada(TRANSFERENCIA_RECEBIDA, valor, data)
+    elif operacao in ("Deposito", "Saque"):
+        conta = contas_por_numero[(registro["agencia"], registro["numero"])]
+        valor = registro["valor"]
+        conta.restaurar_saldo(conta.saldo + (valor if operacao == "Deposito" else -valor))
+        if Conta.ledger is None:  # Com ledger_mmap, o histórico já foi gravado em disco
+            conta.historico.adicionar_entrada(operacao, valor, datetime.fromtimestamp(registro["instante"]))
+    else:
+        raise ValueError(f"Operação desconhecida no diário (lsn {registro.get('lsn')}): {operacao}")  # Diário corrompido ou mais novo
+    return numero_conta
+
+class _UnpicklerSemGlobais(pickle.Unpickler):
+    """
+    Leitor dos snapshots antigos (corpo em pickle) que só aceita tipos primitivos: recusa
+    qualquer classe ou função, de modo que um arquivo adulterado não executa código na carga.
+    """
+    def find_class(self, modulo, nome):
+        """
+        Recusa a referência a um objeto global do pickle.
+
+        :raises pickle.UnpicklingError: Sempre.
+        """
+        raise pickle.UnpicklingError(f"Snapshot com objeto não permitido: {modulo}.{nome}")
+
+def _restaurar_conta(cliente, agencia, numero, limite, limite_saques):
+    """
+    Recria uma conta corrente e a associa ao cliente.
+
+    :param cliente: Titular da conta.
+    :param agencia: Agência da conta.
+    :param numero: Número da conta.
+    :param limite: Limite máximo de saque.
+    :param limite_saques: Número máximo de saques.
+    :return: Conta recriada.
+    """
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero, limite=limite, limite_saques=limite_saques, agencia=agencia)
+    cliente.adicionar_conta(conta)
+    return conta
@@ -0,0 +1,111 @@
+class ClienteRegistry:
+    """
+    Registro de clientes indexado pelo CPF normalizado.
+    Substitui a busca linear na lista de clientes por uma consulta em tabela hash.
+    Indexa também as contas dos clientes por (agência, número); o índice é atualizado a cada
+    Cliente.adicionar_conta. As contas de um CPF são a lista do próprio cliente.
+    """
+    def __init__(self, clientes=()):
+        """
+        Inicializa o registro, opcionalmente com clientes já existentes.
+
+        :param clientes: Iterável de clientes a serem registrados.
+        """
+        self._clientes = {}  # Dicionário CPF normalizado -> cliente
+        self._contas = {}  # Dicionário (agência, número) -> conta
+        for cliente in clientes:
+            self.adicionar(cliente)
+
+    def adicionar(self, cliente):
+        """
+        Registra um cliente, recusando CPFs já cadastrados.
+
+        :param cliente: Cliente a ser registrado (precisa ter o atributo cpf).
+        :return: True se o cliente foi registrado, False se o CPF já existia.
+        """
+        chave = normalizar_cpf(cliente.cpf)
+        if chave in self._clientes:
+            return False
+        self._clientes[chave] = cliente
+        cliente.registro = self  # As próximas contas do cliente entram no índice ao serem adicionadas
+        for conta in cliente.contas:
+            self.indexar_conta(conta)
+        return True
+
+    def indexar_conta(self, conta):
+        """
+        Inclui uma conta no índice por (agência, número).
+
+        :param conta: Conta a ser indexada.
+        :return: True se a conta foi indexada, False se já havia outra conta com a mesma agência e número.
+        """
+        chave = (conta.agencia, conta.numero)
+        if self._contas.setdefault(chave, conta) is not conta:
+            return False
+        return True
+
+    def buscar_conta(self, agencia, numero):
+        """
+        Busca uma conta pela agência e pelo número em tempo constante.
+
+        :param agencia: Agência da conta.
+        :param numero: Número da conta.
+        :return: Conta correspondente ou None se não encontrada.
+        """
+        return self._contas.get((agencia, numero))
+
+    def contas_do_cliente(self, cpf):
+        """
+        Retorna as contas do cliente com o CPF informado.
+
+        :param cpf: CPF do cliente, com ou sem pontuação.
+        :return: Lista de contas do cliente (vazia se o cliente não existir).
+        """
+        cliente = self.buscar(cpf)
+        return cliente.contas if cliente else []
+
+    def buscar(self, cpf):
+        """
+        Busca um cliente pelo CPF em tempo constante.
+
+        :param cpf: CPF do cliente, com ou sem pontuação.
+        :return: Cliente correspondente ao CPF ou None se não encontrado.
+        """
+        return self._clientes.get(normalizar_cpf(cpf))
+
+    def __contains__(self, cpf):
+        """
+        Verifica se existe um cliente com o CPF informado.
+
+        :param cpf: CPF a ser verificado.
+        :return: True se o CPF estiver registrado.
+        """
+        return normalizar_cpf(cpf) in self._clientes
+
+    def __iter__(self):
+        """
+        Percorre os clientes na ordem de cadastro.
+
+        :return: Iterador sobre os clientes.
+        """
+        return iter(self._clientes.values())
+
+    def __len__(self):
+        """
+        Retorna a quantidade de clientes registrados.
+
+        :return: Número de clientes.
+        """
+        return len(self._clientes)
+
+def normalizar_cpf(cpf):
+    """
+    Normaliza um CPF removendo pontuação e espaços.
+
+    :param cpf: CPF em qualquer formatação (ex.: "123.456.789-00").
+    :return: CPF contendo somente os dígitos.
+    """
+    cpf = str(cpf)
+    if cpf.isdigit():
+        return cpf  # Caminho rápido: já está normalizado
+    return "".join(caractere for caractere in cpf if caractere.isdigit())
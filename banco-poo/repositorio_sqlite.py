@@ -0,0 +1,379 @@
+"""
+Repositório em SQLite para clientes, contas e histórico: o estado sobrevive ao processo e pode
+ser consultado em SQL sem carregar as transações na memória.
+
+Detalhes:
+    - Uma única conexão, reutilizada, em modo WAL; as instruções usam parâmetros e ficam no
+      cache de instruções preparadas do módulo sqlite3.
+    - Índices no CPF, no número da conta e em (conta, instante).
+    - As gravações são acumuladas e aplicadas em lotes, cada lote em uma transação explícita;
+      se a aplicação falhar, nada do lote é gravado e ele continua pendente.
+      Um lote ainda não aplicado se perde numa queda do processo; para durabilidade a cada
+      operação, use também o diário (Conta.diario).
+    - O saldo não é gravado: ao carregar, é a soma das transações de cada conta. A carga lê os
+      históricos de todas as contas numa única consulta ordenada, uma conta por vez.
+
+O padrão continua sendo o estado na memória; o repositório só é usado quando configurado.
+
+Uso:
+    repositorio = RepositorioSQLite("banco.db")
+    Conta.ledger = repositorio  # O histórico das contas passa a ser gravado no SQLite
+    clientes, contas, numero_conta = repositorio.carregar()
+    ...
+    repositorio.fechar()
+"""
+import sqlite3
+import threading
+from itertools import groupby
+from operator import itemgetter
+
+from armazenamento_historico import TIPOS_PERSISTIDOS, codigo_persistido, formatar_data
+from banco_poo_datetime import TRANSFERENCIA_RECEBIDA, ContaCorrente, Deposito, PessoaFisica
+from registro_clientes import ClienteRegistry
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    cpf TEXT NOT NULL, nome TEXT NOT NULL, data_nascimento TEXT NOT NULL, endereco TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS clientes_cpf ON clientes (cpf);
+CREATE TABLE IF NOT EXISTS contas (
+    numero INTEGER PRIMARY KEY, agencia TEXT NOT NULL, cpf TEXT NOT NULL, limite REAL NOT NULL, limite_saques INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contas_cpf ON contas (cpf);
+CREATE TABLE IF NOT EXISTS transacoes (
+    conta INTEGER NOT NULL, posicao INTEGER NOT NULL, tipo INTEGER NOT NULL, centavos INTEGER NOT NULL, instante INTEGER NOT NULL,
+    PRIMARY KEY (conta, posicao)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transacoes_conta_instante ON transacoes (conta, instante);
+"""
+
+INSERIR = {  # Tabela -> instrução de inserção (preparada uma vez e reaproveitada)
+    "clientes": "INSERT INTO clientes (cpf, nome, data_nascimento, endereco) VALUES (?, ?, ?, ?)",
+    "contas": "INSERT INTO contas (numero, agencia, cpf, limite, limite_saques) VALUES (?, ?, ?, ?, ?)",
+    "transacoes": "INSERT INTO transacoes (conta, posicao, tipo, centavos, instante) VALUES (?, ?, ?, ?, ?)",
+}
+LINHAS_POR_CONSULTA = 1024  # Transações lidas por consulta ao percorrer um histórico
+CREDITOS = (codigo_persistido(Deposito.__name__), codigo_persistido(TRANSFERENCIA_RECEBIDA))  # Tipos que aumentam o saldo
+
+class RepositorioSQLite:
+    """
+    Banco SQLite com os clientes, as contas e o histórico de todas as contas.
+    Segue a interface de ledger_mmap.LedgersMmap para servir de Conta.ledger.
+    """
+    def __init__(self, caminho, tamanho_lote=256):
+        """
+        Abre (ou cria) o banco e o esquema.
+
+        :param caminho: Caminho do arquivo do banco.
+        :param tamanho_lote: Quantidade de gravações pendentes que dispara a aplicação do lote.
+        """
+        self.caminho = caminho
+        self._tamanho_lote = tamanho_lote
+        self._conexao = sqlite3.connect(caminho, isolation_level=None, check_same_thread=False, cached_statements=64)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")  # Em WAL, sincroniza nos checkpoints, não a cada transação
+        self._conexao.executescript(ESQUEMA)
+        self._trava = threading.RLock()  # Uma conexão compartilhada entre as threads
+        self._pendentes = {tabela: [] for tabela in INSERIR}  # Linhas aguardando o próximo lote
+        self._quantidade_pendente = 0
+        self._quantidades = dict(self._conexao.execute("SELECT conta, COUNT(*) FROM transacoes GROUP BY conta"))  # Conta -> transações
+        self._carregadas = None  # Histórico já lido da conta sendo criada por carregar()
+
+    def carregar(self):
+        """
+        Monta os clientes e as contas gravados. O histórico continua no banco e é lido sob demanda;
+        por isso Conta.ledger deve apontar para este repositório antes da chamada. O banco não
+        guarda o saldo à parte: ele é a soma das transações, e as contas saem marcadas com
+        saldo_inicial_derivado (a conciliação não tem com o que comparar o saldo).
+
+        :return: Tupla (registro de clientes, lista de contas, próximo número de conta). As novas
+                 inclusões no registro e na lista são gravadas no banco.
+        """
+        with self._trava:
+            self._descarregar()
+            clientes = RegistroClientesSQLite(self)
+            for cpf, nome, data_nascimento, endereco in self._conexao.execute("SELECT cpf, nome, data_nascimento, endereco FROM clientes"):
+                ClienteRegistry.adicionar(clientes, PessoaFisica(nome, data_nascimento, cpf, endereco))  # Já gravado: não insere de novo
+
+            historicos = self._historicos_em_ordem()
+            proximo = next(historicos, None)
+            contas = ContasSQLite(self)
+            for numero, agencia, cpf, limite, limite_saques in self._conexao.execute(
+                "SELECT numero, agencia, cpf, limite, limite_saques FROM contas ORDER BY numero"
+            ):
+                while proximo is not None and proximo[0] < numero:
+                    proximo = next(historicos, None)  # Transações de uma conta que não está na tabela contas
+                entradas, saldo = proximo[1:] if proximo is not None and proximo[0] == numero else ([], 0)
+                self._carregadas = entradas  # Lidas por Historico ao criar a conta, sem outra consulta
+                try:
+                    cliente = clientes.buscar(cpf)
+                    conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero, limite=limite, limite_saques=limite_saques, agencia=agencia)
+                finally:
+                    self._carregadas = None
+                conta.restaurar_saldo(saldo / 100)
+                conta.historico.saldo_inicial_derivado = True  # O saldo é a soma das transações: conciliaria por construção
+                cliente.adicionar_conta(conta)
+                list.append(contas, conta)
+        numero_conta = contas[-1].numero + 1 if contas else 1001
+        return clientes, contas, numero_conta
+
+    def armazenamento(self, agencia, numero):
+        """
+        Cria o armazenamento do histórico de uma conta. O número identifica a conta sozinho:
+        a tabela contas não aceita números repetidos, mesmo em agências diferentes.
+
+        :param agencia: Agência da conta.
+        :param numero: Número da conta.
+        :return: ArmazenamentoSQLite da conta.
+        """
+        return ArmazenamentoSQLite(self, numero, self._carregadas)
+
+    def gravar(self, tabela, linha):
+        """
+        Acrescenta uma linha ao lote pendente, aplicando o lote quando ele enche.
+
+        :param tabela: Nome da tabela (ver INSERIR).
+        :param linha: Tupla com os valores, na ordem das colunas da instrução.
+        """
+        with self._trava:
+            self._pendentes[tabela].append(linha)
+            self._quantidade_pendente += 1
+            if self._quantidade_pendente >= self._tamanho_lote:
+                self._descarregar()
+
+    def consultar(self, sql, parametros=()):
+        """
+        Executa uma consulta depois de aplicar as gravações pendentes.
+
+        :param sql: Instrução SELECT.
+        :param parametros: Parâmetros da instrução.
+        :return: Lista com as linhas do resultado.
+        """
+        with self._trava:
+            self._descarregar()
+            return self._conexao.execute(sql, parametros).fetchall()
+
+    def quantidade(self, conta):
+        """
+        Retorna a quantidade de transações de uma conta, incluindo as pendentes.
+
+        :param conta: Número da conta.
+        :return: Número de transações.
+        """
+        return self._quantidades.get(conta, 0)
+
+    def reabrir(self):
+        """
+        Abre uma conexão nova com o banco no lugar da herdada, descartando as gravações pendentes
+        herdadas. Usado nos processos criados por fork (ex.: conciliacao.py), que não podem usar a
+        conexão do processo pai.
+        """
+        self._trava = threading.RLock()
+        self._conexao = sqlite3.connect(self.caminho, isolation_level=None, check_same_thread=False, cached_statements=64)
+        self._pendentes = {tabela: [] for tabela in INSERIR}
+        self._quantidade_pendente = 0
+
+    def sincronizar(self):
+        """
+        Aplica as gravações pendentes.
+        """
+        with self._trava:
+            self._descarregar()
+
+    def fechar(self):
+        """
+        Aplica as gravações pendentes e fecha a conexão.
+        """
+        with self._trava:
+            self._descarregar()
+            self._conexao.close()
+
+    def _historicos_em_ordem(self):
+        """
+        Percorre os históricos de todas as contas com uma única consulta, em ordem de conta e posição.
+
+        :yield: Tupla (número da conta, lista de entradas (tipo, valor, instante), saldo em centavos).
+        """
+        cursor = self._conexao.execute("SELECT conta, tipo, centavos, instante FROM transacoes ORDER BY conta, posicao")
+        for conta, linhas in groupby(cursor, key=itemgetter(0)):
+            entradas, saldo = [], 0
+            for _conta, codigo, centavos, instante in linhas:
+                entradas.append((TIPOS_PERSISTIDOS[codigo], centavos / 100, instante))
+                saldo += centavos if codigo in CREDITOS else -centavos
+            yield conta, entradas, saldo
+
+    def _descarregar(self):
+        """
+        Aplica o lote pendente em uma única transação. Deve ser chamado com a trava adquirida.
+        Se alguma inserção falhar, a transação é desfeita e o lote continua pendente, inteiro.
+        """
+        if not self._quantidade_pendente:
+            return
+        self._conexao.execute("BEGIN")
+        try:
+            for tabela, linhas in self._pendentes.items():  # Clientes antes de contas, contas antes de transações
+                if linhas:
+                    self._conexao.executemany(INSERIR[tabela], linhas)
+            self._conexao.execute("COMMIT")
+        except BaseException:
+            if self._conexao.in_transaction:
+                self._conexao.execute("ROLLBACK")
+            raise
+        for linhas in self._pendentes.values():  # Só depois do COMMIT: numa falha, nada do lote se perde
+            linhas.clear()
+        self._quantidade_pendente = 0
+
+class RegistroClientesSQLite(ClienteRegistry):
+    """
+    Registro de clientes que grava no repositório cada cliente novo.
+    """
+    def __init__(self, repositorio):
+        """
+        Inicializa o registro vazio.
+
+        :param repositorio: RepositorioSQLite onde gravar.
+        """
+        ClienteRegistry.__init__(self)
+        self._repositorio = repositorio
+
+    def adicionar(self, cliente):
+        """
+        Registra um cliente e o grava no repositório.
+
+        :param cliente: Cliente a ser registrado.
+        :return: True se o cliente foi registrado, False se o CPF já existia.
+        """
+        if not ClienteRegistry.adicionar(self, cliente):
+            return False
+        self._repositorio.gravar("clientes", (cliente.cpf, cliente.nome, cliente.data_nascimento, cliente.endereco))
+        return True
+
+class ContasSQLite(list):
+    """
+    Lista de contas que grava no repositório cada conta acrescentada.
+    """
+    def __init__(self, repositorio):
+        """
+        Inicializa a lista vazia.
+
+        :param repositorio: RepositorioSQLite onde gravar.
+        """
+        list.__init__(self)
+        self._repositorio = repositorio
+
+    def append(self, conta):
+        """
+        Acrescenta uma conta e a grava no repositório.
+
+        :param conta: Conta a ser acrescentada.
+        """
+        list.append(self, conta)
+        self._repositorio.gravar(
+            "contas", (conta.numero, conta.agencia, conta.cliente.cpf, conta.limite, conta._limite_saques)
+        )
+
+    def extend(self, contas):
+        """
+        Acrescenta várias contas, gravando cada uma no repositório.
+
+        :param contas: Iterável de contas.
+        """
+        for conta in contas:
+            self.append(conta)
+
+class ArmazenamentoSQLite:
+    """
+    Armazenamento do histórico de uma conta na tabela de transações.
+    Segue a mesma interface de ArmazenamentoDicionarios e ArmazenamentoColunar.
+    """
+    def __init__(self, repositorio, conta, carregadas=None):
+        """
+        Associa o armazenamento à conta no repositório.
+
+        :param repositorio: RepositorioSQLite.
+        :param conta: Número da conta.
+        :param carregadas: Entradas da conta já lidas pela carga (servem só à primeira leitura completa).
+        """
+        self._repositorio = repositorio
+        self._conta = conta
+        self._carregadas = carregadas
+
+    def anexar(self, tipo, valor, instante):
+        """
+        Acrescenta uma transação ao lote pendente do repositório.
+
+        :param tipo: Nome do tipo da transação.
+        :param valor: Valor da transação.
+        :param instante: Segundos desde a época.
+        """
+        repositorio = self._repositorio
+        with repositorio._trava:
+            posicao = repositorio._quantidades.get(self._conta, 0)
+            repositorio._quantidades[self._conta] = posicao + 1
+            repositorio.gravar("transacoes", (self._conta, posicao, codigo_persistido(tipo), round(valor * 100), instante))
+
+    def entrada(self, posicao):
+        """
+        Retorna a transação na posição informada sem montar um dicionário.
+
+        :param posicao: Posição da transação no histórico da conta.
+        :return: Tupla (tipo, valor, instante).
+        """
+        if posicao < 0:
+            posicao += len(self)
+        linhas = self._repositorio.consultar(
+            "SELECT tipo, centavos, instante FROM transacoes WHERE conta = ? AND posicao = ?", (self._conta, posicao)
+        )
+        if not linhas:
+            raise IndexError(posicao)
+        codigo, centavos, instante = linhas[0]
+        return TIPOS_PERSISTIDOS[codigo], centavos / 100, instante
+
+    def entradas(self, inicio=0):
+        """
+        Percorre as transações a partir de uma posição com uma única consulta.
+
+        :param inicio: Posição da primeira transação.
+        :yield: Tupla (tipo, valor, instante).
+        """
+        carregadas, self._carregadas = self._carregadas, None
+        if carregadas is not None and len(carregadas) == len(self):
+            yield from carregadas[inicio:]  # Leitura feita pela carga (o índice do Historico)
+            return
+        while True:
+            linhas = self._repositorio.consultar(
+                "SELECT tipo, centavos, instante FROM transacoes WHERE conta = ? AND posicao >= ? ORDER BY posicao LIMIT ?",
+                (self._conta, inicio, LINHAS_POR_CONSULTA),
+            )  # Em blocos: nem a conta inteira na memória, nem um cursor aberto entre as leituras
+            for codigo, centavos, instante in linhas:
+                yield TIPOS_PERSISTIDOS[codigo], centavos / 100, instante
+            if len(linhas) < LINHAS_POR_CONSULTA:
+                return
+            inicio += len(linhas)
+
+    def __getitem__(self, posicao):
+        """
+        Retorna a transação na posição informada.
+
+        :param posicao: Posição da transação no histórico da conta.
+        :return: Dicionário com tipo, valor e data.
+        """
+        tipo, valor, instante = self.entrada(posicao)
+        return {"tipo": tipo, "valor": valor, "data": formatar_data(instante)}
+
+    def __iter__(self):
+        """
+        Percorre as transações da conta com uma única consulta.
+
+        :yield: Dicionário de cada transação.
+        """
+        for tipo, valor, instante in self.entradas():
+            yield {"tipo": tipo, "valor": valor, "data": formatar_data(instante)}
+
+    def __len__(self):
+        """
+        Retorna a quantidade de transações da conta.
+
+        :return: Número de transações.
+        """
+        return self._repositorio.quantidade(self._conta)
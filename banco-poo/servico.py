@@ -0,0 +1,275 @@
+"""
+Camada de serviço do banco: executa as operações do menu (depósito, saque, extrato, cadastro de
+clientes e contas, listagem, totais) a partir de pedidos em dicionário, sem input() nem print().
+É usada pelos front-ends não interativos (servidor de rede, shards).
+
+Pedido:   {"op": "depositar", "cpf": "12345678900", "valor": 100.0}
+Resposta: {"ok": true, "mensagem": "Depósito realizado com sucesso!", "saldo": 100.0}
+"""
+import io
+import math
+import re
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from time import perf_counter_ns
+
+from banco_poo_datetime import (
+    AGENCIA_PADRAO, Conta, ContaCorrente, Deposito, PessoaFisica, Saque, coletar_mensagens, escrever_extrato, filtrar_cliente,
+    recuperar_conta_cliente, registrar_auditoria, registrar_no_diario,
+)
+from metricas import METRICAS
+from registro_clientes import ClienteRegistry
+
+_DECORACAO = re.compile(r"^[\s=@]+|[\s=@]+$")  # Marcadores "@@@" e "===" das mensagens do menu
+
+class ErroOperacao(Exception):
+    """
+    Erro de um pedido que não pode ser atendido; a mensagem é devolvida ao solicitante.
+    """
+
+class ServicoBanco:
+    """
+    Estado do banco (clientes, contas e próximo número de conta) e as operações sobre ele.
+    """
+    def __init__(self, clientes=None, contas=None, numero_conta=1001, agencia=AGENCIA_PADRAO, passo_numero=1):
+        """
+        Inicializa o serviço, opcionalmente com um estado já carregado.
+
+        :param clientes: Registro de clientes (padrão: vazio).
+        :param contas: Lista de contas (padrão: vazia), em ordem crescente de número.
+        :param numero_conta: Próximo número de conta.
+        :param agencia: Agência padrão das contas criadas pelo serviço.
+        :param passo_numero: Incremento entre números de conta consecutivos (os shards intercalam a numeração).
+        """
+        self.clientes = clientes if clientes is not None else ClienteRegistry()
+        self.contas = contas if contas is not None else []
+        self.numero_conta = numero_conta
+        self.agencia = agencia
+        self.passo_numero = passo_numero
+        self._trava_cadastro = threading.Lock()  # Cadastros alteram o registro e o contador de contas
+        self._operacoes = {
+            "criar_cliente": self.criar_cliente,
+            "criar_conta": self.criar_conta,
+            "depositar": self.depositar,
+            "sacar": self.sacar,
+            "extrato": self.extrato,
+            "listar_contas": self.listar_contas,
+            "metricas": self.metricas,
+            "totais": self.totais,
+        }
+        self._metricas = {nome: METRICAS.operacao(f"servico_{nome}") for nome in self._operacoes}
+
+    def executar(self, pedido):
+        """
+        Executa um pedido e devolve a resposta, sem deixar exceções escaparem.
+        A latência e o resultado de cada operação entram nas métricas como "servico_<op>".
+
+        :param pedido: Dicionário com "op" e os parâmetros da operação.
+        :return: Dicionário de resposta com "ok" e os dados ou o "erro".
+        """
+        inicio = perf_counter_ns()
+        try:
+            operacao = self._operacoes.get(pedido.get("op"))
+            if operacao is None:
+                raise ErroOperacao(f"Operação desconhecida: {pedido.get('op')}")
+            parametros = {chave: valor for chave, valor in pedido.items() if chave not in ("op", "id")}
+            resposta = operacao(**parametros)
+        except ErroOperacao as erro:
+            resposta = {"ok": False, "erro": str(erro)}
+        except (TypeError, ValueError) as erro:
+            resposta = {"ok": False, "erro": f"Pedido inválido: {erro}"}
+        except Exception as erro:  # Qualquer outra falha vira resposta de erro, como promete a interface
+            resposta = {"ok": False, "erro": f"Erro interno: {erro.__class__.__name__}: {erro}"}
+        metrica = self._metricas.get(pedido.get("op"))
+        if metrica is not None:
+            metrica.registrar(perf_counter_ns() - inicio, resposta["ok"])
+        if "id" in pedido:
+            resposta["id"] = pedido["id"]  # Permite ao cliente casar respostas e pedidos
+        return resposta
+
+    def criar_cliente(self, cpf, nome, data_nascimento, endereco):
+        """
+        Cadastra um cliente pessoa física.
+
+        :return: Resposta da operação.
+        """
+        cliente = PessoaFisica(nome, data_nascimento, cpf, endereco)
+        with self._trava_cadastro:
+            if cpf in self.clientes:
+                registrar_auditoria("Cliente", False, cpf=cpf)
+                raise ErroOperacao("Já existe um cliente com esse CPF!")
+            registrar_no_diario("Cliente", cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
+            self.clientes.adicionar(cliente)
+        registrar_auditoria("Cliente", True, cpf=cpf)
+        return {"ok": True, "mensagem": "Cliente criado com sucesso!"}
+
+    def criar_conta(self, cpf, agencia=None):
+        """
+        Cria uma conta corrente para o cliente, com o próximo número disponível.
+
+        :param agencia: Agência da conta (padrão: a agência do serviço).
+        :return: Resposta da operação com agência e número da conta.
+        """
+        cliente = self._cliente(cpf)
+        with self._trava_cadastro:
+            conta = ContaCorrente.nova_conta(cliente=cliente, numero=self.numero_conta, agencia=agencia or self.agencia)
+            registrar_no_diario(
+                "Conta", agencia=conta.agencia, numero=conta.numero, cpf=cliente.cpf, limite=conta.limite,
+                limite_saques=conta._limite_saques,
+            )
+            self.numero_conta += self.passo_numero
+            cliente.adicionar_conta(conta)
+            self.contas.append(conta)
+        registrar_auditoria("Conta", True, cpf=cliente.cpf, agencia=conta.agencia, conta=conta.numero)
+        return {"ok": True, "mensagem": "Conta criada com sucesso!", "agencia": conta.agencia, "numero": conta.numero}
+
+    def depositar(self, cpf, valor, conta=None, agencia=None):
+        """
+        Deposita na conta do cliente (a primeira, se o número não for informado).
+
+        :return: Resposta da operação com o saldo.
+        """
+        return self._transacao(cpf, conta, agencia, Deposito(_valor(valor)))
+
+    def sacar(self, cpf, valor, conta=None, agencia=None):
+        """
+        Saca da conta do cliente (a primeira, se o número não for informado).
+
+        :return: Resposta da operação com o saldo.
+        """
+        return self._transacao(cpf, conta, agencia, Saque(_valor(valor)))
+
+    def extrato(self, cpf, conta=None, cursor=0, tamanho_pagina=100, agencia=None):
+        """
+        Retorna uma página do extrato da conta do cliente.
+
+        :return: Resposta com as linhas da página, o cursor da próxima página (ou None) e o saldo.
+        """
+        alvo = self._conta(self._cliente(cpf), conta, agencia)
+        texto = io.StringIO()
+        proximo = escrever_extrato(alvo, texto, tamanho_pagina, cursor)
+        linhas = [linha for linha in texto.getvalue().split("\n") if linha]
+        return {"ok": True, "linhas": linhas, "cursor": proximo, "saldo": alvo.saldo}
+
+    def listar_contas(self, cursor=None, limite=100):
+        """
+        Lista as contas cadastradas em ordem de número, paginadas pelo número da última conta listada.
+
+        :param cursor: Número da última conta da página anterior (None para a primeira página).
+        :param limite: Quantidade máxima de contas na página.
+        :return: Resposta com as contas da página e o cursor da próxima página (ou None).
+        """
+        inicio = 0 if cursor is None else bisect_right(self.contas, cursor, key=lambda conta: conta.numero)
+        pagina = self.contas[inicio:inicio + limite]
+        proximo = pagina[-1].numero if inicio + limite < len(self.contas) else None
+        contas = [
+            {"agencia": conta.agencia, "numero": conta.numero, "titular": conta.cliente.nome, "saldo": conta.saldo}
+            for conta in pagina
+        ]
+        return {"ok": True, "contas": contas, "cursor": proximo}
+
+    def metricas(self, formato="json"):
+        """
+        Retorna as métricas do processo.
+
+        :param formato: "json" ou "prometheus".
+        :return: Resposta com as métricas (dicionário ou texto).
+        """
+        if formato == "prometheus":
+            return {"ok": True, "metricas": METRICAS.exportar_prometheus()}
+        return {"ok": True, "metricas": METRICAS.exportar_json()}
+
+    def totais(self, agencia=None, cpf=None, dia=None, maiores=None):
+        """
+        Consulta os modelos de leitura (Conta.modelos_leitura), sem percorrer contas nem históricos.
+
+        :param agencia: Agência cujos totais serão retornados (opcional).
+        :param cpf: CPF do cliente cujos totais serão retornados (opcional).
+        :param dia: Dia (dd-mm-aaaa) cujos totais por tipo serão retornados (opcional).
+        :param maiores: Quantidade de contas de maior saldo a retornar (opcional).
+        :return: Resposta com os totais pedidos.
+        :raises ErroOperacao: Quando os modelos de leitura estão desativados.
+        """
+        modelos = Conta.modelos_leitura
+        if modelos is None:
+            raise ErroOperacao("Modelos de leitura desativados!")
+        resposta = {"ok": True}
+        if agencia is not None:
+            resposta["agencia"] = modelos.totais_agencia(str(agencia))
+        if cpf is not None:
+            resposta["cliente"] = modelos.totais_cliente(str(cpf))
+        if dia is not None:
+            resposta["dia"] = modelos.totais_dia(datetime.strptime(dia, "%d-%m-%Y").date())
+        if maiores:
+            resposta["maiores_saldos"] = [
+                {"agencia": agencia_conta, "numero": numero, "saldo": saldo}
+                for agencia_conta, numero, saldo in modelos.maiores_saldos(int(maiores))
+            ]
+        return resposta
+
+    def _transacao(self, cpf, numero, agencia, transacao):
+        """
+        Realiza uma transação pelo cliente, coletando as mensagens do domínio (sem imprimi-las).
+
+        :return: Resposta da operação com o saldo.
+        """
+        cliente = self._cliente(cpf)
+        conta = self._conta(cliente, numero, agencia)
+        with coletar_mensagens() as mensagens:
+            realizada = cliente.realizar_transacao(conta, transacao)
+        return {"ok": bool(realizada), "mensagem": _texto(mensagens), "saldo": conta.saldo}
+
+    def _cliente(self, cpf):
+        """
+        Busca o cliente pelo CPF.
+
+        :raises ErroOperacao: Quando o cliente não existe.
+        """
+        cliente = filtrar_cliente(str(cpf), self.clientes)
+        if not cliente:
+            raise ErroOperacao("Esse cliente não existe!")
+        return cliente
+
+    def _conta(self, cliente, numero, agencia=None):
+        """
+        Busca a conta do cliente pela agência (padrão: a do serviço) e pelo número, no índice de
+        contas, ou a primeira conta se o número não for informado.
+
+        :raises ErroOperacao: Quando a conta não existe ou é de outro cliente.
+        """
+        if numero is None:
+            conta = recuperar_conta_cliente(cliente)
+        else:
+            conta = self.clientes.buscar_conta(agencia or self.agencia, int(numero))
+            if conta is not None and conta.cliente is not cliente:
+                conta = None
+        if not conta:
+            raise ErroOperacao("Conta não encontrada!")
+        return conta
+
+def _valor(valor):
+    """
+    Converte o valor de um pedido em número finito.
+
+    :param valor: Valor informado no pedido.
+    :return: Valor como float.
+    :raises ErroOperacao: Quando o valor não é um número finito (ex.: "nan", "inf").
+    """
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ErroOperacao("O valor informado é inválido!") from None
+    if not math.isfinite(numero):
+        raise ErroOperacao("O valor informado é inválido!")
+    return numero
+
+def _texto(mensagens):
+    """
+    Junta as mensagens do domínio numa frase, sem os marcadores do menu.
+
+    :param mensagens: Mensagens coletadas (ver coletar_mensagens).
+    :return: Texto das mensagens.
+    """
+    linhas = (_DECORACAO.sub("", linha) for mensagem in mensagens for linha in mensagem.splitlines())
+    return " ".join(linha for linha in linhas if linha)
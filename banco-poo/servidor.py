@@ -0,0 +1,136 @@
+"""
+Servidor asyncio que expõe as operações do banco em um protocolo de linhas JSON: cada linha
+recebida é um pedido e cada linha enviada é a resposta correspondente, na mesma ordem.
+
+    -> {"id": 1, "op": "criar_cliente", "cpf": "123", "nome": "Ana", "data_nascimento": "01-01-1990", "endereco": "Rua"}
+    <- {"ok": true, "mensagem": "Cliente criado com sucesso!", "id": 1}
+    -> {"op": "depositar", "cpf": "123", "valor": 100}
+    <- {"ok": true, "mensagem": "Depósito realizado com sucesso!", "saldo": 100.0}
+
+Operações: criar_cliente, criar_conta, depositar, sacar, extrato, listar_contas, metricas (ver servico.py).
+
+Com --shards N, as contas são particionadas entre N processos (ver shards.py).
+
+Uso: python servidor.py [--host 127.0.0.1] [--porta 8765] [--dados ./dados] [--shards N] [--auditoria ./auditoria]
+"""
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from servico import ServicoBanco
+
+LIMITE_LINHA = 1 << 20  # Tamanho máximo de um pedido, em bytes
+
+async def atender(servico, leitor, escritor, executor=None):
+    """
+    Atende uma conexão até o cliente fechá-la.
+
+    :param servico: ServicoBanco (ou shards.RoteadorShards) que executa os pedidos.
+    :param leitor: StreamReader da conexão.
+    :param escritor: StreamWriter da conexão.
+    :param executor: Executor das operações; None as executa no próprio laço de eventos.
+    """
+    laco = asyncio.get_running_loop()
+    try:
+        while linha := await leitor.readline():
+            try:
+                pedido = json.loads(linha)
+                if not isinstance(pedido, dict):
+                    raise ValueError("o pedido deve ser um objeto JSON")
+            except ValueError as erro:
+                resposta = {"ok": False, "erro": f"JSON inválido: {erro}"}
+            else:
+                if executor is None:
+                    resposta = servico.executar(pedido)
+                else:  # A operação espera o fsync ou o shard: não pode bloquear o laço
+                    resposta = await laco.run_in_executor(executor, servico.executar, pedido)
+            escritor.write(json.dumps(resposta, ensure_ascii=False).encode() + b"\n")
+            await escritor.drain()
+    except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError, ValueError):
+        pass  # Conexão perdida ou pedido grande demais: descarta a conexão
+    finally:
+        escritor.close()
+
+async def servir(servico, host="127.0.0.1", porta=8765, executor=None, pronto=None):
+    """
+    Aceita conexões até receber SIGINT ou SIGTERM.
+
+    :param servico: ServicoBanco (ou shards.RoteadorShards) que executa os pedidos.
+    :param host: Endereço de escuta.
+    :param porta: Porta de escuta.
+    :param executor: Executor das operações (opcional).
+    :param pronto: Função chamada quando o servidor começa a aceitar conexões (opcional).
+    """
+    parar = asyncio.Event()
+    laco = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        laco.add_signal_handler(sinal, parar.set)
+
+    servidor = await asyncio.start_server(
+        lambda leitor, escritor: atender(servico, leitor, escritor, executor),
+        host, porta, limit=LIMITE_LINHA, backlog=4096,  # Backlog alto para rajadas de milhares de conexões
+    )
+    async with servidor:
+        if pronto:
+            pronto()
+        await parar.wait()
+
+def main():
+    """
+    Carrega o estado (se houver diretório de dados), serve até ser interrompido e grava um snapshot ao sair.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--dados", help="diretório de snapshots e diário para persistir o estado")
+    parser.add_argument("--threads", type=int, default=64, help="threads das operações quando há diário ou shards")
+    parser.add_argument("--shards", type=int, help="particiona as contas entre processos trabalhadores")
+    parser.add_argument("--auditoria", help="diretório do log de auditoria (modo sem shards)")
+    parser.add_argument("--politica-auditoria", default="descartar_novos", help="política da fila cheia (ver auditoria.py)")
+    parser.add_argument("--totais", action="store_true", help="mantém os modelos de leitura da operação totais (modo sem shards)")
+    args = parser.parse_args()
+
+    if args.auditoria:
+        from auditoria import LogAuditoria
+        from banco_poo_datetime import Conta
+        Conta.auditoria = LogAuditoria(args.auditoria, politica=args.politica_auditoria)
+
+    persistencia = executor = roteador = None
+    if args.shards:
+        from shards import RoteadorShards
+        servico = roteador = RoteadorShards(args.shards, args.dados)  # Cada shard persiste no seu subdiretório
+        executor = ThreadPoolExecutor(args.threads)  # Pedidos para shards diferentes seguem em paralelo
+    elif args.dados:
+        from persistencia import Persistencia
+        persistencia = Persistencia(args.dados)
+        clientes, contas, numero_conta = persistencia.carregar()
+        servico = ServicoBanco(clientes, contas, numero_conta)
+        executor = ThreadPoolExecutor(args.threads)  # Várias operações por fsync do group commit
+    else:
+        servico = ServicoBanco()
+    if args.totais and not args.shards:
+        from banco_poo_datetime import Conta
+        from modelos_leitura import ModelosLeitura
+        Conta.modelos_leitura = ModelosLeitura.reconstruir(servico.contas)  # Parte do estado carregado
+
+    def pronto():
+        print(f"Servidor ouvindo em {args.host}:{args.porta}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(servir(servico, args.host, args.porta, executor, pronto))
+    finally:
+        if executor:
+            executor.shutdown()
+        if roteador:
+            roteador.fechar()
+        if persistencia:
+            persistencia.salvar_snapshot(servico.clientes, servico.contas, servico.numero_conta)
+            persistencia.fechar()
+        if args.auditoria:
+            Conta.auditoria.fechar()
+
+if __name__ == "__main__":
+    main()
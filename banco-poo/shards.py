@@ -0,0 +1,298 @@
+"""
+Modo particionado: as contas são distribuídas entre processos trabalhadores (shards), cada um com
+seu próprio interpretador, e um roteador encaminha cada operação ao shard dono.
+
+Particionamento:
+    - O cliente pertence ao shard crc32(cpf normalizado) % shards e suas contas são abertas nesse shard.
+    - O shard i numera as contas como NUMERO_CONTA_INICIAL + i, + i + shards, ..., de modo que o dono
+      de uma conta sai direto de (agência, número) por shard_da_conta, sem tabela de roteamento.
+    - Operações entre shards (listar_contas) são enviadas a todos e os resultados são intercalados.
+    - Um shard que morreu (pipe fechado) faz os pedidos dele voltarem como resposta de erro; os
+      demais shards continuam atendendo.
+
+Uso:
+    roteador = RoteadorShards(4)
+    roteador.executar({"op": "depositar", "cpf": "123", "valor": 100})
+    roteador.fechar()
+"""
+import heapq
+import multiprocessing
+import signal
+import threading
+import zlib
+from pathlib import Path
+
+from persistencia import NUMERO_CONTA_INICIAL
+from registro_clientes import normalizar_cpf
+from servico import ServicoBanco
+
+def shard_do_cliente(cpf, shards):
+    """
+    Retorna o shard onde o cliente e suas contas vivem.
+
+    :param cpf: CPF do cliente, com ou sem pontuação.
+    :param shards: Quantidade de shards.
+    :return: Índice do shard.
+    """
+    return zlib.crc32(normalizar_cpf(cpf).encode()) % shards  # "123.456.789-00" e "12345678900" caem no mesmo shard
+
+def shard_da_conta(agencia, numero, shards):
+    """
+    Retorna o shard dono de uma conta a partir da sua chave.
+    A agência não entra no cálculo porque os números de conta são únicos entre agências.
+
+    :param agencia: Agência da conta.
+    :param numero: Número da conta.
+    :param shards: Quantidade de shards.
+    :return: Índice do shard.
+    """
+    return (int(numero) - NUMERO_CONTA_INICIAL) % shards
+
+def _proximo_numero(numero_conta, indice, shards):
+    """
+    Retorna o menor número de conta >= numero_conta que pertence ao shard.
+
+    :param numero_conta: Próximo número livre.
+    :param indice: Índice do shard.
+    :param shards: Quantidade de shards.
+    :return: Número de conta do shard.
+    """
+    return numero_conta + (indice - (numero_conta - NUMERO_CONTA_INICIAL)) % shards
+
+def _atender(servico, pedido):
+    """
+    Executa um pedido no shard sem deixar exceções derrubarem o processo trabalhador.
+
+    :param servico: ServicoBanco do shard.
+    :param pedido: Dicionário do pedido.
+    :return: Dicionário de resposta.
+    """
+    try:
+        return servico.executar(pedido)
+    except Exception as erro:
+        return _erro_interno(erro)
+
+def _erro_interno(erro):
+    """
+    Monta a resposta de erro de uma falha inesperada no shard.
+
+    :param erro: Exceção ocorrida.
+    :return: Dicionário de resposta.
+    """
+    return {"ok": False, "erro": f"Erro interno: {erro.__class__.__name__}: {erro}"}
+
+def _erro_shard(indice, erro):
+    """
+    Monta a resposta de erro de um pedido cujo shard não pôde ser alcançado.
+
+    :param indice: Índice do shard.
+    :param erro: Exceção da comunicação com o shard (ex.: BrokenPipeError, EOFError).
+    :return: Dicionário de resposta.
+    """
+    return {"ok": False, "erro": f"Shard {indice} indisponível: {erro.__class__.__name__}: {erro}"}
+
+def _trabalhador(conexao, indice, shards, diretorio):
+    """
+    Laço de um processo trabalhador: recebe lotes de pedidos e devolve lotes de respostas.
+
+    :param conexao: Extremidade do Pipe ligada ao roteador.
+    :param indice: Índice do shard.
+    :param shards: Quantidade de shards.
+    :param diretorio: Diretório de dados do shard (None mantém o estado só na memória).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # O roteador coordena o encerramento
+    persistencia = None
+    if diretorio:
+        from persistencia import Persistencia
+        persistencia = Persistencia(diretorio)
+        clientes, contas, numero_conta = persistencia.carregar()
+    else:
+        clientes, contas, numero_conta = None, None, NUMERO_CONTA_INICIAL
+    servico = ServicoBanco(clientes, contas, _proximo_numero(numero_conta, indice, shards), passo_numero=shards)
+    try:
+        while (pedidos := conexao.recv()) is not None:
+            respostas = [_atender(servico, pedido) for pedido in pedidos]
+            try:
+                conexao.send(respostas)
+            except Exception as erro:  # Ex.: resposta que não pode ser serializada; nada chegou a ser enviado
+                conexao.send([_erro_interno(erro)] * len(pedidos))
+    finally:
+        if persistencia:
+            persistencia.salvar_snapshot(servico.clientes, servico.contas, servico.numero_conta)
+            persistencia.fechar()
+        conexao.close()
+
+class RoteadorShards:
+    """
+    Roteador que mantém os processos dos shards e encaminha cada pedido ao shard dono.
+    Tem a mesma interface executar(pedido) de ServicoBanco e pode ser chamado por várias threads:
+    pedidos para shards diferentes são atendidos em paralelo.
+    """
+    def __init__(self, shards=None, diretorio=None):
+        """
+        Inicia os processos dos shards.
+
+        :param shards: Quantidade de shards (padrão: número de núcleos).
+        :param diretorio: Diretório de dados; cada shard persiste em diretorio/shard-<i> (opcional).
+        """
+        self.shards = shards or multiprocessing.cpu_count()
+        self._conexoes, self._processos = [], []
+        self._travas = [threading.Lock() for _ in range(self.shards)]  # Um pedido em voo por shard
+        for indice in range(self.shards):
+            local, remota = multiprocessing.Pipe()
+            destino = str(Path(diretorio) / f"shard-{indice:03d}") if diretorio else None
+            processo = multiprocessing.Process(target=_trabalhador, args=(remota, indice, self.shards, destino), daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    def executar(self, pedido):
+        """
+        Encaminha um pedido ao shard dono (ou a todos, se for uma operação entre shards).
+
+        :param pedido: Dicionário com "op" e os parâmetros da operação.
+        :return: Dicionário de resposta.
+        """
+        if pedido.get("op") == "listar_contas":
+            return self._listar_contas(pedido)
+        try:
+            indice = self.shard(pedido)
+        except (KeyError, TypeError, ValueError) as erro:
+            return {"ok": False, "erro": f"Pedido inválido: {erro}"}
+        try:
+            return self._enviar(indice, [pedido])[0]
+        except Exception as erro:  # Shard morto ou pipe quebrado: o solicitante ainda recebe uma resposta
+            resposta = _erro_shard(indice, erro)
+            if "id" in pedido:
+                resposta["id"] = pedido["id"]
+            return resposta
+
+    def executar_lote(self, pedidos):
+        """
+        Executa vários pedidos enviando um único lote a cada shard, com os shards trabalhando em paralelo.
+        A ordem é preservada entre pedidos do mesmo shard.
+
+        :param pedidos: Lista de pedidos.
+        :return: Lista de respostas, na ordem dos pedidos.
+        """
+        respostas = [None] * len(pedidos)
+        lotes = [[] for _ in range(self.shards)]  # Posições dos pedidos de cada shard
+        for posicao, pedido in enumerate(pedidos):
+            if pedido.get("op") == "listar_contas":
+                respostas[posicao] = self._listar_contas(pedido)
+                continue
+            try:
+                lotes[self.shard(pedido)].append(posicao)
+            except (KeyError, TypeError, ValueError) as erro:
+                respostas[posicao] = {"ok": False, "erro": f"Pedido inválido: {erro}"}
+
+        enviados = [indice for indice, lote in enumerate(lotes) if lote]
+        lotes_respondidos = self._trocar(enviados, lambda indice: [pedidos[posicao] for posicao in lotes[indice]])
+        for indice, lote in lotes_respondidos.items():
+            if isinstance(lote, list):
+                for posicao, resposta in zip(lotes[indice], lote):
+                    respostas[posicao] = resposta
+                continue
+            for posicao in lotes[indice]:  # Shard indisponível: cada pedido dele recebe o erro
+                respostas[posicao] = dict(lote)
+                if "id" in pedidos[posicao]:
+                    respostas[posicao]["id"] = pedidos[posicao]["id"]
+        return respostas
+
+    def shard(self, pedido):
+        """
+        Retorna o shard dono de um pedido: pela conta, se informada, senão pelo CPF.
+
+        :param pedido: Dicionário do pedido.
+        :return: Índice do shard.
+        """
+        if pedido.get("conta") is not None:
+            return shard_da_conta(pedido.get("agencia"), pedido["conta"], self.shards)
+        return shard_do_cliente(pedido["cpf"], self.shards)
+
+    def fechar(self):
+        """
+        Encerra os shards, que gravam um snapshot antes de sair se houver diretório de dados.
+        """
+        for indice, conexao in enumerate(self._conexoes):
+            with self._travas[indice]:
+                try:
+                    conexao.send(None)
+                except OSError:
+                    pass  # Shard já morto: não há a quem avisar, mas os demais ainda são encerrados
+                conexao.close()
+        for processo in self._processos:
+            processo.join()
+
+    def _trocar(self, indices, lote_do_shard):
+        """
+        Envia um lote a cada shard indicado e só então lê as respostas, para que os shards
+        trabalhem ao mesmo tempo. As travas adquiridas são liberadas mesmo que um shard falhe, e
+        as respostas dos demais são lidas, para não ficarem esquecidas nos pipes.
+
+        :param indices: Índices dos shards.
+        :param lote_do_shard: Função índice -> lista de pedidos do shard.
+        :return: Dicionário índice -> lista de respostas, ou resposta de erro se o shard falhou.
+        """
+        resultados, adquiridas = {}, []
+        try:
+            for indice in indices:
+                self._travas[indice].acquire()
+                adquiridas.append(indice)
+                try:
+                    self._conexoes[indice].send(lote_do_shard(indice))
+                except Exception as erro:
+                    resultados[indice] = _erro_shard(indice, erro)
+            for indice in adquiridas:
+                if indice in resultados:
+                    continue  # O envio falhou: não há resposta a ler
+                try:
+                    resultados[indice] = self._conexoes[indice].recv()
+                except Exception as erro:
+                    resultados[indice] = _erro_shard(indice, erro)
+        finally:
+            for indice in adquiridas:
+                self._travas[indice].release()
+        return resultados
+
+    def _enviar(self, indice, pedidos):
+        """
+        Envia um lote a um shard e espera as respostas.
+
+        :param indice: Índice do shard.
+        :param pedidos: Lista de pedidos.
+        :return: Lista de respostas.
+        """
+        with self._travas[indice]:
+            self._conexoes[indice].send(pedidos)
+            return self._conexoes[indice].recv()
+
+    def _listar_contas(self, pedido):
+        """
+        Pede uma página a cada shard e intercala as páginas pelo número da conta.
+
+        :param pedido: Pedido de listar_contas (cursor e limite opcionais).
+        :return: Resposta com a página global e o cursor da próxima página (ou None).
+        """
+        limite = pedido.get("limite", 100)
+        parcial = {"op": "listar_contas", "cursor": pedido.get("cursor"), "limite": limite}
+        resultados = self._trocar(range(self.shards), lambda indice: [parcial])
+        paginas = [
+            resultado[0] if isinstance(resultado, list) else resultado
+            for _indice, resultado in sorted(resultados.items())
+        ]
+
+        erros = [pagina for pagina in paginas if not pagina["ok"]]
+        if erros:
+            resposta = dict(erros[0])
+            if "id" in pedido:
+                resposta["id"] = pedido["id"]
+            return resposta
+        intercaladas = list(heapq.merge(*(pagina["contas"] for pagina in paginas), key=lambda conta: conta["numero"]))
+        contas = intercaladas[:limite]
+        restam = len(intercaladas) > limite or any(pagina["cursor"] is not None for pagina in paginas)
+        resposta = {"ok": True, "contas": contas, "cursor": contas[-1]["numero"] if restam and contas else None}
+        if "id" in pedido:
+            resposta["id"] = pedido["id"]
+        return resposta
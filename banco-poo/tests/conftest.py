@@ -0,0 +1,23 @@
+"""
+Configuração dos testes: permite importar os módulos do banco e restaura os ganchos de Conta.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do banco
+
+from banco_poo_datetime import Conta
+
+@pytest.fixture(autouse=True)
+def ganchos_de_conta():
+    """
+    Garante que cada teste comece e termine com os ganchos de Conta desativados.
+    """
+    ganchos = ("diario", "ledger", "auditoria", "modelos_leitura")
+    for nome in ganchos:
+        setattr(Conta, nome, None)
+    yield
+    for nome in ganchos:
+        setattr(Conta, nome, None)
@@ -0,0 +1,110 @@
+"""
+Testes do log de auditoria assíncrono (auditoria.py).
+"""
+import json
+import threading
+
+import pytest
+
+import auditoria
+from auditoria import LogAuditoria
+
+def _ler(caminho):
+    """
+    :return: Operações gravadas no arquivo, na ordem.
+    """
+    return [json.loads(linha)["op"] for linha in caminho.read_text(encoding="utf-8").splitlines()]
+
+@pytest.fixture
+def gravador_retido(monkeypatch):
+    """
+    Segura o gravador no primeiro registro que ele formatar, até o teste liberar.
+
+    :return: Tupla (evento "gravador retido", evento "liberar").
+    """
+    retido, liberar = threading.Event(), threading.Event()
+    formatar = auditoria._formatar
+    def formatar_retido(registro):
+        retido.set()
+        liberar.wait(5)
+        return formatar(registro)
+    monkeypatch.setattr(auditoria, "_formatar", formatar_retido)
+    return retido, liberar
+
+def _encher(log, retido):
+    """
+    Coloca um registro nas mãos do gravador retido e enche a fila (capacidade 2) com A e B.
+    """
+    log.registrar("primeiro")
+    assert retido.wait(5)
+    assert log.registrar("A") and log.registrar("B")
+
+def test_descartar_novos(tmp_path, gravador_retido):
+    retido, liberar = gravador_retido
+    with LogAuditoria(tmp_path, capacidade=2, politica="descartar_novos") as log:
+        _encher(log, retido)
+        assert not log.registrar("C")
+        liberar.set()
+        log.descarregar()
+        assert log.descartados == 1
+    assert _ler(log.caminho) == ["primeiro", "A", "B"]
+
+def test_descartar_antigos(tmp_path, gravador_retido):
+    retido, liberar = gravador_retido
+    with LogAuditoria(tmp_path, capacidade=2, politica="descartar_antigos") as log:
+        _encher(log, retido)
+        assert log.registrar("C")
+        liberar.set()
+        log.descarregar()
+        assert log.descartados == 1
+    assert _ler(log.caminho) == ["primeiro", "B", "C"]
+
+def test_bloquear_espera_espaco(tmp_path, gravador_retido):
+    retido, liberar = gravador_retido
+    with LogAuditoria(tmp_path, capacidade=2, politica="bloquear") as log:
+        _encher(log, retido)
+        bloqueado = threading.Thread(target=log.registrar, args=("C",))
+        bloqueado.start()
+        bloqueado.join(0.1)
+        assert bloqueado.is_alive()  # Fila cheia: quem registra espera
+        liberar.set()
+        bloqueado.join(5)
+        assert not bloqueado.is_alive()
+        log.descarregar()
+        assert log.descartados == 0
+    assert _ler(log.caminho) == ["primeiro", "A", "B", "C"]
+
+def test_rotacao_mantem_os_arquivos_pedidos(tmp_path):
+    with LogAuditoria(tmp_path, tamanho_lote=1, tamanho_maximo=200, arquivos_mantidos=2) as log:
+        for indice in range(50):
+            log.registrar("Deposito", conta=indice)
+    caminho = log.caminho
+    assert caminho.with_name("auditoria.log.1").exists() and caminho.with_name("auditoria.log.2").exists()
+    assert not caminho.with_name("auditoria.log.3").exists()
+    for arquivo in (caminho, caminho.with_name("auditoria.log.1")):
+        assert all(operacao == "Deposito" for operacao in _ler(arquivo))
+
+def test_falha_do_gravador_chega_a_quem_espera(tmp_path, gravador_retido):
+    retido, liberar = gravador_retido
+    log = LogAuditoria(tmp_path, capacidade=1, politica="bloquear")
+    log.registrar("Deposito", valor=object())  # Não vira JSON: o gravador falha neste lote
+    assert retido.wait(5)
+    log.registrar("A")
+    erros = []
+    def registrar():
+        try:
+            log.registrar("B")
+        except OSError as erro:
+            erros.append(erro)
+    bloqueado = threading.Thread(target=registrar)
+    bloqueado.start()
+    liberar.set()
+    bloqueado.join(5)
+    assert not bloqueado.is_alive() and erros
+
+    with pytest.raises(OSError, match="falhou ao gravar"):
+        log.descarregar()
+    with pytest.raises(OSError):
+        log.registrar("C")
+    with pytest.raises(OSError):
+        log.fechar()
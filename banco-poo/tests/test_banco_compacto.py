@@ -0,0 +1,42 @@
+"""
+Testes das variantes compactas (banco_compacto.py).
+"""
+from datetime import datetime
+
+from banco_compacto import ContaCompacta, ContaCorrenteCompacta, DepositoCompacto, PessoaFisicaCompacta
+from banco_poo_datetime import Conta
+from diario import Diario, ler_diario
+from ledger_mmap import LedgersMmap
+
+def criar_conta():
+    """
+    :return: Conta corrente compacta de um cliente compacto.
+    """
+    cliente = PessoaFisicaCompacta("Ana", "01-01-1990", "12345678900", "Rua A, 1")
+    conta = ContaCorrenteCompacta.nova_conta(cliente=cliente, numero=1001)
+    cliente.adicionar_conta(conta)
+    return conta
+
+def test_ganchos_lidos_de_conta():
+    marcador = object()
+    Conta.diario = marcador
+    assert ContaCompacta.diario is marcador
+    assert criar_conta().diario is marcador
+
+def test_deposito_compacto_vai_para_o_diario(tmp_path):
+    Conta.diario = Diario(tmp_path / "banco.journal", modo="sincrono")
+    conta = criar_conta()
+    conta.cliente.realizar_transacao(conta, DepositoCompacto(150.0, datetime(2024, 1, 2, 10)))
+    Conta.diario.fechar()
+    registros = list(ler_diario(tmp_path / "banco.journal"))
+    assert [(r["op"], r["numero"], r["valor"]) for r in registros] == [("Deposito", 1001, 150.0)]
+
+def test_historico_compacto_vai_para_o_ledger(tmp_path):
+    Conta.ledger = LedgersMmap(tmp_path, shards=2)
+    try:
+        conta = criar_conta()
+        conta.cliente.realizar_transacao(conta, DepositoCompacto(80.0, datetime(2024, 1, 2, 10)))
+        assert type(conta.historico.transacoes).__name__ == "ArmazenamentoMmap"
+        assert [(tipo, valor) for tipo, valor, _ in conta.historico.entradas()] == [("Deposito", 80.0)]
+    finally:
+        Conta.ledger.fechar()
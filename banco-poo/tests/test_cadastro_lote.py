@@ -0,0 +1,72 @@
+"""
+Testes do cadastro em lote (cadastro_lote.py).
+"""
+import pytest
+
+from banco_poo_datetime import Conta, PessoaFisica
+from cadastro_lote import CadastroInvalido, cadastrar_em_lote, interpretar_pedido_conta
+from diario import Diario, ler_diario
+from registro_clientes import ClienteRegistry
+
+def _cliente(cpf, nome="Ana"):
+    """
+    :return: Registro de cliente com o CPF informado.
+    """
+    return {"cpf": cpf, "nome": nome, "data_nascimento": "01-01-1990", "endereco": "Rua"}
+
+def test_limites_padrao():
+    assert interpretar_pedido_conta({"cpf": "12345678900"}) == ("12345678900", "0001", 500.0, 3)
+    assert interpretar_pedido_conta({"cpf": "12345678900", "limite": "", "limite_saques": ""})[2:] == (500.0, 3)
+
+def test_limites_zerados_sao_mantidos():
+    assert interpretar_pedido_conta({"cpf": "12345678900", "limite": 0, "limite_saques": 0})[2:] == (0.0, 0)
+
+@pytest.mark.parametrize("campos", [{"limite": -1}, {"limite_saques": -1}, {"limite": "nan"}, {"limite": "abc"}])
+def test_limites_invalidos(campos):
+    with pytest.raises(CadastroInvalido):
+        interpretar_pedido_conta({"cpf": "12345678900", **campos})
+
+def test_cpf_repetido_no_lote_e_recusado():
+    clientes = ClienteRegistry()
+    relatorio = cadastrar_em_lote([_cliente("123.456.789-00"), _cliente("12345678900", "Bia")], [], clientes, [])
+    assert relatorio["clientes"] == 1
+    assert [(r["posicao"], r["motivo"]) for r in relatorio["rejeitados"]] == [(2, "CPF repetido no lote")]
+    assert clientes.buscar("12345678900").nome == "Ana"
+
+def test_cpf_ja_cadastrado_e_recusado():
+    clientes = ClienteRegistry([PessoaFisica("Ana", "01-01-1990", "12345678900", "Rua")])
+    relatorio = cadastrar_em_lote([_cliente("123.456.789-00", "Bia")], [], clientes, [])
+    assert relatorio["clientes"] == 0
+    assert relatorio["rejeitados"][0]["motivo"] == "CPF já cadastrado"
+    assert clientes.buscar("12345678900").nome == "Ana"
+
+def test_numeros_contiguos_entre_blocos():
+    clientes, contas = ClienteRegistry(), []
+    pedidos = [{"cpf": "12345678900"}] * 5 + [{"cpf": "00000000000"}] + [{"cpf": "12345678900"}] * 2
+    relatorio = cadastrar_em_lote([_cliente("12345678900")], pedidos, clientes, contas, numero_conta=2001, tamanho_bloco=2)
+    assert relatorio["contas"] == 7 and relatorio["rejeitados"][0]["motivo"] == "cliente não encontrado"
+    assert [conta.numero for conta in contas] == list(range(2001, 2008))
+    assert relatorio["proximo_numero"] == 2008
+
+def test_limite_zero_explicito_e_mantido():
+    clientes, contas = ClienteRegistry(), []
+    cadastrar_em_lote([_cliente("12345678900")], [{"cpf": "12345678900", "limite": 0, "limite_saques": 0}], clientes, contas)
+    assert contas[0].limite == 0.0 and contas[0]._limite_saques == 0
+
+def test_registros_no_diario(tmp_path):
+    caminho = tmp_path / "diario.log"
+    Conta.diario = Diario(caminho, modo="sincrono")
+    try:
+        cadastrar_em_lote(
+            [_cliente("12345678900"), _cliente("98765432100", "Bia")],
+            [{"cpf": "12345678900"}, {"cpf": "98765432100", "limite": 0}],
+            ClienteRegistry(), [], tamanho_bloco=1,
+        )
+    finally:
+        Conta.diario.fechar()
+    registros = list(ler_diario(caminho))
+    assert [(r["op"], r["cpf"]) for r in registros] == [
+        ("Cliente", "12345678900"), ("Cliente", "98765432100"), ("Conta", "12345678900"), ("Conta", "98765432100"),
+    ]
+    assert [r["numero"] for r in registros[2:]] == [1001, 1002] and registros[3]["limite"] == 0.0
+    assert [r["lsn"] for r in registros] == [1, 2, 3, 4]
@@ -0,0 +1,72 @@
+"""
+Testes da conciliação de fim de dia (conciliacao.py), inclusive após restaurar um snapshot.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from banco_poo_datetime import ContaCorrente, Deposito, PessoaFisica, Saque
+from conciliacao import conciliar, conciliar_conta
+from persistencia import carregar_snapshot, salvar_snapshot
+from registro_clientes import ClienteRegistry
+
+def criar_conta():
+    """
+    :return: Tupla (registro de clientes, conta) com cinco transações, uma por dia, somando 100.
+    """
+    cliente = PessoaFisica("Ana", "01-01-1990", "12345678900", "Rua A, 1")
+    clientes = ClienteRegistry([cliente])
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001)
+    cliente.adicionar_conta(conta)
+    inicio = datetime(2024, 1, 1, 10)
+    for dia, transacao in enumerate([Deposito(50.0), Deposito(80.0), Saque(40.0), Deposito(20.0), Saque(10.0)]):
+        transacao.data = inicio + timedelta(days=dia)
+        cliente.realizar_transacao(conta, transacao)
+    return clientes, conta
+
+def restaurar(tmp_path, clientes, conta, transacoes_recentes):
+    """
+    Grava um snapshot com a conta e devolve a conta restaurada dele.
+    """
+    destino = tmp_path / "snapshot.bin"
+    salvar_snapshot(destino, clientes, [conta], 1002, 0, transacoes_recentes)
+    _clientes, contas, _numero_conta = carregar_snapshot(destino)
+    return contas[0]
+
+def test_historico_parcial_restaurado_concilia(tmp_path, capsys):
+    clientes, conta = criar_conta()
+    restaurada = restaurar(tmp_path, clientes, conta, transacoes_recentes=2)
+    assert len(restaurada.historico.transacoes) == 2
+    assert restaurada.historico.saldo_inicial == 90.0  # 50 + 80 - 40, gravado pelo snapshot
+    assert conciliar_conta(restaurada) == ([], 2)
+
+def test_saldo_adulterado_continua_divergente_apos_restaurar(tmp_path, capsys):
+    clientes, conta = criar_conta()
+    conta.restaurar_saldo(999.0)
+    assert [divergencia["motivo"] for divergencia in conciliar_conta(conta)[0]] == ["saldo"]
+    for transacoes_recentes in (1000, 2):
+        restaurada = restaurar(tmp_path, clientes, conta, transacoes_recentes)
+        divergencias, _transacoes = conciliar_conta(restaurada)
+        assert [(divergencia["motivo"], divergencia["registrado"]) for divergencia in divergencias] == [("saldo", 999.0)]
+
+@pytest.mark.parametrize("processos", [1, 2])
+def test_so_a_particao_sem_checkpoint_valido_e_refeita(tmp_path, processos, capsys):
+    contas = []
+    for indice in range(5):
+        cliente = PessoaFisica("Ana", "01-01-1990", f"{indice:011d}", "Rua A, 1")
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001 + indice)
+        cliente.adicionar_conta(conta)
+        cliente.realizar_transacao(conta, Deposito(50.0, datetime(2024, 1, 1, 10)))
+        contas.append(conta)
+    contas[4].restaurar_saldo(999.0)
+    primeira = conciliar(contas, tmp_path, processos, tamanho_particao=2)
+    assert (primeira["particoes"], primeira["refeitas"], primeira["contas"]) == (3, 3, 5)
+
+    (tmp_path / "particao-000001.json").unlink()
+    segunda = conciliar(contas, tmp_path, processos, tamanho_particao=2)
+    assert (segunda["refeitas"], segunda["reaproveitadas"], segunda["contas"]) == (1, 2, 5)
+
+    (tmp_path / "particao-000002.json").write_text("{", encoding="utf-8")  # Checkpoint truncado
+    terceira = conciliar(contas, tmp_path, processos, tamanho_particao=2)
+    assert (terceira["refeitas"], terceira["reaproveitadas"]) == (1, 2)
+    assert [(d["numero"], d["motivo"]) for d in terceira["divergencias"]] == [(1005, "saldo")]
@@ -0,0 +1,43 @@
+"""
+Testes do diário de escrita antecipada (diario.py).
+"""
+import threading
+
+import pytest
+
+from diario import Diario, ler_diario
+
+def falhar(lote):
+    """
+    Simula uma falha de I/O na gravação de um lote.
+    """
+    raise OSError(28, "No space left on device")
+
+def test_registros_em_grupo_ficam_em_disco(tmp_path):
+    with Diario(tmp_path / "banco.journal", modo="grupo", janela_ms=1) as diario:
+        lsns = [diario.registrar("Deposito", numero=1001, valor=10.0) for _ in range(3)]
+    assert lsns == [1, 2, 3]
+    assert [registro["lsn"] for registro in ler_diario(tmp_path / "banco.journal")] == [1, 2, 3]
+
+@pytest.mark.parametrize("modo", ["grupo", "sincrono"])
+def test_falha_de_gravacao_chega_a_quem_espera(tmp_path, modo):
+    diario = Diario(tmp_path / "banco.journal", modo=modo, janela_ms=1)
+    diario._gravar = falhar
+    erros = []
+
+    def registrar():
+        try:
+            diario.registrar("Deposito", numero=1001, valor=10.0)
+        except OSError as erro:
+            erros.append(erro)
+
+    tarefas = [threading.Thread(target=registrar) for _ in range(4)]
+    for tarefa in tarefas:
+        tarefa.start()
+    for tarefa in tarefas:
+        tarefa.join(timeout=5)
+    assert not any(tarefa.is_alive() for tarefa in tarefas)  # Ninguém fica esperando para sempre
+    assert len(erros) == 4
+    with pytest.raises(OSError):
+        diario.registrar_lote([("Saque", {"numero": 1001, "valor": 5.0})])  # Falha imediatamente
+    diario.fechar()
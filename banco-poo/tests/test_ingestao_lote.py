@@ -0,0 +1,54 @@
+"""
+Testes da ingestão em lote (ingestao_lote.py).
+"""
+import io
+import json
+
+from banco_poo_datetime import ContaCorrente, PessoaFisica
+from ingestao_lote import ingerir
+from registro_clientes import ClienteRegistry
+
+def criar_clientes():
+    """
+    :return: Registro com um cliente e uma conta (agência padrão, número 1001).
+    """
+    clientes = ClienteRegistry()
+    cliente = PessoaFisica("Ana", "01-01-1990", "12345678900", "Rua A, 1")
+    clientes.adicionar(cliente)
+    cliente.adicionar_conta(ContaCorrente.nova_conta(cliente=cliente, numero=1001))
+    return clientes
+
+def test_valores_invalidos_sao_rejeitados_sem_interromper_o_lote(tmp_path):
+    entrada = tmp_path / "movimentos.jsonl"
+    valores = ["100", "nan", "inf", "-5", "0", "50"]
+    entrada.write_text("".join(
+        json.dumps({"cpf": "12345678900", "conta": "1001", "tipo": "deposito", "valor": valor}) + "\n" for valor in valores
+    ))
+    rejeitados = tmp_path / "rejeitados.jsonl"
+    clientes = criar_clientes()
+    resumo = ingerir(entrada, clientes, caminho_rejeitados=rejeitados, saida=io.StringIO())
+    assert (resumo["aceitos"], resumo["rejeitados"]) == (2, 4)
+    assert [json.loads(linha)["motivo"] for linha in rejeitados.read_text().splitlines()] == [
+        "valor inválido: nan", "valor inválido: inf", "valor inválido: -5", "valor inválido: 0",
+    ]
+    assert clientes.buscar_conta("0001", 1001).saldo == 150
+
+def test_conta_de_outro_cliente_nao_e_encontrada(tmp_path):
+    clientes = criar_clientes()
+    outro = PessoaFisica("Bia", "01-01-1990", "98765432100", "Rua B, 2")
+    clientes.adicionar(outro)
+    entrada = tmp_path / "movimentos.jsonl"
+    entrada.write_text(json.dumps({"cpf": "98765432100", "conta": 1001, "tipo": "d", "valor": 10}) + "\n")
+    rejeitados = tmp_path / "rejeitados.jsonl"
+    resumo = ingerir(entrada, clientes, caminho_rejeitados=rejeitados, saida=io.StringIO())
+    assert resumo["rejeitados"] == 1
+    assert json.loads(rejeitados.read_text())["motivo"] == "conta não encontrada"
+
+def test_motivo_da_recusa_no_arquivo_de_rejeitados(tmp_path, capsys):
+    entrada = tmp_path / "movimentos.jsonl"
+    entrada.write_text(json.dumps({"cpf": "12345678900", "conta": 1001, "tipo": "saque", "valor": 400}) + "\n")
+    rejeitados = tmp_path / "rejeitados.jsonl"
+    resumo = ingerir(entrada, criar_clientes(), caminho_rejeitados=rejeitados, saida=io.StringIO())
+    assert resumo["rejeitados"] == 1
+    assert json.loads(rejeitados.read_text())["motivo"] == "transação recusada: Saldo insuficiente!"
+    assert capsys.readouterr().out == ""  # Nada impresso, e sys.stdout não foi trocado
@@ -0,0 +1,36 @@
+"""
+Testes do histórico em ledger mapeado na memória (ledger_mmap.py).
+"""
+import threading
+
+from ledger_mmap import LedgersMmap
+
+def test_gravacoes_concorrentes_no_mesmo_shard(tmp_path):
+    ledgers = LedgersMmap(tmp_path, shards=1)
+    armazenamentos = [ledgers.armazenamento("0001", 1001 + indice) for indice in range(8)]
+
+    def depositar(indice):
+        for repeticao in range(3000):
+            armazenamentos[indice].anexar("Deposito", indice + 1, repeticao)
+
+    tarefas = [threading.Thread(target=depositar, args=(indice,)) for indice in range(8)]
+    for tarefa in tarefas:
+        tarefa.start()
+    for tarefa in tarefas:
+        tarefa.join()
+    for indice, armazenamento in enumerate(armazenamentos):
+        assert len(armazenamento) == 3000
+        assert {armazenamento.entrada(posicao)[1] for posicao in range(3000)} == {indice + 1}
+    ledgers.fechar()
+
+def test_mesmo_numero_em_agencias_diferentes(tmp_path):
+    ledgers = LedgersMmap(tmp_path, shards=2)
+    ledgers.armazenamento("0001", 1001).anexar("Deposito", 10.0, 0)
+    ledgers.armazenamento("0002", 1001).anexar("Saque", 20.0, 0)
+    ledgers.fechar()
+
+    reaberto = LedgersMmap(tmp_path, shards=2)
+    assert [reaberto.armazenamento(agencia, 1001).entrada(0) for agencia in ("0001", "0002")] == [
+        ("Deposito", 10.0, 0), ("Saque", 20.0, 0),
+    ]
+    reaberto.fechar()
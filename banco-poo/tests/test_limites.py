@@ -0,0 +1,49 @@
+"""
+Testes dos limites das contas (limites.py) com valores inválidos.
+"""
+from datetime import datetime
+
+import pytest
+
+from banco_poo_datetime import ContaCorrente, Deposito, PessoaFisica, Saque, Transferencia
+from limites import ContadorDia
+
+@pytest.fixture
+def conta():
+    """
+    :return: Conta corrente com saldo de 100.
+    """
+    cliente = PessoaFisica("Ana", "01-01-1990", "12345678900", "Rua A, 1")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001)
+    cliente.adicionar_conta(conta)
+    cliente.realizar_transacao(conta, Deposito(100.0, datetime(2024, 1, 2, 10)))
+    return conta
+
+@pytest.mark.parametrize("classe", [Deposito, Saque])
+@pytest.mark.parametrize("valor", [float("nan"), float("inf"), float("-inf")])
+def test_valor_nao_finito_e_recusado_antes_dos_limites(conta, classe, valor, capsys):
+    assert conta.cliente.realizar_transacao(conta, classe(valor, datetime(2024, 1, 2, 11))) is False
+    assert "O valor informado é inválido!" in capsys.readouterr().out
+    assert conta.saldo == 100.0
+    assert len(conta.historico.transacoes) == 1
+    assert conta.cliente.realizar_transacao(conta, Deposito(10.0, datetime(2024, 1, 2, 12)))  # Os contadores continuam válidos
+
+def test_deposito_direto_nao_finito(conta):
+    assert conta.depositar(float("inf")) is False
+    assert conta.saldo == 100.0
+
+def test_transferencia_nao_finita(conta):
+    outro = PessoaFisica("Bia", "01-01-1990", "98765432100", "Rua B, 2")
+    destino = ContaCorrente.nova_conta(cliente=outro, numero=1002)
+    assert conta.cliente.realizar_transacao(conta, Transferencia(float("nan"), destino, datetime(2024, 1, 2, 11))) is False
+    assert Transferencia(float("nan"), destino).registrar(conta) is False
+    assert (conta.saldo, destino.saldo) == (100.0, 0)
+
+def test_contador_do_dia_guarda_so_o_dia_corrente():
+    contador = ContadorDia()
+    contador.somar(datetime(2024, 1, 2, 10), 1000)
+    contador.somar(datetime(2024, 1, 2, 11), 500)
+    assert contador.total(datetime(2024, 1, 2, 12)) == (2, 1500)
+    contador.somar(datetime(2024, 1, 3, 9), 100)  # Dia novo: os totais de 2/1 são descartados
+    assert contador.total(datetime(2024, 1, 3, 10)) == (1, 100)
+    assert contador.total(datetime(2024, 1, 4, 10)) == (0, 0)
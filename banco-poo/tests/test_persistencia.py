@@ -0,0 +1,53 @@
+"""
+Testes da persistência em snapshots e diário (persistencia.py).
+"""
+import os
+import pickle
+
+import pytest
+
+from banco_poo_datetime import ContaCorrente, PessoaFisica
+from persistencia import CABECALHO, MAGICO, MAGICO_V2, carregar_snapshot, reaplicar, salvar_snapshot
+from registro_clientes import ClienteRegistry
+
+def criar_estado():
+    """
+    :return: Tupla (registro de clientes, lista de contas).
+    """
+    cliente = PessoaFisica("Ana", "01-01-1990", "12345678900", "Rua A, 1")
+    clientes = ClienteRegistry([cliente])
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1001)
+    cliente.adicionar_conta(conta)
+    return clientes, [conta]
+
+def test_snapshot_em_json(tmp_path):
+    clientes, contas = criar_estado()
+    destino = tmp_path / "snapshot.bin"
+    salvar_snapshot(destino, clientes, contas, 1002, 7)
+    conteudo = destino.read_bytes()
+    assert conteudo[:8] == MAGICO
+    assert conteudo[CABECALHO.size:].startswith(b"[[[")  # Corpo JSON
+    _clientes, restauradas, numero_conta = carregar_snapshot(destino)
+    assert (restauradas[0].numero, restauradas[0].cliente.cpf, numero_conta) == (1001, "12345678900", 1002)
+
+class _Carga:
+    """
+    Objeto cujo pickle executaria código na carga.
+    """
+    def __reduce__(self):
+        return (os.system, ("echo invadido",))
+
+def test_snapshot_pickle_antigo_nao_executa_codigo(tmp_path):
+    corpo = pickle.dumps(([_Carga()], []))
+    destino = tmp_path / "snapshot.bin"
+    destino.write_bytes(CABECALHO.pack(MAGICO_V2, 0, 1001, len(corpo)) + corpo)
+    with pytest.raises(pickle.UnpicklingError):
+        carregar_snapshot(destino)
+
+def test_operacao_desconhecida_no_diario():
+    clientes, contas = criar_estado()
+    contas_por_numero = {("0001", 1001): contas[0]}
+    registro = {"lsn": 3, "op": "Estorno", "agencia": "0001", "numero": 1001, "valor": 10.0, "instante": 0}
+    with pytest.raises(ValueError, match="Estorno"):
+        reaplicar(registro, clientes, contas, contas_por_numero, 1002)
+    assert contas[0].saldo == 0
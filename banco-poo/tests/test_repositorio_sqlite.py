@@ -0,0 +1,52 @@
+"""
+Testes do repositório SQLite (repositorio_sqlite.py).
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from banco_poo_datetime import Conta, ContaCorrente, Deposito, PessoaFisica, Saque
+from conciliacao import conciliar_conta
+from repositorio_sqlite import RepositorioSQLite
+
+def test_lote_com_falha_nao_grava_nada_e_continua_pendente(tmp_path):
+    repositorio = RepositorioSQLite(str(tmp_path / "banco.db"), tamanho_lote=1000)
+    repositorio.gravar("clientes", ("12345678900", "Ana", "01-01-1990", "Rua"))
+    repositorio.gravar("contas", (1001, "0001", "12345678900", 500.0, 3))
+    repositorio.gravar("clientes", ("12345678900", "Ana", "01-01-1990", "Rua"))  # CPF repetido: viola o índice único
+    with pytest.raises(sqlite3.IntegrityError):
+        repositorio.sincronizar()
+    assert repositorio._conexao.execute("SELECT COUNT(*) FROM contas").fetchone() == (0,)
+    assert repositorio._quantidade_pendente == 3
+
+    repositorio._pendentes["clientes"].pop()
+    repositorio._quantidade_pendente -= 1
+    repositorio.sincronizar()
+    assert repositorio.consultar("SELECT COUNT(*) FROM contas") == [(1,)]
+    repositorio.fechar()
+
+def test_carga_le_os_historicos_numa_unica_consulta(tmp_path, capsys):
+    caminho = str(tmp_path / "banco.db")
+    Conta.ledger = repositorio = RepositorioSQLite(caminho)
+    clientes, contas, numero_conta = repositorio.carregar()
+    for indice in range(5):
+        cliente = PessoaFisica(f"Cliente {indice}", "01-01-1990", f"{indice:011d}", "Rua")
+        clientes.adicionar(cliente)
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta + indice)
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+        cliente.realizar_transacao(conta, Deposito(100.0 + indice, datetime(2024, 1, 2, 10)))
+        cliente.realizar_transacao(conta, Saque(30.0, datetime(2024, 1, 2, 11)))
+    repositorio.fechar()
+
+    Conta.ledger = repositorio = RepositorioSQLite(caminho)
+    consultas = []
+    repositorio._conexao.set_trace_callback(consultas.append)
+    _clientes, contas, _numero_conta = repositorio.carregar()
+    assert sum("FROM transacoes" in consulta for consulta in consultas) == 1
+    assert [conta.saldo for conta in contas] == [70.0, 71.0, 72.0, 73.0, 74.0]
+    assert [tipo for tipo, _valor, _instante in contas[2].historico.entradas()] == ["Deposito", "Saque"]
+    divergencias, _transacoes = conciliar_conta(contas[2])
+    assert [divergencia["motivo"] for divergencia in divergencias] == ["saldo_inicial_derivado"]  # Não há saldo gravado à parte
+    repositorio.fechar()
@@ -0,0 +1,44 @@
+"""
+Testes da camada de serviço (servico.py).
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from banco_poo_datetime import Conta
+from servico import ServicoBanco
+
+@pytest.fixture
+def servico():
+    """
+    :return: Serviço com um cliente e uma conta.
+    """
+    servico = ServicoBanco()
+    servico.executar({"op": "criar_cliente", "cpf": "12345678900", "nome": "Ana", "data_nascimento": "01-01-1990", "endereco": "Rua"})
+    servico.executar({"op": "criar_conta", "cpf": "12345678900"})
+    return servico
+
+@pytest.mark.parametrize("valor", ["inf", "nan", "-inf", 1e400, "abc", None])
+def test_valor_nao_finito_vira_resposta_de_erro(servico, valor):
+    resposta = servico.executar({"op": "depositar", "cpf": "12345678900", "valor": valor})
+    assert resposta == {"ok": False, "erro": "O valor informado é inválido!"}
+
+def test_excecao_inesperada_vira_resposta_de_erro(servico, monkeypatch):
+    def falhar(**parametros):
+        raise RuntimeError("falha")
+
+    monkeypatch.setitem(servico._operacoes, "listar_contas", falhar)
+    assert servico.executar({"op": "listar_contas", "id": 7}) == {"ok": False, "erro": "Erro interno: RuntimeError: falha", "id": 7}
+
+def test_mensagens_de_pedidos_concorrentes(capsys, monkeypatch):
+    monkeypatch.setattr(Conta, "LIMITES", ())  # Sem limite diário de transações
+    servico = ServicoBanco()
+    servico.executar({"op": "criar_cliente", "cpf": "12345678900", "nome": "Ana", "data_nascimento": "01-01-1990", "endereco": "Rua"})
+    servico.executar({"op": "criar_conta", "cpf": "12345678900"})
+    pedidos = [{"op": "depositar", "cpf": "12345678900", "valor": 1, "id": indice} for indice in range(200)]
+    pedidos += [{"op": "sacar", "cpf": "12345678900", "valor": 10_000, "id": indice} for indice in range(200, 400)]
+    with ThreadPoolExecutor(8) as executor:
+        respostas = list(executor.map(servico.executar, pedidos))
+    assert all(resposta["mensagem"] == "Depósito realizado com sucesso!" for resposta in respostas[:200])
+    assert all(resposta["mensagem"] and not resposta["ok"] for resposta in respostas[200:])
+    assert capsys.readouterr().out == ""  # Nada vai para o terminal
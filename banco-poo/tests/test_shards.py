@@ -0,0 +1,48 @@
+"""
+Testes do modo particionado (shards.py).
+"""
+import pytest
+
+from shards import RoteadorShards, shard_do_cliente
+
+@pytest.fixture
+def roteador():
+    """
+    :return: Roteador com dois shards na memória, encerrado ao fim do teste.
+    """
+    roteador = RoteadorShards(2)
+    yield roteador
+    roteador.fechar()
+
+def test_cpf_com_e_sem_pontuacao_no_mesmo_shard():
+    for shards in (2, 3, 4, 8):
+        assert shard_do_cliente("123.456.789-00", shards) == shard_do_cliente("12345678900", shards)
+
+def test_conta_criada_com_cpf_sem_pontuacao(roteador):
+    criado = roteador.executar(
+        {"op": "criar_cliente", "cpf": "123.456.789-00", "nome": "Ana", "data_nascimento": "01-01-1990", "endereco": "Rua"}
+    )
+    assert criado["ok"]
+    assert roteador.executar({"op": "criar_conta", "cpf": "12345678900"})["ok"]
+
+def test_shard_sobrevive_a_pedido_invalido(roteador):
+    roteador.executar({"op": "criar_cliente", "cpf": "12345678900", "nome": "Ana", "data_nascimento": "01-01-1990", "endereco": "Rua"})
+    roteador.executar({"op": "criar_conta", "cpf": "12345678900"})
+    assert not roteador.executar({"op": "depositar", "cpf": "12345678900", "valor": 1e400})["ok"]
+    assert roteador.executar({"op": "depositar", "cpf": "12345678900", "valor": 10})["ok"]
+
+def test_shard_morto_responde_com_erro_sem_travar(roteador):
+    for cpf in ("12345678900", "98765432100", "11122233344", "55566677788"):
+        roteador.executar({"op": "criar_cliente", "cpf": cpf, "nome": "Ana", "data_nascimento": "01-01-1990", "endereco": "Rua"})
+    cpfs = {roteador.shard({"cpf": cpf}): cpf for cpf in ("12345678900", "98765432100", "11122233344", "55566677788")}
+    assert len(cpfs) == 2, "os CPFs do teste devem cair nos dois shards"
+    morto, vivo = 0, 1
+    roteador._processos[morto].kill()
+    roteador._processos[morto].join()
+
+    resposta = roteador.executar({"op": "criar_conta", "cpf": cpfs[morto], "id": 7})
+    assert not resposta["ok"] and "Shard 0 indisponível" in resposta["erro"] and resposta["id"] == 7
+    lote = roteador.executar_lote([{"op": "criar_conta", "cpf": cpfs[morto]}, {"op": "criar_conta", "cpf": cpfs[vivo]}])
+    assert not lote[0]["ok"] and lote[1]["ok"]
+    assert not roteador.executar({"op": "listar_contas"})["ok"]
+    assert roteador.executar({"op": "criar_conta", "cpf": cpfs[vivo]})["ok"]  # As travas foram liberadas
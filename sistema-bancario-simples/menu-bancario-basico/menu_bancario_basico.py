@@ -1,3 +1,7 @@
+import sys
+import tempfile
+from collections import deque
+
 menu = """
 [d] Depositar
 [s] Sacar
@@ -7,9 +11,22 @@ menu = """
 
 saldo = 0
 limite = 500
-extrato = ""
 numero_saques = 0
 LIMITE_SAQUES = 3
+LIMITE_EXTRATO_MEMORIA = 100  # Movimentações recentes mantidas em memória; as mais antigas vão para um arquivo temporário
+
+# Extrato: buffer circular com as movimentações recentes e arquivo, somente de acréscimo, com as mais antigas
+extrato = {"recentes": deque(maxlen=LIMITE_EXTRATO_MEMORIA), "arquivo": tempfile.TemporaryFile("a+", encoding="utf-8"), "total": 0}
+
+def registrar_movimentacao(extrato, linha):
+    """
+    Registra uma movimentação no extrato; com o buffer cheio, a mais antiga é gravada no arquivo.
+    """
+    recentes = extrato["recentes"]
+    if len(recentes) == recentes.maxlen:
+        extrato["arquivo"].write(recentes[0])  # O append abaixo descarta a mais antiga do buffer
+    recentes.append(linha)
+    extrato["total"] += 1
 
 def depositar(saldo, extrato):
     """
@@ -18,7 +35,7 @@ def depositar(saldo, extrato):
     valor = float(input("Quanto deseja depositar? "))
     if valor > 0:
         saldo += valor
-        extrato += f"Depósito: R${valor:.2f}\n"
+        registrar_movimentacao(extrato, f"Depósito: R${valor:.2f}\n")
         print(f"Depósito de R${valor:.2f} realizado com sucesso!")
     else:
         print("Operação falhou! O valor informado é inválido.")
@@ -41,7 +58,7 @@ def sacar(saldo, extrato, numero_saques):
         print("Operação falhou! Número de saques excedido.")
     elif valor > 0:
         saldo -= valor
-        extrato += f"Saque: R${valor:.2f}\n"
+        registrar_movimentacao(extrato, f"Saque: R${valor:.2f}\n")
         numero_saques += 1
         print(f"Saque de R${valor:.2f} realizado com sucesso!")
     else:
@@ -53,7 +70,14 @@ def exibir_extrato(saldo, extrato):
     #Exibe o extrato e o saldo atual.
     
     print("\n================ EXTRATO ================")
-    print("Não foram realizadas movimentações." if not extrato else extrato)
+    if not extrato["total"]:
+        print("Não foram realizadas movimentações.")
+    else:
+        # Lê primeiro as movimentações do arquivo e depois as do buffer, sem juntá-las numa string
+        extrato["arquivo"].flush()
+        extrato["arquivo"].seek(0)
+        sys.stdout.writelines(extrato["arquivo"])
+        sys.stdout.writelines(extrato["recentes"])
     print(f"\nSaldo: R${saldo:.2f}")
     print("==========================================")
 
@@ -71,6 +95,7 @@ while True:
 
     elif opcao == "q":
         print("Obrigado por usar o sistema bancário!")
+        extrato["arquivo"].close()
         break
 
     else:
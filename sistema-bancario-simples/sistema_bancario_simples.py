@@ -1,6 +1,15 @@
 #Este código implementa uma aplicação básica de banco que permite aos usuários realizar operações típicas
 #como depósitos, saques, e consulta de extratos, bem como gerenciar usuários e contas.
+import sys
+import tempfile
 import textwrap
+from collections import deque
+
+#Quantidade de movimentações recentes mantidas em memória; as mais antigas vão para o arquivo do extrato.
+LIMITE_EXTRATO_MEMORIA = 100
+
+#Lê as respostas do usuário; main(entrada=...) a substitui (ex.: banco-poo/benchmarks/carga_menu.py).
+ler_entrada = input
 
 #Exibe o menu principal e retorna a opção selecionada pelo usuário.
 #textwrap.dedent(menu): Remove a indentação do texto, mantendo a formatação.
@@ -15,14 +24,41 @@ def menu():
     [6]\tListar Contas
     [7]\tSair
     => """
-    return input(textwrap.dedent(menu))
+    return ler_entrada(textwrap.dedent(menu))
+
+#Cria o extrato: um buffer circular com as movimentações recentes e um arquivo, somente de acréscimo, com as mais antigas.
+#Sem caminho, o arquivo é temporário e removido ao fim da sessão; com caminho, as movimentações são acrescentadas a ele.
+#A memória ocupada fica limitada a "capacidade" linhas, qualquer que seja o número de operações.
+def criar_extrato(capacidade=LIMITE_EXTRATO_MEMORIA, caminho=None):
+    arquivo = open(caminho, "a+", encoding="utf-8") if caminho else tempfile.TemporaryFile("a+", encoding="utf-8")
+    return {"recentes": deque(maxlen=capacidade), "arquivo": arquivo, "total": 0}
+
+#Registra uma movimentação no extrato em O(1): quando o buffer está cheio, a mais antiga é gravada no arquivo.
+def registrar_movimentacao(extrato, linha):
+    recentes = extrato["recentes"]
+    if len(recentes) == recentes.maxlen:
+        extrato["arquivo"].write(recentes[0])  # O append abaixo descarta a mais antiga do buffer
+    recentes.append(linha)
+    extrato["total"] += 1
+
+#Percorre as movimentações em ordem, primeiro as do arquivo e depois as do buffer, sem carregá-las todas na memória.
+def linhas_extrato(extrato):
+    arquivo = extrato["arquivo"]
+    arquivo.flush()
+    arquivo.seek(0)
+    yield from arquivo
+    yield from extrato["recentes"]
+
+#Fecha o arquivo do extrato (o temporário é removido).
+def fechar_extrato(extrato):
+    extrato["arquivo"].close()
 
 #Adiciona um valor ao saldo e registra a operação no extrato se o valor for positivo.
 #/: Indica que todos os parâmetros a seguir são posicionais, não podem ser usados como argumentos nomeados.
 def depositar(saldo, valor, extrato, /):
     if valor > 0:
         saldo += valor
-        extrato += f"Deposito:\tR$ {valor:.2f}\n"
+        registrar_movimentacao(extrato, f"Deposito:\tR$ {valor:.2f}\n")
         print("\n==== Depósito realizado com sucesso! ====")
     else:
         print("\n@@@ O valor informado é inválido! @@@")
@@ -47,7 +83,7 @@ def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):
 
     elif valor > 0:
         saldo -= valor
-        extrato += f"Saque:\t\tR$ {valor:.2f}\n"
+        registrar_movimentacao(extrato, f"Saque:\t\tR$ {valor:.2f}\n")
         numero_saques += 1
         print("\n==== Saque realizado com sucesso! ====")
 
@@ -58,37 +94,44 @@ def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques):
 
 #xibe o extrato das transações e o saldo atual.
 #/ e *: Controlam como os argumentos podem ser passados (por posição ou por nome).
+#As movimentações são escritas linha a linha, lidas do arquivo e do buffer (ver linhas_extrato).
 def exibir_extrato (saldo, /, *, extrato):
     print("\n========== EXTRATO ==========")
-    print("Não foram realizadas movimentações." if not extrato else extrato)
+    if not extrato["total"]:
+        print("Não foram realizadas movimentações.")
+    else:
+        sys.stdout.writelines(linhas_extrato(extrato))
     print(f"\nSaldo:\t\tR$ {saldo:.2f}")
     print("========== FINALIZADO ==========")
 
-#Cria um novo usuário, adicionando-o à lista usuarios se o CPF não existir.
+#Cria um novo usuário, adicionando-o ao dicionário usuarios (indexado pelo CPF) se o CPF não existir.
 def criar_usuário(usuarios):
-    cpf = input("Informe o CPF (somente número): ")
+    cpf = normalizar_cpf(ler_entrada("Informe o CPF (somente número): "))
     usuario = filtrar_usuario(cpf, usuarios)
 
     if usuario:
         print("\n@@@ Usuário ja existe! @@@")
         return
 
-    nome = input("Nome completo: ")
-    data_nascimento = input("Data de nascimento (dd-mm-aaaa): ")
-    endereco = input("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
+    nome = ler_entrada("Nome completo: ")
+    data_nascimento = ler_entrada("Data de nascimento (dd-mm-aaaa): ")
+    endereco = ler_entrada("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
 
-    usuarios.append({"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco})
+    usuarios[cpf] = {"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco}
 
     print("\n==== Usuário criado com sucesso! ====")
 
-#Filtra e retorna o usuário com o CPF fornecido, se existir.
+#Remove pontuação e espaços do CPF, mantendo somente os dígitos (chave do dicionário de usuários).
+def normalizar_cpf(cpf):
+    return "".join(caractere for caractere in cpf if caractere.isdigit())
+
+#Retorna o usuário com o CPF fornecido, se existir, com uma consulta direta ao dicionário (sem percorrer todos os usuários).
 def filtrar_usuario(cpf, usuarios):
-    usuarios_filtrados = [usuario for usuario in usuarios if usuario ["cpf"] == cpf]
-    return usuarios_filtrados[0] if usuarios_filtrados else None
+    return usuarios.get(normalizar_cpf(cpf))
 
 #Cria uma nova conta se o usuário existir, associando a conta ao usuário filtrado.
 def criar_conta(agencia, numero_conta, usuarios):
-    cpf = input("informe o CPF do usuário:")  
+    cpf = ler_entrada("informe o CPF do usuário:")  
     usuario = filtrar_usuario(cpf,usuarios) 
 
     if usuario:
@@ -111,58 +154,68 @@ def listar_contas(contas):
 
 #main(): Função principal que inicializa variáveis e executa um loop de interação com o usuário.
 #LIMITE_SAQUES e AGENCIA: Definem o limite de saques e o código da agência.
-#saldo, limite, extrato, numero_saques, usuarios, contas: Variáveis que armazenam o estado atual do sistema.
+#saldo, limite, extrato, numero_saques, usuarios, contas: Variáveis que armazenam o estado atual do sistema (usuarios é um dicionário CPF -> usuário).
 #while True: Loop que exibe o menu e executa ações baseadas na opção escolhida pelo usuário.
+#entrada: Função que recebe a pergunta e retorna a resposta (opcional); substitui input() até main() retornar.
+
+def main(entrada=None):
+    global ler_entrada
+    entrada_anterior = ler_entrada
+    if entrada is not None:
+        ler_entrada = entrada
 
-def main():
     LIMITE_SAQUES = 3
     AGENCIA = "0001"
 
     saldo = 0
     limite = 500
-    extrato = ""
+    extrato = criar_extrato()
     numero_saques = 0
-    usuarios = []
+    usuarios = {}
     contas = []
 
-    while True:
-        opcao = menu()
+    try:
+        while True:
+            opcao = menu()
 
-        if opcao == "1":
-            criar_usuário(usuarios)
+            if opcao == "1":
+                criar_usuário(usuarios)
 
-        elif opcao == "2":
-            numero_conta = len(contas) + 1
-            conta = criar_conta(AGENCIA, numero_conta, usuarios)
+            elif opcao == "2":
+                numero_conta = len(contas) + 1
+                conta = criar_conta(AGENCIA, numero_conta, usuarios)
 
-            if conta:
-                contas.append(conta)
+                if conta:
+                    contas.append(conta)
 
-        elif opcao == "3":    
-            valor = float(input("Qual valor deseja depositar? "))
+            elif opcao == "3":    
+                valor = float(ler_entrada("Qual valor deseja depositar? "))
 
-            saldo, extrato = depositar(saldo, valor, extrato)
+                saldo, extrato = depositar(saldo, valor, extrato)
 
-        elif opcao == "4":
-            valor = float(input("Qual valor deseja sacar? "))
+            elif opcao == "4":
+                valor = float(ler_entrada("Qual valor deseja sacar? "))
 
-            saldo, extrato = sacar(
-                saldo=saldo,
-                valor=valor,
-                extrato=extrato, 
-                limite=limite, 
-                numero_saques=numero_saques, 
-                limite_saques=LIMITE_SAQUES,
-            )
+                saldo, extrato = sacar(
+                    saldo=saldo,
+                    valor=valor,
+                    extrato=extrato, 
+                    limite=limite, 
+                    numero_saques=numero_saques, 
+                    limite_saques=LIMITE_SAQUES,
+                )
 
-        elif opcao == "5":
-            exibir_extrato(saldo, extrato=extrato)
+            elif opcao == "5":
+                exibir_extrato(saldo, extrato=extrato)
 
-        elif opcao == "6":
-            listar_contas(contas)
+            elif opcao == "6":
+                listar_contas(contas)
 
-        elif opcao == "7":
-            break
-main()
+            elif opcao == "7":
+                break
+    finally:
+        fechar_extrato(extrato)
+        ler_entrada = entrada_anterior  #Restaura a leitura mesmo se o menu terminar com uma exceção
 
-        
\ No newline at end of file
+if __name__ == "__main__":
+    main()